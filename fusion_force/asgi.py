@@ -1,15 +1,40 @@
+# fusion_force/asgi.py
 """
-ASGI config for fusion_force project.
+ASGI entry point.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+The default deployment is sync (fusion_force/wsgi.py, see Procfile). For
+many concurrent or slow clients, set ASYNC_VIEWS=True: gunicorn.conf.py then
+runs this application in uvicorn workers and the public views switch to
+their async versions (main/async_views.py).
 
-For more information on this file, see
-https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
-"""
+Each worker then keeps serving other requests while one waits on a slow
+client or the database; a sync worker is blocked for the whole request.
+``manage.py bench_async_views`` compares both modes.
 
+As in wsgi.py, ``create_app`` warms lazily-loaded state and closes database
+connections so the app can be built in gunicorn's master with --preload.
+"""
 import os
-from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fusion_force.settings')
 
-application = get_asgi_application()
\ No newline at end of file
+def create_app(warm=True):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fusion_force.settings')
+
+    import django
+    django.setup(set_prefix=False)
+
+    from django.core.handlers.asgi import ASGIHandler
+    app = ASGIHandler()
+
+    if warm:
+        from main.startup import warm_up
+        warm_up()
+
+    from django.db import connections
+    from main.db_backends.pool import close_pools
+    connections.close_all()
+    close_pools()
+    return app
+
+
+application = create_app()
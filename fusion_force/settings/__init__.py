@@ -0,0 +1,23 @@
+# fusion_force/settings/__init__.py
+"""
+Settings profile selection.
+
+DJANGO_ENV=dev|prod picks the profile explicitly. Without it only
+``manage.py runserver`` gets dev; everything else (gunicorn from the
+Procfile or railway.json, management commands, tests) gets prod, so a
+deploy that forgets the variable never runs with DEBUG on.
+DJANGO_SETTINGS_MODULE stays 'fusion_force.settings' everywhere.
+"""
+import os
+import sys
+
+PROFILE = os.environ.get('DJANGO_ENV', '').lower()
+if not PROFILE:
+    PROFILE = 'dev' if sys.argv[1:2] == ['runserver'] else 'prod'
+
+if PROFILE in ('prod', 'production'):
+    from .prod import *  # noqa: F401,F403
+elif PROFILE in ('dev', 'development', 'local'):
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImportError(f"Unknown DJANGO_ENV '{PROFILE}' (expected 'dev' or 'prod')")
@@ -0,0 +1,344 @@
+# fusion_force/settings/base.py - shared by every profile (see __init__.py)
+import os
+from pathlib import Path
+import dj_database_url
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-123')
+
+# Set by the profile: dev.py turns it on, prod.py keeps it off
+DEBUG = False
+
+# ALLOWED_HOSTS - Add your Railway URL
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    'fusionforcellc-production.up.railway.app',
+    '.railway.app',
+    '.pamela-fusionforce.com',
+]
+
+# ========== CRITICAL FIX: CSRF_TRUSTED_ORIGINS ==========
+CSRF_TRUSTED_ORIGINS = [
+    'https://fusionforcellc-production.up.railway.app',
+    'https://*.railway.app',
+    'https://*.pamela-fusionforce.com',
+]
+
+# Database
+DATABASE_URL = os.environ.get('DATABASE_URL')
+if DATABASE_URL:
+    DATABASES = {'default': dj_database_url.config(default=DATABASE_URL, conn_max_age=600, conn_health_checks=True)}
+else:
+    # SQLite mode (main/db_backends/sqlite3): WAL, synchronous=NORMAL,
+    # busy_timeout, mmap and BEGIN IMMEDIATE so several workers can share the
+    # file. SQLITE_WAL=False is Django's stock backend with default journaling.
+    SQLITE_WAL = os.environ.get('SQLITE_WAL', 'True') == 'True'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'main.db_backends.sqlite3' if SQLITE_WAL else 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+
+# Fire-and-forget writes (page-view logs) go through one writer thread per
+# process and are committed in batches (main/write_queue.py). On by default
+# in SQLite mode, where every write serializes on the database file lock.
+DB_WRITE_QUEUE = os.environ.get(
+    'DB_WRITE_QUEUE', str(DATABASES['default']['ENGINE'] == 'main.db_backends.sqlite3')
+) == 'True'
+# Queued writes and log records run in the calling thread instead. Turned on
+# by the test runner (main/test_runner.py): other threads cannot see the
+# test transaction.
+INLINE_WRITES = False
+TEST_RUNNER = 'main.test_runner.TestRunner'
+
+# Read replica (main/db_router.py): home page and admin changelist reads go to
+# 'replica', writes and everything else to 'default'. DATABASE_REPLICA_URL for
+# PostgreSQL, or SQLITE_REPLICA_PATH (a copy of the SQLite file) locally.
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.config(
+        default=DATABASE_REPLICA_URL, conn_max_age=600, conn_health_checks=True
+    )
+elif not DATABASE_URL and os.environ.get('SQLITE_REPLICA_PATH'):
+    DATABASES['replica'] = {**DATABASES['default'], 'NAME': os.environ['SQLITE_REPLICA_PATH']}
+if 'replica' in DATABASES:
+    # Tests get two separate test databases, so routing is observable
+    DATABASE_ROUTERS = ['main.db_router.ReplicaRouter']
+# After a write, the browser reads from 'default' for this long
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# Pooled PostgreSQL (main/db_backends): connections go back to a per-process
+# pool at the end of every request (CONN_MAX_AGE=0) and are pinged before
+# reuse. Sizes are per process, i.e. per gunicorn worker. DB_POOL=0 falls
+# back to Django's persistent per-thread connections.
+DB_POOL = os.environ.get('DB_POOL', 'True') == 'True'
+for database in DATABASES.values():
+    if not DB_POOL or database['ENGINE'] != 'django.db.backends.postgresql':
+        continue
+    database.update({
+        'ENGINE': 'main.db_backends.postgresql',
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MIN_SIZE': int(os.environ.get('DB_POOL_MIN_SIZE', 1)),
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 4)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'CHECK_AFTER': float(os.environ.get('DB_POOL_CHECK_AFTER', 1)),
+            'MAX_IDLE': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'MAX_LIFETIME': float(os.environ.get('DB_POOL_MAX_LIFETIME', 3600)),
+        },
+    })
+
+# Apps
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'whitenoise.runserver_nostatic',
+    # Before staticfiles so main's collectstatic (which runs build_assets) takes precedence
+    'main',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'main.middleware.ReplicaRoutingMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'main.middleware.PerformanceMiddleware',
+    'main.middleware.PythonProfilingMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'fusion_force.urls'
+
+# ========== TEMPLATES ==========
+# 'cached': compiled once per process (production). 'checksum': cached, but a
+# template whose file content changed is re-parsed (development). The profile
+# picks the mode with template_loaders(). Templates in templates/ and the
+# admin are precompiled at boot (main/startup.py).
+TEMPLATE_CACHING_LOADERS = {
+    'cached': 'django.template.loaders.cached.Loader',
+    'checksum': 'main.template_loaders.ChecksumLoader',
+}
+
+
+def template_loaders(mode):
+    return [
+        (TEMPLATE_CACHING_LOADERS[mode], [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+            'loaders': template_loaders('cached'),
+        },
+    },
+]
+
+WSGI_APPLICATION = 'fusion_force.wsgi.application'
+ASGI_APPLICATION = 'fusion_force.asgi.application'
+
+# Serve home and the submission APIs from main/async_views.py. Only for the
+# ASGI (uvicorn worker) deployment described in fusion_force/asgi.py.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
+
+# ========== STATIC FILES ==========
+# Served only by WhiteNoiseMiddleware. collectstatic writes hashed names plus
+# .gz and .br (Brotli package) copies; hashed names get a 10-year immutable
+# Cache-Control, unhashed names WHITENOISE_MAX_AGE.
+STATIC_URL = '/static/'
+STATIC_ROOT = os.environ.get('STATIC_ROOT', BASE_DIR / 'staticfiles')
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',  # This is where your CSS, JS, images should be
+]
+# Skipped by collectstatic: static/media is a copy of MEDIA_ROOT, scss is
+# only the source of style.css, backups are never linked (audit_assets)
+STATICFILES_IGNORE_PATTERNS = ['media', 'scss', '*.backup_*']
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+WHITENOISE_MANIFEST_STRICT = False
+WHITENOISE_MAX_AGE = int(os.environ.get('WHITENOISE_MAX_AGE', 60 * 60))
+
+# ========== MEDIA FILES ==========
+# Served by main.media.serve_media (see fusion_force/urls.py)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_CACHE_MAX_AGE = int(os.environ.get('MEDIA_CACHE_MAX_AGE', 24 * 60 * 60))
+DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
+# ========== CACHE ==========
+# Two tiers (main/cache_backends.py): a per-process LRU in front of a cache
+# shared by every worker. CACHE_BACKEND picks the shared tier: 'file'
+# (default, CACHE_DIR), 'db' (needs `manage.py createcachetable`) or 'redis'
+# (REDIS_URL, needs the redis package). Values written through another
+# worker show up here within CACHE_LOCAL_TIMEOUT seconds. Bumping
+# CACHE_VERSION makes every existing key unreachable (e.g. on a deploy that
+# changes cached structures).
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+SHARED_CACHES = {
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', BASE_DIR / 'cache'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'main_cache',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'main.cache_backends.TieredCache',
+        'LOCATION': 'fusion-force',
+        'VERSION': int(os.environ.get('CACHE_VERSION', 1)),
+        'OPTIONS': {
+            'SHARED': 'shared',
+            # The admin fragment cache needs thousands of entries on long changelists
+            'LOCAL_MAX_ENTRIES': 5000,
+            'LOCAL_MAX_BYTES': int(os.environ.get('CACHE_LOCAL_MAX_MB', 32)) * 1024 * 1024,
+            'LOCAL_TIMEOUT': int(os.environ.get('CACHE_LOCAL_TIMEOUT', 30)),
+        },
+    },
+    'shared': SHARED_CACHES[CACHE_BACKEND],
+}
+
+# ========== EMAIL ==========
+# Views only queue OutboundEmail rows; `python manage.py send_outbox --loop`
+# delivers them. Use the locmem/filebased backends for local testing.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 30))
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Fusion Force LLC <info@fusionforce.com>')
+BOOKING_NOTIFICATION_EMAIL = os.environ.get('BOOKING_NOTIFICATION_EMAIL', '')
+# Base of absolute links in emails, which have no request to build them from
+SITE_URL = os.environ.get('SITE_URL', 'https://fusionforcellc-production.up.railway.app')
+
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+OUTBOX_MAX_WORKERS = int(os.environ.get('OUTBOX_MAX_WORKERS', 4))
+OUTBOX_PER_DOMAIN_CONCURRENCY = int(os.environ.get('OUTBOX_PER_DOMAIN_CONCURRENCY', 2))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+
+# ========== PROFILING ==========
+# ?_profile=1 adds SQL count/time headers to a response, ?_profile=sql returns
+# the queries as JSON instead of the page (main.middleware.PerformanceMiddleware).
+# Allowed for staff users or with an X-Profile-Token header equal to
+# PROFILING_TOKEN; works with DEBUG off.
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+
+# Request instrumentation (main.middleware.PerformanceMiddleware): fraction
+# of requests measured for /metrics histograms and JSON log lines on the
+# main.perf logger; staff requests are always measured and get Server-Timing.
+PERF_SAMPLE_RATE = float(os.environ.get('PERF_SAMPLE_RATE', 0))
+
+# Python profiles of single requests (main.middleware.PythonProfilingMiddleware):
+# signed links from the admin's Profiles page, or an "X-Py-Profile: cprofile"
+# (or "sample") header from staff. The last PROFILE_KEEP are kept on disk.
+PROFILE_DIR = os.environ.get('PROFILE_DIR', BASE_DIR / 'profiles')
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))
+PROFILE_LINK_MAX_AGE = int(os.environ.get('PROFILE_LINK_MAX_AGE', 60 * 60))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 2))
+
+# Logging pipeline (main/log.py): records are filtered in the calling thread,
+# then a listener thread writes them to stdout as JSON lines and batches
+# activity (log_activity) and errors into SystemLog rows.
+# LOG_SAMPLE_RATES keeps a fraction of the sub-WARNING records of noisy
+# loggers, e.g. "main.perf=0.1,django.request=0.5"; LOG_RATE_LIMIT caps each
+# logger to that many records per second (bursts of 100). Errors and activity
+# records (SystemLog rows, dashboard rollups) are never dropped.
+LOGGING_CONFIG = 'main.log.configure'
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'main.log.JsonFormatter'},
+    },
+    'filters': {
+        'sample': {'()': 'main.log.SampleFilter', 'rates': os.environ.get('LOG_SAMPLE_RATES', '')},
+        'rate_limit': {
+            '()': 'main.log.RateLimitFilter',
+            'per_second': float(os.environ.get('LOG_RATE_LIMIT', 20)),
+            'burst': 100,
+        },
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'stream': 'ext://sys.stdout', 'formatter': 'json'},
+        'systemlog': {'()': 'main.log.SystemLogHandler'},
+        'queue': {
+            '()': 'main.log.QueueHandler',
+            'targets': ['console', 'systemlog'],
+            'filters': ['sample', 'rate_limit'],
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': os.environ.get('LOG_LEVEL', 'INFO')},
+    'loggers': {
+        'django': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+        # Activity records are SystemLog rows (data), whatever LOG_LEVEL is
+        'main.activity': {'level': 'INFO'},
+        'main.perf': {'level': os.environ.get('PERF_LOG_LEVEL', 'INFO')},
+    },
+}
+
+# /healthz (liveness) and /readyz (warm-up, then database, cache and storage
+# checks; main/health.py). Readiness is re-checked at most this often per worker.
+READY_CACHE_SECONDS = float(os.environ.get('READY_CACHE_SECONDS', 5))
+
+# /api/content/v1/ (main/content_api.py): browser/CDN max-age of a response,
+# and how long a serialized payload stays cached (its key changes with the content)
+CONTENT_API_MAX_AGE = int(os.environ.get('CONTENT_API_MAX_AGE', 60))
+CONTENT_API_CACHE_TIMEOUT = int(os.environ.get('CONTENT_API_CACHE_TIMEOUT', 24 * 60 * 60))
+
+# /metrics (Prometheus text format): staff users, or
+# "Authorization: Bearer <METRICS_TOKEN>" for a scraper
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Security - Disable temporarily to fix CSRF
+SECURE_SSL_REDIRECT = False
+SESSION_COOKIE_SECURE = False
+CSRF_COOKIE_SECURE = False
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+
+# Other settings
+AUTH_PASSWORD_VALIDATORS = [
+    {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
+    {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
+    {'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator'},
+    {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
+]
+
+LANGUAGE_CODE = 'en-us'
+TIME_ZONE = 'UTC'
+USE_I18N = True
+USE_TZ = True
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -0,0 +1,19 @@
+# fusion_force/settings/dev.py - local development
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+# Also add HTTP for local development
+CSRF_TRUSTED_ORIGINS = CSRF_TRUSTED_ORIGINS + [
+    'http://localhost:8000',
+    'http://127.0.0.1:8000',
+    'http://localhost:8080',
+    'http://127.0.0.1:8080',
+]
+
+INTERNAL_IPS = ['127.0.0.1']
+SITE_URL = os.environ.get('SITE_URL', 'http://127.0.0.1:8000')
+
+TEMPLATE_LOADER_MODE = os.environ.get('TEMPLATE_LOADER_MODE', 'checksum')
+TEMPLATES[0]['OPTIONS']['loaders'] = template_loaders(TEMPLATE_LOADER_MODE)
+TEMPLATES[0]['OPTIONS']['context_processors'].insert(0, 'django.template.context_processors.debug')
@@ -0,0 +1,27 @@
+# fusion_force/settings/prod.py - Railway
+"""
+Production profile: nothing on the request path collects debug data.
+
+- DEBUG off: no connection.queries retention, no technical 500 pages, no
+  template debug info, WhiteNoise serves the collected files without
+  re-scanning, no debug context processor.
+- Compiled templates are cached for the life of the process.
+- Database connections persist between requests: pooled for PostgreSQL,
+  per thread (with health checks) otherwise.
+
+Per-request SQL/timing profiles are still available to staff (or with
+PROFILING_TOKEN) through main.middleware.PerformanceMiddleware.
+"""
+from .base import *  # noqa: F401,F403
+
+DEBUG = False
+
+TEMPLATE_LOADER_MODE = os.environ.get('TEMPLATE_LOADER_MODE', 'cached')
+TEMPLATES[0]['OPTIONS']['loaders'] = template_loaders(TEMPLATE_LOADER_MODE)
+
+CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+for database in DATABASES.values():
+    if 'POOL' not in database:
+        # The pooled backend keeps connections open itself
+        database['CONN_MAX_AGE'] = CONN_MAX_AGE
+        database['CONN_HEALTH_CHECKS'] = True
@@ -1,17 +1,23 @@
 # fusion_force/urls.py
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from main.health import healthz, readyz
+from main.media import serve_media
+from main.metrics import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
     path('', include('main.urls')),
 ]
 
-# 🔥 CRITICAL FIX: ADD BOTH STATIC AND MEDIA FILES 🔥
-if settings.DEBUG:
-    # This serves static files during development
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    # This serves media files during development  
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Static files: WhiteNoiseMiddleware (from STATIC_ROOT, or the finders when DEBUG).
+# Uploads: stat'ed per request so files added after boot are served right away.
+if settings.MEDIA_URL.startswith('/'):
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+    ]
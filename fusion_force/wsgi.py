@@ -1,12 +1,50 @@
-# fusion_force/wsgi.py - FIXED
+# fusion_force/wsgi.py
+"""
+WSGI entry point.
+
+``create_app`` is safe to run in gunicorn's master with ``--preload``: it
+sets Django up, warms lazily-loaded state (see main/startup.py) and closes
+any database connection before workers are forked. Phase timings are kept
+in STARTUP_TIMINGS for ``manage.py startup_report``.
+"""
 import os
-from django.core.wsgi import get_wsgi_application
-from whitenoise import WhiteNoise
+import time
+
+STARTUP_TIMINGS = {}
+
+
+def create_app(warm=True):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fusion_force.settings')
+    started = time.perf_counter()
+
+    import django
+    from django.conf import settings
+    settings.INSTALLED_APPS  # imports the settings module
+    STARTUP_TIMINGS['settings'] = (time.perf_counter() - started) * 1000
+
+    mark = time.perf_counter()
+    django.setup(set_prefix=False)
+    STARTUP_TIMINGS['apps_ready'] = (time.perf_counter() - mark) * 1000
+
+    # Static files are served by WhiteNoiseMiddleware (see settings.MIDDLEWARE) and
+    # uploads by main.media.serve_media, so the handler is not wrapped here.
+    mark = time.perf_counter()
+    from django.core.handlers.wsgi import WSGIHandler
+    app = WSGIHandler()
+    STARTUP_TIMINGS['middleware'] = (time.perf_counter() - mark) * 1000
+
+    if warm:
+        from main.startup import warm_up
+        warm_up(STARTUP_TIMINGS)
+
+    # Never hand an open connection to forked workers
+    from django.db import connections
+    from main.db_backends.pool import close_pools
+    connections.close_all()
+    close_pools()
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fusion_force.settings')
+    STARTUP_TIMINGS['total'] = (time.perf_counter() - started) * 1000
+    return app
 
-application = get_wsgi_application()
 
-# FIX: Use correct path for WhiteNoise
-application = WhiteNoise(application, root=os.path.join(os.path.dirname(__file__), '..', 'staticfiles'))
-application.add_files(os.path.join(os.path.dirname(__file__), '..', 'media'), prefix='/media/')
\ No newline at end of file
+application = create_app()
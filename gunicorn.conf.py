@@ -0,0 +1,140 @@
+# gunicorn.conf.py
+"""
+Gunicorn runtime configuration, read by ``gunicorn -c gunicorn.conf.py``
+(Procfile, railway.json) and picked up automatically from this directory.
+
+Sizing, unless set through the environment:
+
+- workers: 2 x CPUs + 1, capped by the memory available to the container
+  (cgroup limit, else MemAvailable) at GUNICORN_WORKER_MEMORY_MB each after
+  GUNICORN_MEMORY_RESERVE_MB for the master and the rest of the container.
+- threads: when memory caps the workers below the CPU target, each worker
+  gets threads to make up for it (gthread), at most DB_POOL_MAX_SIZE so
+  every thread can hold a pooled connection.
+
+Workers are recycled after GUNICORN_MAX_REQUESTS requests (plus up to
+GUNICORN_MAX_REQUESTS_JITTER, so they do not all restart at once), which
+bounds slow memory growth. The app is preloaded in the master: code,
+compiled templates and the static manifest are shared copy-on-write
+(see main/startup.py). ``manage.py soak_test`` checks RSS stays flat.
+
+ASYNC_VIEWS=True serves fusion_force.asgi with uvicorn workers instead.
+"""
+import math
+import os
+
+# ============ SIZING ============
+MB = 1024 * 1024
+
+
+def read_int(path):
+    try:
+        with open(path) as handle:
+            value = handle.read().split()[0]
+    except (OSError, IndexError):
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def cpu_count():
+    """CPUs this process may use: affinity, then a cgroup v2 quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as handle:
+            quota, period = handle.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def memory_available():
+    """Bytes this container may still use: cgroup limit minus usage, else MemAvailable"""
+    for limit_path, usage_path in (
+        ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory.current'),
+        ('/sys/fs/cgroup/memory/memory.limit_in_bytes', '/sys/fs/cgroup/memory/memory.usage_in_bytes'),
+    ):
+        limit = read_int(limit_path)
+        # "max", or v1's "unlimited" (a huge number)
+        if limit is not None and limit < 1 << 60:
+            return max(0, limit - (read_int(usage_path) or 0))
+    try:
+        with open('/proc/meminfo') as handle:
+            for line in handle:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def sizing(cpus, memory, worker_mb, reserve_mb, max_threads):
+    """(workers, threads) for ``cpus`` and ``memory`` bytes (None: unknown)"""
+    target = 2 * cpus + 1
+    workers = target
+    if memory is not None:
+        workers = max(1, min(target, (memory // MB - reserve_mb) // worker_mb))
+    threads = max(1, min(max_threads, math.ceil(target / workers)))
+    return workers, threads
+
+
+CPUS = cpu_count()
+MEMORY = memory_available()
+AUTO_WORKERS, AUTO_THREADS = sizing(
+    CPUS, MEMORY,
+    worker_mb=int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', 150)),
+    reserve_mb=int(os.environ.get('GUNICORN_MEMORY_RESERVE_MB', 128)),
+    max_threads=int(os.environ.get('DB_POOL_MAX_SIZE', 4)),
+)
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
+
+# ============ SERVER ============
+wsgi_app = 'fusion_force.asgi:application' if ASYNC_VIEWS else 'fusion_force.wsgi'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', AUTO_WORKERS))
+threads = int(os.environ.get('GUNICORN_THREADS', 1 if ASYNC_VIEWS else AUTO_THREADS))
+if ASYNC_VIEWS:
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    worker_class = 'gthread' if threads > 1 else 'sync'
+
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+accesslog = '-'
+
+
+# ============ HOOKS ============
+def when_ready(server):
+    server.log.info(
+        "%s x %s thread(s), %s worker(s) (auto: %s x %s for %s CPU(s), %s MB available), "
+        "recycled after %s-%s requests",
+        workers, threads, worker_class, AUTO_WORKERS, AUTO_THREADS, CPUS,
+        MEMORY // MB if MEMORY is not None else 'unknown', max_requests, max_requests + max_requests_jitter,
+    )
+
+
+def post_worker_init(worker):
+    # Connections and the home page section cache, before the worker
+    # accepts its first request (see main.startup.warm_worker)
+    from main.startup import warm_worker
+    try:
+        warm_worker()
+    except Exception:
+        worker.log.exception('Worker warm-up failed; /readyz retries it')
+
+
+def worker_exit(server, worker):
+    # Recycled or stopped: queued log records first, since their SystemLog
+    # rows and rollup counters go through the write queue
+    from main import log, write_queue
+    log.flush(timeout=5)
+    write_queue.flush(timeout=graceful_timeout / 2)
@@ -1,35 +1,48 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from django.urls import reverse
-from django.db.models import Count
+from django.urls import path, reverse
+from django.template.response import TemplateResponse
+from django.db.models import Count, F, Q, Sum
 from django.utils import timezone
 from django.contrib import messages
-from django.http import HttpResponseRedirect, HttpResponse
+from django.http import FileResponse, Http404, HttpResponseRedirect, HttpResponse
 from django.utils.safestring import mark_safe
 import json
 import csv
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.cache import cache
 
 from .models import (
     SiteSettings, HeroImage, AboutSection, Service,
     ImpactResult, GalleryImage, Testimonial,
     NewsletterContent, ContactSubmission, NewsletterSubscription,
-    FormSubmission, SystemLog, FreeEbook
+    FormSubmission, SystemLog, FreeEbook, OutboundEmail,
+    NewsletterCampaign, CampaignRecipient, DailyDownloadStat, ContactStatusEvent
+)
+from .analytics import dashboard_context
+from .sections import bump_versions
+from . import pipeline, profiler
+from .admin_fragments import (
+    FRAGMENT_TIMEOUT, active_badge, cached_fragment, days_since, file_size,
+    format_file_size, fragment_key, image_fragment, render_badge
 )
 
 # ============ ADMIN SITE CONFIG ============
 admin.site.site_header = "FUSION-FORCE LLC ADMIN"
 admin.site.site_title = "Fusion Force Administration"
 admin.site.index_title = "Welcome to Fusion Force Dashboard"
+admin.site.index_template = 'admin/main/index.html'
 
 # ============ CUSTOM ADMIN ACTIONS ============
 def make_active(modeladmin, request, queryset):
     queryset.update(is_active=True)
+    bump_versions(queryset.model)
     messages.success(request, f"{queryset.count()} items marked as active")
 make_active.short_description = "✅ Mark selected as active"
 
 def make_inactive(modeladmin, request, queryset):
     queryset.update(is_active=False)
+    bump_versions(queryset.model)
     messages.success(request, f"{queryset.count()} items marked as inactive")
 make_inactive.short_description = "❌ Mark selected as inactive"
 
@@ -79,21 +92,20 @@ class SiteSettingsAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at', 'logo_preview_large']
     
     def logo_preview(self, obj):
-        if obj.logo:
-            return format_html(
-                '<img src="{}" style="width: 50px; height: 50px; object-fit: contain; background: #f0f0f0; padding: 5px; border-radius: 5px;" />', 
-                obj.logo.url
-            )
-        return format_html('<div style="width: 50px; height: 50px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 5px;">No Logo</div>')
+        return image_fragment(
+            obj, 'logo',
+            'width: 50px; height: 50px; object-fit: contain; background: #f0f0f0; padding: 5px; border-radius: 5px;',
+            'No Logo',
+            'width: 50px; height: 50px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 5px;'
+        )
     logo_preview.short_description = 'Logo'
     
     def logo_preview_large(self, obj):
-        if obj.logo:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: contain; background: #f0f0f0; padding: 10px; border-radius: 10px; border: 1px solid #ddd;" />', 
-                obj.logo.url
-            )
-        return "No logo uploaded"
+        return image_fragment(
+            obj, 'logo',
+            'max-width: 300px; max-height: 200px; object-fit: contain; background: #f0f0f0; padding: 10px; border-radius: 10px; border: 1px solid #ddd;',
+            'No logo uploaded'
+        )
     logo_preview_large.short_description = 'Logo Preview'
     
     def updated_at_display(self, obj):
@@ -131,21 +143,20 @@ class HeroImageAdmin(admin.ModelAdmin):
     list_per_page = 20
     
     def image_preview(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="width: 60px; height: 40px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;" />', 
-                obj.image.url
-            )
-        return format_html('<div style="width: 60px; height: 40px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;">No Image</div>')
+        return image_fragment(
+            obj, 'image',
+            'width: 60px; height: 40px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;',
+            'No Image',
+            'width: 60px; height: 40px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;'
+        )
     image_preview.short_description = 'Preview'
     
     def image_preview_large(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;" />', 
-                obj.image.url
-            )
-        return "No image uploaded"
+        return image_fragment(
+            obj, 'image',
+            'max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;',
+            'No image uploaded'
+        )
     image_preview_large.short_description = 'Large Preview'
     
     def position_display(self, obj):
@@ -158,13 +169,7 @@ class HeroImageAdmin(admin.ModelAdmin):
     position_display.short_description = 'Position'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def created_at_display(self, obj):
@@ -196,22 +201,16 @@ class AboutSectionAdmin(admin.ModelAdmin):
     actions = [make_active, make_inactive, duplicate_items]
     
     def image_preview(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="width: 50px; height: 50px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;" />', 
-                obj.image.url
-            )
-        return format_html('<div style="width: 50px; height: 50px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;">No Image</div>')
+        return image_fragment(
+            obj, 'image',
+            'width: 50px; height: 50px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;',
+            'No Image',
+            'width: 50px; height: 50px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;'
+        )
     image_preview.short_description = 'Image'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def created_at_display(self, obj):
@@ -223,24 +222,18 @@ class AboutSectionAdmin(admin.ModelAdmin):
     updated_at_display.short_description = 'Updated At'
     
     def image_preview_large(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;" />', 
-                obj.image.url
-            )
-        return "No image uploaded"
+        return image_fragment(
+            obj, 'image',
+            'max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;',
+            'No image uploaded'
+        )
     image_preview_large.short_description = 'Image Preview'
     
     def bullet_points_preview(self, obj):
         if obj.bullet_points:
-            points = obj.bullet_points.split('\n')
-            html = '<div style="background: #f8f9fa; padding: 10px; border-radius: 5px; border: 1px solid #ddd;">'
-            html += '<strong>Bullet Points Preview:</strong><ul style="margin: 5px 0 0 20px;">'
-            for point in points:
-                if point.strip():
-                    html += f'<li>{point.strip()}</li>'
-            html += '</ul></div>'
-            return format_html(html)
+            return cached_fragment('bullet_points_preview', obj, lambda: {
+                'points': [point.strip() for point in obj.bullet_points.split('\n') if point.strip()],
+            })
         return "No bullet points"
     bullet_points_preview.short_description = 'Bullet Points Preview'
     
@@ -255,12 +248,11 @@ class AboutSectionAdmin(admin.ModelAdmin):
     content_preview_field.short_description = 'Content Preview'
     
     def image_2_preview_large(self, obj):
-        if obj.image_2:
-            return format_html(
-                '<img src="{}" style="max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd; margin-top: 10px;" />', 
-                obj.image_2.url
-            )
-        return "No second image uploaded"
+        return image_fragment(
+            obj, 'image_2',
+            'max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd; margin-top: 10px;',
+            'No second image uploaded'
+        )
     image_2_preview_large.short_description = 'Second Image Preview'
     
     fieldsets = (
@@ -320,32 +312,16 @@ class ServiceAdmin(admin.ModelAdmin):
             'training': '#007bff',
             'sales': '#6f42c1'
         }
-        color = colors.get(obj.service_type, '#6c757d')
-        return format_html(
-            '<span style="background: {}; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">{}</span>',
-            color,
-            obj.get_service_type_display()
-        )
+        return render_badge(colors.get(obj.service_type, '#6c757d'), obj.get_service_type_display())
     service_type_display.short_description = 'Type'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def topics_preview(self, obj):
         if obj.topics_list:
-            html = '<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border: 1px solid #dee2e6;">'
-            html += '<h4 style="margin-top: 0; color: #053e91;">Topics Preview:</h4>'
-            for topic in obj.topics_list:
-                html += f'<span style="display: inline-block; background: white; color: #053e91; padding: 4px 12px; margin: 3px; border-radius: 20px; border: 1px solid #053e91; font-size: 13px;">{topic}</span> '
-            html += '</div>'
-            return format_html(html)
+            return cached_fragment('topics_preview', obj, lambda: {'topics': obj.topics_list})
         return "No topics defined"
     topics_preview.short_description = 'Topics Preview'
     
@@ -385,13 +361,7 @@ class ImpactResultAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def created_at_display(self, obj):
@@ -426,21 +396,20 @@ class GalleryImageAdmin(admin.ModelAdmin):
     list_per_page = 20
     
     def image_preview(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="width: 60px; height: 40px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;" />', 
-                obj.image.url
-            )
-        return format_html('<div style="width: 60px; height: 40px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;">No Image</div>')
+        return image_fragment(
+            obj, 'image',
+            'width: 60px; height: 40px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;',
+            'No Image',
+            'width: 60px; height: 40px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;'
+        )
     image_preview.short_description = 'Preview'
     
     def image_preview_large(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;" />', 
-                obj.image.url
-            )
-        return "No image uploaded"
+        return image_fragment(
+            obj, 'image',
+            'max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;',
+            'No image uploaded'
+        )
     image_preview_large.short_description = 'Large Preview'
     
     def position_display(self, obj):
@@ -449,22 +418,11 @@ class GalleryImageAdmin(admin.ModelAdmin):
             'small': '#17a2b8',
             'tall': '#28a745'
         }
-        color = colors.get(obj.position, '#6c757d')
-        return format_html(
-            '<span style="background: {}; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">{}</span>',
-            color,
-            obj.get_position_display()
-        )
+        return render_badge(colors.get(obj.position, '#6c757d'), obj.get_position_display())
     position_display.short_description = 'Position'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def created_at_display(self, obj):
@@ -499,37 +457,29 @@ class TestimonialAdmin(admin.ModelAdmin):
     list_per_page = 20
     
     def avatar_preview(self, obj):
-        if obj.avatar:
-            return format_html(
-                '<img src="{}" style="width: 40px; height: 40px; object-fit: cover; border-radius: 50%; border: 2px solid #053e91;" />', 
-                obj.avatar.url
-            )
-        return format_html(
-            '<div style="width: 40px; height: 40px; background: #f0f0f0; border-radius: 50%; display: flex; align-items: center; justify-content: center; color: #053e91; font-weight: bold; font-size: 14px;">{}</div>',
-            obj.client_name[:2].upper() if obj.client_name else "??"
-        )
+        return cached_fragment('avatar_preview', obj, lambda: {
+            'url': obj.avatar.url if obj.avatar else '',
+            'initials': obj.client_name[:2].upper() if obj.client_name else "??",
+            'size': 40,
+            'border': 2,
+            'font_size': 14,
+            'large': False,
+        }, 40, obj.avatar.name or '')
     avatar_preview.short_description = 'Avatar'
     
     def avatar_preview_large(self, obj):
-        if obj.avatar:
-            return format_html(
-                '<img src="{}" style="width: 150px; height: 150px; object-fit: cover; border-radius: 50%; border: 3px solid #053e91;" />', 
-                obj.avatar.url
-            )
-        return format_html(
-            '<div style="width: 150px; height: 150px; background: #f0f0f0; border-radius: 50%; display: flex; align-items: center; justify-content: center; color: #053e91; font-weight: bold; font-size: 24px; border: 3px solid #053e91;">{}</div>',
-            obj.client_name[:2].upper() if obj.client_name else "??"
-        )
+        return cached_fragment('avatar_preview', obj, lambda: {
+            'url': obj.avatar.url if obj.avatar else '',
+            'initials': obj.client_name[:2].upper() if obj.client_name else "??",
+            'size': 150,
+            'border': 3,
+            'font_size': 24,
+            'large': True,
+        }, 150, obj.avatar.name or '')
     avatar_preview_large.short_description = 'Large Preview'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def created_at_display(self, obj):
@@ -563,24 +513,23 @@ class NewsletterContentAdmin(admin.ModelAdmin):
     list_display_links = ['title']
     search_fields = ['title', 'subtitle']
     readonly_fields = ['created_at', 'updated_at', 'image_preview_large', 'benefits_preview', 'pdf_link']
-    actions = [make_active, make_inactive]
+    actions = [make_active, make_inactive, 'create_campaign']
     
     def image_preview(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="width: 50px; height: 50px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;" />', 
-                obj.image.url
-            )
-        return format_html('<div style="width: 50px; height: 50px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;">No Image</div>')
+        return image_fragment(
+            obj, 'image',
+            'width: 50px; height: 50px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;',
+            'No Image',
+            'width: 50px; height: 50px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px;'
+        )
     image_preview.short_description = 'Image'
     
     def image_preview_large(self, obj):
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;" />', 
-                obj.image.url
-            )
-        return "No image uploaded"
+        return image_fragment(
+            obj, 'image',
+            'max-width: 400px; max-height: 300px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd;',
+            'No image uploaded'
+        )
     image_preview_large.short_description = 'Large Preview'
     
     def pdf_preview(self, obj):
@@ -604,26 +553,12 @@ class NewsletterContentAdmin(admin.ModelAdmin):
     pdf_link.short_description = 'PDF Link'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def benefits_preview(self, obj):
         if obj.benefits_list:
-            html = '<div style="background: #f8f9fa; padding: 20px; border-radius: 8px; border: 1px solid #dee2e6;">'
-            html += '<h4 style="margin-top: 0; color: #053e91;">Benefits Preview (Two Columns):</h4>'
-            html += '<div style="column-count: 2; column-gap: 30px;">'
-            for benefit in obj.benefits_list:
-                html += f'<div style="margin-bottom: 10px; break-inside: avoid;">'
-                html += f'<span style="color: #28a745; margin-right: 8px;">✓</span> {benefit}'
-                html += '</div>'
-            html += '</div></div>'
-            return format_html(html)
+            return cached_fragment('benefits_preview', obj, lambda: {'benefits': obj.benefits_list})
         return "No benefits defined"
     benefits_preview.short_description = 'Benefits Preview'
     
@@ -662,6 +597,19 @@ class NewsletterContentAdmin(admin.ModelAdmin):
     
     def has_add_permission(self, request):
         return NewsletterContent.objects.count() == 0
+    
+    def create_campaign(self, request, queryset):
+        for newsletter in queryset:
+            body = (
+                "Hi $name,\n\n"
+                "{{ newsletter.subtitle }}\n\n"
+                "{% for benefit in newsletter.benefits_list %}- {{ benefit }}\n{% endfor %}"
+                "{% if pdf_url %}\nRead this issue: {{ pdf_url }}\n{% endif %}"
+                "\nBest regards,\n{{ site_settings.site_name }}\n"
+            )
+            NewsletterCampaign.objects.create(newsletter=newsletter, subject=newsletter.title, body=body)
+        messages.success(request, f"{queryset.count()} draft campaign(s) created. Review and queue them under Newsletter Campaigns.")
+    create_campaign.short_description = "📨 Create email campaign from selected"
 
 # ============ FREE EBOOK ADMIN ============
 @admin.register(FreeEbook)
@@ -675,146 +623,91 @@ class FreeEbookAdmin(admin.ModelAdmin):
     list_per_page = 20
     
     def cover_preview(self, obj):
-        if obj.cover_image:
-            return format_html(
-                '<img src="{}" style="width: 50px; height: 65px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;" />', 
-                obj.cover_image.url
-            )
-        return format_html('<div style="width: 50px; height: 65px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px; color: #6c757d; font-size: 10px;">No Cover</div>')
+        return image_fragment(
+            obj, 'cover_image',
+            'width: 50px; height: 65px; object-fit: cover; border-radius: 4px; border: 1px solid #ddd;',
+            'No Cover',
+            'width: 50px; height: 65px; background: #f0f0f0; display: flex; align-items: center; justify-content: center; border-radius: 4px; color: #6c757d; font-size: 10px;'
+        )
     cover_preview.short_description = 'Cover'
     
     def cover_preview_large(self, obj):
-        if obj.cover_image:
-            return format_html(
-                '<img src="{}" style="max-width: 200px; max-height: 260px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd; margin: 10px 0;" />', 
-                obj.cover_image.url
-            )
-        return format_html('<div style="width: 200px; height: 260px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #ddd; display: flex; align-items: center; justify-content: center; color: #6c757d; margin: 10px 0;">No cover image</div>')
+        return image_fragment(
+            obj, 'cover_image',
+            'max-width: 200px; max-height: 260px; object-fit: contain; border-radius: 8px; border: 2px solid #ddd; margin: 10px 0;',
+            'No cover image',
+            'width: 200px; height: 260px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #ddd; display: flex; align-items: center; justify-content: center; color: #6c757d; margin: 10px 0;'
+        )
     cover_preview_large.short_description = 'Cover Preview'
     
     def file_size_display(self, obj):
-        """Safe file size display that handles missing files"""
-        try:
-            if obj.ebook_file and obj.ebook_file.name:
-                # Check if file exists before trying to get size
-                try:
-                    file_size = obj.ebook_file.size
-                except (FileNotFoundError, OSError):
-                    return "⚠️ File missing"
-                
-                # Format the size
-                if file_size < 1024:
-                    return f"{file_size} B"
-                elif file_size < 1024 * 1024:
-                    return f"{file_size / 1024:.1f} KB"
-                elif file_size < 1024 * 1024 * 1024:
-                    return f"{file_size / (1024 * 1024):.1f} MB"
-                else:
-                    return f"{file_size / (1024 * 1024 * 1024):.1f} GB"
+        """Safe file size display that handles missing files (cached, it stats the file)"""
+        if not (obj.ebook_file and obj.ebook_file.name):
             return "No file"
-        except Exception as e:
-            return "Error"
+        key = fragment_key('file_size', obj, obj.ebook_file.name)
+        display = cache.get(key)
+        if display is None:
+            size = file_size(obj.ebook_file)
+            display = "⚠️ File missing" if size is None else format_file_size(size)
+            cache.set(key, display, FRAGMENT_TIMEOUT)
+        return display
     file_size_display.short_description = 'File Size'
     
     def pdf_preview_large(self, obj):
-        if obj.ebook_file:
-            file_size = obj.ebook_file.size if obj.ebook_file else 0
-            
-            # Calculate size in appropriate units
-            if file_size < 1024:
-                size_display = f"{file_size} B"
-            elif file_size < 1024 * 1024:
-                size_display = f"{file_size / 1024:.1f} KB"
-            elif file_size < 1024 * 1024 * 1024:
-                size_display = f"{file_size / (1024 * 1024):.1f} MB"
-            else:
-                size_display = f"{file_size / (1024 * 1024 * 1024):.1f} GB"
-            
+        def build_context():
+            if not obj.ebook_file:
+                return {}
+            size = file_size(obj.ebook_file)
             file_name = obj.ebook_file.name.split("/")[-1]
-            file_extension = file_name.split('.')[-1].upper() if '.' in file_name else 'UNKNOWN'
-            
-            html = '<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border: 1px solid #dee2e6; margin: 10px 0;">'
-            html += f'<h5 style="margin-top: 0; color: #053e91;">File Details:</h5>'
-            html += f'<p style="margin: 5px 0;"><strong>File Name:</strong> {file_name}</p>'
-            html += f'<p style="margin: 5px 0;"><strong>File Type:</strong> {file_extension}</p>'
-            html += f'<p style="margin: 5px 0;"><strong>File Size:</strong> {size_display}</p>'
-            html += f'<p style="margin: 5px 0;"><strong>Total Downloads:</strong> {obj.download_count}</p>'
-            html += f'<a href="{obj.ebook_file.url}" target="_blank" style="background: #28a745; color: white; padding: 8px 15px; border-radius: 5px; text-decoration: none; display: inline-block; margin-top: 10px; margin-right: 10px;">'
-            html += '<i class="fas fa-external-link-alt me-1"></i> Preview in New Tab</a>'
-            html += f'<a href="{obj.ebook_file.url}" download style="background: #007bff; color: white; padding: 8px 15px; border-radius: 5px; text-decoration: none; display: inline-block; margin-top: 10px;">'
-            html += '<i class="fas fa-download me-1"></i> Download File</a>'
-            html += '</div>'
-            return format_html(html)
-        return format_html('<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border: 1px solid #dee2e6; color: #6c757d; margin: 10px 0;">No eBook file uploaded</div>')
+            return {
+                'file_name': file_name,
+                'file_extension': file_name.split('.')[-1].upper() if '.' in file_name else 'UNKNOWN',
+                'size_display': "⚠️ File missing" if size is None else format_file_size(size),
+                'download_count': obj.download_count,
+                'url': obj.ebook_file.url,
+            }
+        return cached_fragment('ebook_file_preview', obj, build_context, obj.ebook_file.name or '', obj.download_count)
     pdf_preview_large.short_description = 'File Preview'
     
     def file_info(self, obj):
-        if obj.ebook_file:
-            html = '<div style="background: #e3f2fd; padding: 15px; border-radius: 8px; border: 1px solid #bbdefb; margin: 10px 0;">'
-            html += '<h5 style="margin-top: 0; color: #1565c0;">File Information:</h5>'
-            html += '<ul style="margin: 5px 0 0 0; padding-left: 20px;">'
-            html += '<li><strong>Uploaded:</strong> ' + obj.created_at.strftime('%Y-%m-%d %H:%M') + '</li>'
-            html += '<li><strong>Last Updated:</strong> ' + obj.updated_at.strftime('%Y-%m-%d %H:%M') + '</li>'
-            html += '<li><strong>Current Status:</strong> ' + ('Active' if obj.is_active else 'Inactive') + '</li>'
-            
-            if obj.download_count > 0:
-                html += f'<li><strong>Download Popularity:</strong> {obj.download_count} download{"s" if obj.download_count != 1 else ""}</li>'
-                days_since_creation = (timezone.now() - obj.created_at).days or 1
-                avg_daily = obj.download_count / days_since_creation
-                html += f'<li><strong>Average Daily Downloads:</strong> {avg_daily:.1f}</li>'
-            
-            html += '</ul>'
-            html += '<p style="margin: 10px 0 0 0; font-size: 0.9em; color: #0d47a1;"><i class="fas fa-info-circle me-1"></i> This eBook will be offered to newsletter subscribers as a free gift.</p>'
-            html += '</div>'
-            return format_html(html)
-        return format_html('<div style="background: #fff3cd; padding: 15px; border-radius: 8px; border: 1px solid #ffecb5; color: #856404; margin: 10px 0;">'
-                          '<i class="fas fa-exclamation-triangle me-1"></i> No eBook file uploaded. Please upload a file to make this eBook available to subscribers.'
-                          '</div>')
+        def build_context():
+            return {
+                'ebook': obj,
+                'has_file': bool(obj.ebook_file),
+                'avg_daily': obj.download_count / days_since(obj.created_at),
+            }
+        # Keyed by day too: the daily average moves even when the object doesn't.
+        # is_active as well: the bulk actions change it without touching updated_at
+        return cached_fragment(
+            'ebook_file_info', obj, build_context,
+            obj.ebook_file.name or '', obj.download_count, obj.is_active, timezone.now().date()
+        )
     file_info.short_description = 'File Information'
     
     def download_stats(self, obj):
-        html = '<div style="background: #e8f5e9; padding: 15px; border-radius: 8px; border: 1px solid #c3e6cb; margin: 10px 0;">'
-        html += '<h5 style="margin-top: 0; color: #155724;">Download Statistics:</h5>'
-        
-        if obj.download_count > 0:
-            html += f'<p style="margin: 5px 0;"><strong>Total Downloads:</strong> <span style="font-size: 1.2em; font-weight: bold; color: #28a745;">{obj.download_count}</span></p>'
-            
-            days_since_creation = (timezone.now() - obj.created_at).days or 1
-            avg_daily = obj.download_count / days_since_creation
-            
-            html += f'<p style="margin: 5px 0;"><strong>Average daily:</strong> {avg_daily:.1f} downloads/day</p>'
-            html += f'<p style="margin: 5px 0;"><strong>Created:</strong> {obj.created_at.strftime("%Y-%m-%d")} ({days_since_creation} days ago)</p>'
-            
+        def build_context():
+            days = days_since(obj.created_at)
+            avg_daily = obj.download_count / days
             if avg_daily > 5:
-                performance = "Excellent"
-                performance_color = "#28a745"
+                performance, performance_color = "Excellent", "#28a745"
             elif avg_daily > 2:
-                performance = "Good"
-                performance_color = "#17a2b8"
+                performance, performance_color = "Good", "#17a2b8"
             elif avg_daily > 0.5:
-                performance = "Average"
-                performance_color = "#ffc107"
+                performance, performance_color = "Average", "#ffc107"
             else:
-                performance = "Low"
-                performance_color = "#6c757d"
-                
-            html += f'<p style="margin: 5px 0;"><strong>Performance:</strong> <span style="color: {performance_color}; font-weight: bold;">{performance}</span></p>'
-        else:
-            html += '<p style="margin: 5px 0; color: #6c757d;"><i class="fas fa-info-circle me-1"></i> No downloads yet</p>'
-            html += '<p style="margin: 5px 0; font-size: 0.9em;">Upload an eBook file and make it active to start tracking downloads.</p>'
-        
-        html += '</div>'
-        return format_html(html)
+                performance, performance_color = "Low", "#6c757d"
+            return {
+                'ebook': obj,
+                'days': days,
+                'avg_daily': avg_daily,
+                'performance': performance,
+                'performance_color': performance_color,
+            }
+        return cached_fragment('ebook_download_stats', obj, build_context, obj.download_count, timezone.now().date())
     download_stats.short_description = 'Download Statistics'
     
     def is_active_badge(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     is_active_badge.short_description = 'Status'
     
     def created_at_display(self, obj):
@@ -840,17 +733,8 @@ class FreeEbookAdmin(admin.ModelAdmin):
         for ebook in queryset:
             file_name = ebook.ebook_file.name.split('/')[-1] if ebook.ebook_file else 'No file'
             status = 'Active' if ebook.is_active else 'Inactive'
-            file_size = ebook.ebook_file.size if ebook.ebook_file else 0
-            
-            # Format file size
-            if file_size < 1024:
-                size_display = f"{file_size} B"
-            elif file_size < 1024 * 1024:
-                size_display = f"{file_size / 1024:.1f} KB"
-            elif file_size < 1024 * 1024 * 1024:
-                size_display = f"{file_size / (1024 * 1024):.1f} MB"
-            else:
-                size_display = f"{file_size / (1024 * 1024 * 1024):.1f} GB"
+            size = file_size(ebook.ebook_file) if ebook.ebook_file else 0
+            size_display = 'File missing' if size is None else format_file_size(size)
             
             writer.writerow([
                 ebook.title,
@@ -920,8 +804,22 @@ class FreeEbookAdmin(admin.ModelAdmin):
         return qs.order_by('-is_active', '-download_count', '-updated_at')
     
 # ============ CONTACT SUBMISSION ADMIN ============
+class ContactStatusEventInline(admin.TabularInline):
+    model = ContactStatusEvent
+    extra = 0
+    can_delete = False
+    fields = ['from_status', 'to_status', 'occurred_at']
+    readonly_fields = fields
+    verbose_name_plural = 'Status history'
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ContactSubmission)
 class ContactSubmissionAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/main/contactsubmission/change_list.html'
+    inlines = [ContactStatusEventInline]
     list_display = ['id', 'full_name', 'email', 'organization', 'event_type', 'status', 'submitted_at']
     list_filter = ['status', 'event_type', 'submitted_at']
     list_editable = ['status']
@@ -940,20 +838,26 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
     event_details_display.short_description = 'Event Details'
     
     def mark_as_contacted(self, request, queryset):
-        updated = queryset.update(status='contacted', contacted_at=timezone.now())
+        updated = pipeline.transition(queryset, 'contacted', contacted_at=timezone.now())
         messages.success(request, f"{updated} submissions marked as contacted")
     mark_as_contacted.short_description = "📞 Mark selected as contacted"
     
     def mark_as_booked(self, request, queryset):
-        updated = queryset.update(status='booked')
+        updated = pipeline.transition(queryset, 'booked')
         messages.success(request, f"{updated} submissions marked as booked")
     mark_as_booked.short_description = "✅ Mark selected as booked"
     
     def mark_as_cancelled(self, request, queryset):
-        updated = queryset.update(status='cancelled')
+        updated = pipeline.transition(queryset, 'cancelled')
         messages.success(request, f"{updated} submissions marked as cancelled")
     mark_as_cancelled.short_description = "❌ Mark selected as cancelled"
     
+    def changelist_view(self, request, extra_context=None):
+        # Funnel and percentiles come from the pipeline rollups (constant time)
+        extra_context = extra_context or {}
+        extra_context['pipeline'] = pipeline.summary()
+        return super().changelist_view(request, extra_context=extra_context)
+    
     fieldsets = (
         ('Contact Information', {
             'fields': ('full_name', 'email', 'organization'),
@@ -981,7 +885,7 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
 # ============ NEWSLETTER SUBSCRIPTION ADMIN ============
 @admin.register(NewsletterSubscription)
 class NewsletterSubscriptionAdmin(admin.ModelAdmin):
-    list_display = ['email', 'name', 'source_display', 'status_display', 'subscribed_at_display']
+    list_display = ['email', 'name', 'source_display', 'status_display', 'emails_sent', 'subscribed_at_display']
     list_filter = ['source', 'is_active']
     list_display_links = ['email']
     search_fields = ['email', 'name']
@@ -993,23 +897,12 @@ class NewsletterSubscriptionAdmin(admin.ModelAdmin):
             'newsletter_section': '#28a745',
             'footer': '#17a2b8'
         }
-        color = colors.get(obj.source, '#6c757d')
         display_text = dict(obj.SOURCE_CHOICES).get(obj.source, obj.source)
-        return format_html(
-            '<span style="background: {}; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">{}</span>',
-            color,
-            display_text
-        )
+        return render_badge(colors.get(obj.source, '#6c757d'), display_text)
     source_display.short_description = 'Source'
     
     def status_display(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="background: #28a745; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Active</span>'
-            )
-        return format_html(
-            '<span style="background: #6c757d; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">Inactive</span>'
-        )
+        return active_badge(obj.is_active)
     status_display.short_description = 'Status'
     
     def subscribed_at_display(self, obj):
@@ -1018,6 +911,15 @@ class NewsletterSubscriptionAdmin(admin.ModelAdmin):
         return 'N/A'
     subscribed_at_display.short_description = 'Subscribed'
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.annotate(_emails_sent=Count('emails', filter=Q(emails__status='sent')))
+    
+    def emails_sent(self, obj):
+        return obj._emails_sent
+    emails_sent.short_description = 'Emails Sent'
+    emails_sent.admin_order_field = '_emails_sent'
+    
     def export_emails(self, request, queryset):
         emails = list(queryset.values_list('email', flat=True))
         email_list = '\n'.join(emails)
@@ -1055,12 +957,7 @@ class SystemLogAdmin(admin.ModelAdmin):
             'error': '#dc3545',
             'success': '#28a745'
         }
-        color = color_map.get(obj.log_level, '#6c757d')
-        return format_html(
-            '<span style="background: {}; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px; font-weight: bold;">{}</span>',
-            color,
-            obj.get_log_level_display().upper()
-        )
+        return render_badge(color_map.get(obj.log_level, '#6c757d'), obj.get_log_level_display().upper(), bold=True)
     log_level_badge.short_description = 'Level'
     
     def message_truncated(self, obj):
@@ -1168,16 +1065,248 @@ class FormSubmissionAdmin(admin.ModelAdmin):
         """Disable change permission"""
         return False
 
+# ============ OUTBOUND EMAIL ADMIN ============
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['id', 'to_email', 'kind', 'subject', 'status_badge', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'kind', 'recipient_domain', 'created_at']
+    list_display_links = ['id']
+    search_fields = ['to_email', 'subject']
+    readonly_fields = ['recipient_domain', 'attempts', 'last_error', 'sent_at', 'created_at']
+    raw_id_fields = ['contact_submission', 'subscription']
+    date_hierarchy = 'created_at'
+    actions = ['retry_now']
+    list_per_page = 50
+
+    def status_badge(self, obj):
+        color_map = {
+            'pending': '#17a2b8',
+            'sending': '#ffc107',
+            'sent': '#28a745',
+            'failed': '#dc3545',
+        }
+        return render_badge(color_map.get(obj.status, '#6c757d'), obj.get_status_display())
+    status_badge.short_description = 'Status'
+
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='pending', attempts=0, next_attempt_at=timezone.now()
+        )
+        messages.success(request, f"{updated} emails re-queued")
+    retry_now.short_description = "🔁 Retry selected now"
+
+    fieldsets = (
+        ('Message', {
+            'fields': ('kind', 'to_email', 'recipient_domain', 'subject', 'body', 'html_body'),
+            'classes': ('wide',)
+        }),
+        ('Delivery', {
+            'fields': ('status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'),
+            'classes': ('wide',)
+        }),
+        ('Related', {
+            'fields': ('contact_submission', 'subscription'),
+            'classes': ('collapse', 'wide')
+        }),
+        ('Timestamp', {
+            'fields': ('created_at',),
+            'classes': ('collapse', 'wide')
+        }),
+    )
+
+# ============ NEWSLETTER CAMPAIGN ADMIN ============
+@admin.register(NewsletterCampaign)
+class NewsletterCampaignAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'newsletter', 'status_badge', 'progress_display', 'failed_count', 'throughput_display', 'eta_display', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject']
+    readonly_fields = [
+        'total_recipients', 'sent_count', 'failed_count', 'progress_display',
+        'throughput_display', 'eta_display', 'snapshot_complete', 'started_at', 'finished_at',
+        'created_at', 'updated_at',
+    ]
+    actions = ['queue_campaigns', 'pause_campaigns', 'requeue_failed']
+    list_per_page = 25
+
+    def status_badge(self, obj):
+        color_map = {
+            'draft': '#6c757d',
+            'queued': '#17a2b8',
+            'sending': '#ffc107',
+            'paused': '#fd7e14',
+            'completed': '#28a745',
+        }
+        return render_badge(color_map.get(obj.status, '#6c757d'), obj.get_status_display())
+    status_badge.short_description = 'Status'
+
+    def progress_display(self, obj):
+        if not obj.total_recipients:
+            return 'Not started' if not obj.snapshot_complete else '0 recipients'
+        percent = obj.processed_count * 100 / obj.total_recipients
+        return f"{obj.processed_count}/{obj.total_recipients} ({percent:.0f}%)"
+    progress_display.short_description = 'Progress'
+
+    def throughput_display(self, obj):
+        if not obj.throughput:
+            return '-'
+        return f"{obj.throughput * 60:.0f}/min"
+    throughput_display.short_description = 'Throughput'
+
+    def eta_display(self, obj):
+        if obj.status == 'completed':
+            return 'Done'
+        eta = obj.eta_seconds
+        if eta is None:
+            return '-'
+        return str(timedelta(seconds=int(eta)))
+    eta_display.short_description = 'ETA'
+
+    def queue_campaigns(self, request, queryset):
+        updated = queryset.filter(status__in=['draft', 'paused']).update(status='queued')
+        messages.success(request, f"{updated} campaign(s) queued. The campaigns worker will start delivery shortly.")
+    queue_campaigns.short_description = "🚀 Queue selected for delivery"
+
+    def pause_campaigns(self, request, queryset):
+        updated = queryset.filter(status__in=['queued', 'sending']).update(status='paused')
+        messages.success(request, f"{updated} campaign(s) paused")
+    pause_campaigns.short_description = "⏸️ Pause selected"
+
+    def requeue_failed(self, request, queryset):
+        requeued = 0
+        for campaign in queryset:
+            count = campaign.recipients.filter(status__in=['failed', 'interrupted']).update(status='pending', error='')
+            if count:
+                NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+                    failed_count=F('failed_count') - count, status='queued', finished_at=None
+                )
+            requeued += count
+        messages.success(request, f"{requeued} failed/interrupted recipient(s) re-queued")
+    requeue_failed.short_description = "🔁 Retry failed and interrupted recipients"
+
+    fieldsets = (
+        ('Campaign', {
+            'fields': ('newsletter', 'subject', 'body', 'html_body', 'status'),
+            'classes': ('wide',)
+        }),
+        ('Delivery Progress', {
+            'fields': ('snapshot_complete', 'progress_display', 'sent_count', 'failed_count', 'throughput_display', 'eta_display', 'started_at', 'finished_at'),
+            'classes': ('wide',)
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse', 'wide')
+        }),
+    )
+
+
+@admin.register(CampaignRecipient)
+class CampaignRecipientAdmin(admin.ModelAdmin):
+    list_display = ['email', 'campaign', 'status', 'sent_at']
+    list_filter = ['status', 'campaign']
+    search_fields = ['email']
+    raw_id_fields = ['campaign', 'subscription']
+    readonly_fields = ['campaign', 'subscription', 'email', 'name', 'status', 'error', 'sent_at']
+    list_per_page = 100
+
+    def has_add_permission(self, request):
+        return False
+
 # Add custom admin action for eBook analytics
 def track_ebook_performance(modeladmin, request, queryset):
+    week_ago = timezone.localdate() - timedelta(days=6)
+    recent = dict(
+        DailyDownloadStat.objects.filter(ebook__in=queryset, date__gte=week_ago)
+        .values('ebook_id').annotate(total=Sum('count')).values_list('ebook_id', 'total')
+    )
     for ebook in queryset:
         days_since_creation = (timezone.now() - ebook.created_at).days or 1
         avg_daily = ebook.download_count / days_since_creation
         
         messages.info(request, 
             f"'{ebook.title}': {ebook.download_count} downloads total, "
-            f"{avg_daily:.1f} avg/day over {days_since_creation} days"
+            f"{avg_daily:.1f} avg/day over {days_since_creation} days, "
+            f"{recent.get(ebook.id, 0)} in the last 7 days"
         )
 track_ebook_performance.short_description = "📈 Show eBook performance analytics"
 FreeEbookAdmin.actions.append(track_ebook_performance)
 
+
+# ============ ANALYTICS DASHBOARD ============
+def analytics_dashboard(request):
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 90)
+    except ValueError:
+        days = 30
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Analytics Dashboard',
+        'day_options': [7, 30, 90],
+        **dashboard_context(days),
+    }
+    return TemplateResponse(request, 'admin/main/analytics_dashboard.html', context)
+
+
+# ============ REQUEST PROFILES ============
+def profiles_list(request):
+    """Profile ring buffer (main/profiler.py), and signed links that profile one request"""
+    url = request.GET.get('url', '').strip()
+    mode = request.GET.get('mode') if request.GET.get('mode') in profiler.MODES else profiler.MODES[0]
+    link = None
+    if url:
+        url = url if url.startswith('/') else '/' + url
+        link = request.build_absolute_uri(profiler.signed_url(url, mode))
+    profiles = profiler.entries()
+    for profile in profiles:
+        profile['created'] = datetime.fromtimestamp(profile['created'], tz=dt_timezone.utc)
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': profiles,
+        'keep': profiler.PROFILE_KEEP,
+        'modes': profiler.MODES,
+        'mode': mode,
+        'url': url,
+        'link': link,
+        'link_minutes': profiler.LINK_MAX_AGE // 60,
+        'header': profiler.HEADER,
+    }
+    return TemplateResponse(request, 'admin/main/profiles.html', context)
+
+
+def profile_detail(request, name):
+    profile = profiler.load(name, 'pstats', 'collapsed')
+    if profile is None:
+        raise Http404('No such profile (it may have been rotated out)')
+    profile['created'] = datetime.fromtimestamp(profile['created'], tz=dt_timezone.utc)
+    stacks = (profile['collapsed'] or '').splitlines()
+    context = {
+        **admin.site.each_context(request),
+        'title': f"Profile of {profile['method']} {profile['path']}",
+        'profile': profile,
+        'top_stacks': '\n'.join(stacks[:200]),
+        'more_stacks': max(len(stacks) - 200, 0),
+    }
+    return TemplateResponse(request, 'admin/main/profile_detail.html', context)
+
+
+def profile_download(request, name, kind):
+    if kind not in ('prof', 'pstats', 'collapsed') or profiler.load(name) is None:
+        raise Http404
+    try:
+        handle = open(profiler.path_for(name, kind), 'rb')
+    except FileNotFoundError:
+        raise Http404
+    return FileResponse(handle, as_attachment=True, filename=name + profiler.FILES[kind])
+
+
+_admin_get_urls = admin.site.get_urls
+
+def get_admin_urls():
+    return [
+        path('analytics/', admin.site.admin_view(analytics_dashboard), name='analytics_dashboard'),
+        path('profiles/', admin.site.admin_view(profiles_list), name='profiles'),
+        path('profiles/<str:name>/', admin.site.admin_view(profile_detail), name='profile_detail'),
+        path('profiles/<str:name>/<str:kind>/', admin.site.admin_view(profile_download), name='profile_download'),
+    ] + _admin_get_urls()
+
+admin.site.get_urls = get_admin_urls
@@ -0,0 +1,199 @@
+# main/analytics.py
+"""
+Pre-aggregated analytics.
+
+Every counter lives in a small Daily*Stat table keyed by day, maintained
+incrementally when the underlying event happens (see main/signals.py and
+main/pipeline.py for bulk status changes). The admin dashboard only ever reads
+these tables, so its cost depends on the number of days shown, not on how
+much history the raw tables hold. ``rollup_analytics`` rebuilds a date range
+from the raw tables to backfill or repair the counters.
+"""
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    ContactSubmission, DailyDownloadStat, DailyLogStat, DailySubmissionStat,
+    DailySubscriptionStat, FreeEbook, NewsletterSubscription, SystemLog
+)
+
+
+# ============ COUNTER MAINTENANCE ============
+def bump(model, delta=1, **lookup):
+    """Atomically add ``delta`` to the counter row identified by ``lookup``"""
+    if not delta:
+        return
+    if model.objects.filter(**lookup).update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **lookup)
+    except IntegrityError:
+        # Another process created the row between our UPDATE and INSERT
+        model.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def day_of(moment):
+    return timezone.localdate(moment) if moment else timezone.localdate()
+
+
+def record_submission(submission):
+    bump(DailySubmissionStat, date=day_of(submission.submitted_at),
+         event_type=submission.event_type, status=submission.status)
+
+
+def move_submission_status(day, event_type, old_status, new_status, count=1):
+    """Move ``count`` submissions from one status bucket to another"""
+    if old_status == new_status:
+        return
+    bump(DailySubmissionStat, -count, date=day, event_type=event_type, status=old_status)
+    bump(DailySubmissionStat, count, date=day, event_type=event_type, status=new_status)
+
+
+def record_subscription(subscription):
+    bump(DailySubscriptionStat, date=day_of(subscription.created_at), source=subscription.source)
+
+
+def record_download(ebook):
+    bump(DailyDownloadStat, date=timezone.localdate(), ebook=ebook)
+
+
+def record_log(log):
+    bump(DailyLogStat, date=day_of(log.created_at), log_level=log.log_level)
+
+
+# ============ REBUILD ============
+def rebuild(start, end):
+    """Recompute every rollup for days in [start, end] from the raw tables"""
+    def regroup(queryset, date_field, *fields):
+        return (
+            queryset.filter(**{f'{date_field}__date__gte': start, f'{date_field}__date__lte': end})
+            .annotate(day=TruncDate(date_field))
+            .values('day', *fields)
+            .annotate(n=Count('id'))
+        )
+
+    with transaction.atomic():
+        DailySubmissionStat.objects.filter(date__gte=start, date__lte=end).delete()
+        DailySubmissionStat.objects.bulk_create([
+            DailySubmissionStat(date=row['day'], event_type=row['event_type'], status=row['status'], count=row['n'])
+            for row in regroup(ContactSubmission.objects.all(), 'submitted_at', 'event_type', 'status')
+        ])
+
+        DailySubscriptionStat.objects.filter(date__gte=start, date__lte=end).delete()
+        DailySubscriptionStat.objects.bulk_create([
+            DailySubscriptionStat(date=row['day'], source=row['source'], count=row['n'])
+            for row in regroup(NewsletterSubscription.objects.all(), 'created_at', 'source')
+        ])
+
+        DailyLogStat.objects.filter(date__gte=start, date__lte=end).delete()
+        DailyLogStat.objects.bulk_create([
+            DailyLogStat(date=row['day'], log_level=row['log_level'], count=row['n'])
+            for row in regroup(SystemLog.objects.all(), 'created_at', 'log_level')
+        ])
+    # Per-day downloads only exist in the rollup (FreeEbook keeps a lifetime
+    # counter), so DailyDownloadStat is never rebuilt or deleted here.
+
+
+# ============ DASHBOARD ============
+def date_range(days):
+    end = timezone.localdate()
+    return end - timedelta(days=days - 1), end
+
+
+def dashboard_context(days=30):
+    start, end = date_range(days)
+    dates = [start + timedelta(days=i) for i in range(days)]
+
+    # Submissions: per day by event type, and totals by event type x status
+    submissions = DailySubmissionStat.objects.filter(date__gte=start, date__lte=end)
+    event_types = OrderedDict(ContactSubmission.EVENT_TYPE_CHOICES)
+    statuses = OrderedDict(ContactSubmission.STATUS_CHOICES)
+    per_day = defaultdict(lambda: defaultdict(int))
+    matrix = defaultdict(lambda: defaultdict(int))
+    for row in submissions.values('date', 'event_type', 'status').annotate(total=Sum('count')):
+        per_day[row['date']][row['event_type']] += row['total']
+        matrix[row['event_type']][row['status']] += row['total']
+
+    submission_days = [
+        {'date': day, 'counts': [per_day[day][key] for key in event_types], 'total': sum(per_day[day].values())}
+        for day in dates
+    ]
+    submission_matrix = [
+        {'label': label, 'counts': [matrix[key][status] for status in statuses], 'total': sum(matrix[key].values())}
+        for key, label in event_types.items()
+    ]
+
+    # Subscriptions per source
+    sources = OrderedDict(NewsletterSubscription.SOURCE_CHOICES)
+    subscriptions = defaultdict(lambda: defaultdict(int))
+    for row in (DailySubscriptionStat.objects.filter(date__gte=start, date__lte=end)
+                .values('date', 'source').annotate(total=Sum('count'))):
+        subscriptions[row['date']][row['source']] += row['total']
+    subscription_days = [
+        {'date': day, 'counts': [subscriptions[day][key] for key in sources], 'total': sum(subscriptions[day].values())}
+        for day in dates
+    ]
+    subscription_totals = [
+        {'label': label, 'total': sum(subscriptions[day][key] for day in dates)}
+        for key, label in sources.items()
+    ]
+
+    # Downloads per ebook per day
+    ebooks = OrderedDict(FreeEbook.objects.values_list('id', 'title'))
+    downloads = defaultdict(lambda: defaultdict(int))
+    for row in (DailyDownloadStat.objects.filter(date__gte=start, date__lte=end)
+                .values('date', 'ebook_id').annotate(total=Sum('count'))):
+        downloads[row['date']][row['ebook_id']] += row['total']
+    download_days = [
+        {'date': day, 'counts': [downloads[day][key] for key in ebooks], 'total': sum(downloads[day].values())}
+        for day in dates
+    ]
+
+    # Log volume and error rate
+    logs = defaultdict(lambda: defaultdict(int))
+    for row in (DailyLogStat.objects.filter(date__gte=start, date__lte=end)
+                .values('date', 'log_level').annotate(total=Sum('count'))):
+        logs[row['date']][row['log_level']] += row['total']
+    log_days = []
+    for day in dates:
+        total = sum(logs[day].values())
+        errors = logs[day]['error']
+        log_days.append({
+            'date': day,
+            'total': total,
+            'errors': errors,
+            'warnings': logs[day]['warning'],
+            'error_rate': errors * 100 / total if total else 0,
+        })
+
+    def with_bars(rows):
+        peak = max([row['total'] for row in rows] + [1])
+        for row in rows:
+            row['bar'] = row['total'] * 100 / peak
+        return list(reversed(rows))
+
+    return {
+        'days': days,
+        'start': start,
+        'end': end,
+        'event_types': list(event_types.values()),
+        'statuses': list(statuses.values()),
+        'submission_days': with_bars(submission_days),
+        'submission_matrix': submission_matrix,
+        'submission_total': sum(row['total'] for row in submission_matrix),
+        'sources': list(sources.values()),
+        'subscription_days': with_bars(subscription_days),
+        'subscription_totals': subscription_totals,
+        'ebooks': list(ebooks.values()),
+        'download_days': with_bars(download_days),
+        'download_total': sum(row['total'] for row in download_days),
+        'log_days': with_bars(log_days),
+        'log_total': sum(row['total'] for row in log_days),
+        'error_total': sum(row['errors'] for row in log_days),
+    }
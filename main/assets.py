@@ -0,0 +1,434 @@
+# main/assets.py
+"""
+Asset bundling for the landing page.
+
+``build_assets`` (also run by ``collectstatic``) concatenates the stylesheets
+and scripts in BUNDLES into content-hashed files under ``static/dist/``
+(stylesheets minified; scripts as they are, since stripping lines without
+a JS tokenizer can change template literals - compression takes care of
+their whitespace) and extracts the critical CSS: the rules whose selectors
+only use tags, classes and ids that appear in index.html above the
+``critical-css:end`` marker. The manifest written next to the bundles is
+read by the ``site_assets`` template tags, which inline the critical CSS,
+load the full stylesheet without blocking render and emit preload hints.
+
+Without a manifest (e.g. a fresh checkout) the tags fall back to the
+individual source files, so the page works before the first build.
+
+``audit_assets`` uses the AUDIT helpers to find duplicate, unreferenced and
+stale files across static/, STATIC_ROOT and media/ and to check the size
+budgets.
+"""
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+
+from django.conf import settings
+from django.template.loader import get_template
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# Output name -> static source files, in load order
+BUNDLES = {
+    'site.css': [
+        'lib/animate/animate.min.css',
+        'lib/owlcarousel/assets/owl.carousel.min.css',
+        'css/bootstrap.min.css',
+        'css/style.css',
+        'css/index.css',
+    ],
+    'site.js': [
+        'lib/wow/wow.min.js',
+        'lib/easing/easing.min.js',
+        'lib/waypoints/waypoints.min.js',
+        'lib/owlcarousel/owl.carousel.min.js',
+        'js/main.js',
+        'js/index.js',
+    ],
+}
+
+CRITICAL_TEMPLATE = 'main/index.html'
+CRITICAL_MARKER = 'critical-css:end'
+
+# Selectors always considered above the fold (document-level rules)
+CRITICAL_ALWAYS = {'*', 'html', 'body', ':root'}
+
+# Largest images in the first viewport, preloaded so they start downloading early
+PRELOAD_IMAGES = ['images/plogo.png', 'images/Home.jpeg']
+
+
+def source_dir():
+    return os.path.join(settings.BASE_DIR, 'static')
+
+
+def dist_path(*parts):
+    return os.path.join(source_dir(), DIST_DIR, *parts)
+
+
+# ============ CSS ============
+URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+
+
+def rebase_urls(css, source):
+    """Rewrite relative url() references so they still resolve from dist/"""
+    base = posixpath.dirname(source)
+
+    def replace(match):
+        url = match.group(2).strip()
+        if url.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(base, url))
+        return f'url("{posixpath.relpath(target, DIST_DIR)}")'
+    return URL_RE.sub(replace, css)
+
+
+STRING_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+
+
+def minify_css(css):
+    css = COMMENT_RE.sub('', css)
+    # Odd indexes are quoted strings (content: "...", data URLs) and are kept verbatim
+    parts = STRING_RE.split(css)
+    for index in range(0, len(parts), 2):
+        part = re.sub(r'\s+', ' ', parts[index])
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        parts[index] = part.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def split_rules(css):
+    """
+    Split a stylesheet into (prelude, body) pairs at the top level.
+
+    Statements without a block (@import, @charset) have a body of None.
+    """
+    rules = []
+    i, length = 0, len(css)
+    while i < length:
+        start = i
+        while i < length and css[i] not in '{;':
+            i += 1
+        prelude = css[start:i].strip()
+        if i >= length:
+            break
+        if css[i] == ';':
+            if prelude:
+                rules.append((prelude, None))
+            i += 1
+            continue
+        depth, quote = 0, None
+        body_start = i + 1
+        while i < length:
+            char = css[i]
+            if quote:
+                if char == quote and css[i - 1] != '\\':
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        rules.append((prelude, css[body_start:i]))
+        i += 1
+    return rules
+
+
+SELECTOR_TOKEN_RE = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+
+
+def selector_matches(selector, used):
+    """True when every tag, class and id in the selector is used above the fold"""
+    selector = re.sub(r'::?[\w-]+(\([^)]*\))?', ' ', selector)  # pseudo-classes and elements
+    selector = re.sub(r'\[[^\]]*\]', ' ', selector)  # attribute selectors
+    selector = selector.strip()
+    if not selector or selector in CRITICAL_ALWAYS:
+        return True
+    for prefix, name in SELECTOR_TOKEN_RE.findall(selector):
+        if prefix == '.' and name not in used['classes']:
+            return False
+        if prefix == '#' and name not in used['ids']:
+            return False
+        if not prefix and name.lower() not in used['tags']:
+            return False
+    return True
+
+
+def extract_critical(css, used):
+    critical = []
+    for prelude, body in split_rules(css):
+        if body is None:
+            continue
+        if prelude.startswith(('@media', '@supports')):
+            inner = extract_critical(body, used)
+            if inner:
+                critical.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@keyframes') or prelude.startswith('@-webkit-keyframes'):
+            # animate.css names its keyframes after the class that uses them
+            if prelude.split()[-1] in used['classes']:
+                critical.append(f'{prelude}{{{body}}}')
+        elif prelude.startswith('@'):
+            continue
+        elif any(selector_matches(part, used) for part in prelude.split(',')):
+            critical.append(f'{prelude}{{{body}}}')
+    return ''.join(critical)
+
+
+def above_the_fold_tokens():
+    """Tags, classes and ids used in the template before the critical marker"""
+    source = get_template(CRITICAL_TEMPLATE).template.source
+    body = source.split('<body', 1)[-1].split(CRITICAL_MARKER, 1)[0]
+    classes = set()
+    for value in re.findall(r'class="([^"]*)"', body):
+        classes.update(re.sub(r'{[{%].*?[%}]}', ' ', value).split())
+    return {
+        'classes': classes,
+        'ids': set(re.findall(r'id="([^"{]+)"', body)),
+        'tags': {tag.lower() for tag in re.findall(r'<([a-zA-Z][a-zA-Z0-9]*)', body)} | {'html', 'body'},
+    }
+
+
+# ============ BUILD ============
+def read_source(name):
+    with open(os.path.join(source_dir(), name), encoding='utf-8') as handle:
+        return handle.read()
+
+
+def content_hash(content):
+    return hashlib.md5(content.encode('utf-8')).hexdigest()[:12]
+
+
+def build_bundle(name, sources):
+    parts = []
+    for source in sources:
+        content = read_source(source)
+        if name.endswith('.css'):
+            content = minify_css(rebase_urls(content, source))
+        parts.append(content)
+    # Scripts are joined with ';' so a file without a trailing semicolon cannot run into the next
+    return ('\n' if name.endswith('.css') else '\n;\n').join(parts)
+
+
+def build():
+    """Write the hashed bundles, critical CSS and manifest. Returns the manifest"""
+    output_dir = dist_path()
+    if os.path.isdir(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    manifest = {'bundles': {}, 'sizes': {}}
+    for name, sources in BUNDLES.items():
+        content = build_bundle(name, sources)
+        stem, ext = os.path.splitext(name)
+        filename = f'{stem}.{content_hash(content)}{ext}'
+        with open(dist_path(filename), 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        manifest['bundles'][name] = posixpath.join(DIST_DIR, filename)
+        manifest['sizes'][name] = {
+            'sources': sum(len(read_source(source).encode('utf-8')) for source in sources),
+            'bundle': len(content.encode('utf-8')),
+        }
+
+    critical_css = extract_critical(build_bundle('site.css', BUNDLES['site.css']), above_the_fold_tokens())
+    manifest['critical_css'] = critical_css
+    manifest['sizes']['critical.css'] = {'bundle': len(critical_css.encode('utf-8'))}
+
+    with open(dist_path(MANIFEST_NAME), 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=2)
+    load_manifest.cache = None
+    return manifest
+
+
+# ============ RUNTIME ============
+def load_manifest():
+    """The build manifest, or None before the first build. Re-read when the file changes"""
+    path = dist_path(MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = load_manifest.cache
+    if cached is None or cached[0] != mtime:
+        with open(path, encoding='utf-8') as handle:
+            load_manifest.cache = (mtime, json.load(handle))
+    return load_manifest.cache[1]
+
+
+load_manifest.cache = None
+
+
+# ============ AUDIT ============
+MB = 1024 * 1024
+SIZE_BUDGETS = getattr(settings, 'ASSET_SIZE_BUDGETS', {
+    'static': 15 * MB,
+    'collected': 40 * MB,
+    'media': 50 * MB,
+})
+
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+REFERENCE_SOURCE_EXTENSIONS = ('.html', '.txt', '.css', '.js', '.py')
+
+
+def walk_files(root):
+    """(relative posix path, absolute path) for every file under root"""
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            full_path = os.path.join(directory, filename)
+            yield posixpath.join(*os.path.relpath(full_path, root).split(os.sep)), full_path
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collected_source_name(name, hashed_to_source):
+    """Logical name of a collected file: drops .gz/.br and maps manifest-hashed names back"""
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return hashed_to_source.get(name, name)
+
+
+def reference_corpus():
+    """Text of every template, project source and stylesheet/script that can name a static file"""
+    roots = [os.path.join(settings.BASE_DIR, 'templates'), os.path.join(settings.BASE_DIR, 'main'),
+             os.path.join(settings.BASE_DIR, 'fusion_force')]
+    roots += [str(path) for path in settings.STATICFILES_DIRS]
+    texts = []
+    for root in roots:
+        for name, full_path in walk_files(root):
+            if name.startswith(DIST_DIR + '/') or not name.endswith(REFERENCE_SOURCE_EXTENSIONS):
+                continue
+            with open(full_path, encoding='utf-8', errors='ignore') as handle:
+                texts.append(handle.read())
+    return '\n'.join(texts)
+
+
+def media_references():
+    """Every file name stored in a FileField/ImageField"""
+    from django.apps import apps
+    from django.db.models import FileField
+
+    names = set()
+    for model in apps.get_app_config('main').get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, FileField):
+                names.update(
+                    name for name in model.objects.exclude(**{field.name: ''})
+                    .exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True)
+                )
+    return names
+
+
+def audit():
+    """
+    Hash and classify every file under STATICFILES_DIRS, STATIC_ROOT and MEDIA_ROOT.
+
+    Collected copies of a source (original, hashed and compressed names with
+    the same content) are expected and are not reported as duplicates.
+    """
+    from django.contrib.staticfiles import finders
+
+    files = []  # dicts: root, name, path, size, digest
+    for static_dir in settings.STATICFILES_DIRS:
+        for name, path in walk_files(static_dir):
+            if not name.startswith(DIST_DIR + '/'):
+                files.append({'root': 'static', 'name': name, 'path': path})
+    for name, path in walk_files(settings.MEDIA_ROOT):
+        files.append({'root': 'media', 'name': name, 'path': path})
+    for entry in files:
+        entry['size'] = os.path.getsize(entry['path'])
+        entry['digest'] = file_digest(entry['path'])
+    source_digests = {entry['name']: entry['digest'] for entry in files if entry['root'] == 'static'}
+
+    collected = {}  # logical name -> list of collected files
+    if os.path.isdir(settings.STATIC_ROOT):
+        hashed_to_source = {}
+        manifest_path = os.path.join(settings.STATIC_ROOT, 'staticfiles.json')
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as handle:
+                hashed_to_source = {hashed: name for name, hashed in json.load(handle).get('paths', {}).items()}
+        for name, path in walk_files(settings.STATIC_ROOT):
+            if name == 'staticfiles.json':
+                continue
+            collected.setdefault(collected_source_name(name, hashed_to_source), []).append(
+                {'name': name, 'path': path, 'size': os.path.getsize(path)}
+            )
+
+    stale = []
+    for logical, copies in collected.items():
+        is_stale = finders.find(logical) is None
+        if is_stale:
+            stale.append(logical)
+        original = next((copy for copy in copies if copy['name'] == logical), None)
+        if original is None:
+            continue
+        digest = file_digest(original['path'])
+        if is_stale or source_digests.get(logical, digest) != digest:
+            # Stale or diverged from its source: takes part in duplicate detection
+            files.append({'root': 'collected', 'name': logical, 'path': original['path'],
+                          'size': original['size'], 'digest': digest})
+
+    groups = {}
+    for entry in files:
+        groups.setdefault(entry['digest'], []).append(entry)
+    duplicates = sorted(
+        (group for group in groups.values() if len(group) > 1),
+        key=lambda group: group[0]['size'] * (len(group) - 1), reverse=True,
+    )
+
+    corpus = reference_corpus()
+    unreferenced_static = [
+        entry for entry in files
+        if entry['root'] == 'static'
+        and entry['name'] not in corpus
+        and posixpath.basename(entry['name']) not in corpus  # relative url() in stylesheets
+    ]
+    stored = media_references()
+    unreferenced_media = [entry for entry in files if entry['root'] == 'media' and entry['name'] not in stored]
+
+    totals = {
+        'static': sum(entry['size'] for entry in files if entry['root'] == 'static'),
+        'media': sum(entry['size'] for entry in files if entry['root'] == 'media'),
+        'collected': sum(copy['size'] for copies in collected.values() for copy in copies),
+    }
+    return {
+        'totals': totals,
+        'duplicates': duplicates,
+        'unreferenced_static': unreferenced_static,
+        'unreferenced_media': unreferenced_media,
+        'stale_collected': sorted(stale),
+        'collected': collected,
+    }
+
+
+def prune_collected(names, collected):
+    """Delete every collected variant of ``names`` from STATIC_ROOT and the manifest. Returns bytes freed"""
+    freed = 0
+    names = set(names)
+    for name in names:
+        for copy in collected.get(name, []):
+            freed += copy['size']
+            os.remove(copy['path'])
+
+    manifest_path = os.path.join(settings.STATIC_ROOT, 'staticfiles.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as handle:
+            manifest = json.load(handle)
+        manifest['paths'] = {name: hashed for name, hashed in manifest.get('paths', {}).items() if name not in names}
+        with open(manifest_path, 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle)
+    return freed
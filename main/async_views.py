@@ -0,0 +1,286 @@
+# main/async_views.py
+"""
+Async versions of the public views, used when settings.ASYNC_VIEWS is on
+(ASGI deployment, see fusion_force/asgi.py).
+
+Database access goes through the async ORM; code that only exists as sync
+(template rendering, e-mail queueing, signal handlers behind ``acreate``)
+runs in Django's per-request sync thread. Logging goes through the queue
+of main/log.py, so no response waits for its SystemLog row.
+
+Under WSGI these would run through async_to_sync on every request, which is
+slower than the sync views in main/views.py - leave ASYNC_VIEWS off there.
+"""
+import json
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import render
+
+from . import write_queue
+from .analytics import record_download
+from .db_router import replica_reads
+from .log import log_activity
+from .mailer import queue_booking_emails, queue_subscription_welcome
+from .models import (
+    AboutSection, ContactSubmission, FreeEbook, GalleryImage, HeroImage, ImpactResult,
+    NewsletterContent, NewsletterSubscription, Service, SiteSettings, Testimonial
+)
+from .views import add_home_headers
+
+logger = logging.getLogger(__name__)
+
+arender = sync_to_async(render)
+
+
+# Django 4.2's csrf_exempt / require_POST wrap views in sync functions
+def csrf_exempt(view):
+    view.csrf_exempt = True
+    return view
+
+
+def require_POST(view):
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        return await view(request, *args, **kwargs)
+    return inner
+
+
+async def alog_system_action(message, level='info', source='views', request=None):
+    # Only queues the record; with INLINE_WRITES the SystemLog row is
+    # written inline, which has to happen in a sync thread
+    if write_queue.inline():
+        await sync_to_async(log_activity)(message, level=level, source=source, request=request)
+    else:
+        log_activity(message, level=level, source=source, request=request)
+
+
+@replica_reads
+async def home(request):
+    """Async home view. List querysets stay lazy: sections served from the
+    cache (main/sections.py) never run theirs"""
+    try:
+        site_settings = await SiteSettings.objects.afirst()
+        if not site_settings:
+            site_settings = await SiteSettings.objects.acreate(
+                site_name='Fusion Force LLC',
+                contact_email='info@fusionforce.com',
+                contact_phone='+1 (443) 545-4565'
+            )
+
+        context = {
+            'site_settings': site_settings,
+            'hero_images': HeroImage.objects.filter(is_active=True).order_by('order'),
+            'about_section': await AboutSection.objects.filter(is_active=True).afirst(),
+            'services': Service.objects.filter(is_active=True).order_by('order'),
+            'results': ImpactResult.objects.filter(is_active=True).order_by('order'),
+            'gallery_images': GalleryImage.objects.filter(is_active=True).order_by('order')[:6],
+            'testimonials': Testimonial.objects.filter(is_active=True).order_by('order'),
+            'newsletter': await NewsletterContent.objects.filter(is_active=True).afirst(),
+            'free_ebook': await FreeEbook.objects.filter(is_active=True).afirst(),
+        }
+
+        await alog_system_action(
+            f"Home page viewed from IP: {request.META.get('REMOTE_ADDR', 'Unknown')}",
+            level='info',
+            source='home_view',
+            request=request
+        )
+
+        if 'subscribed' in request.GET:
+            context['subscribed'] = True
+
+        return add_home_headers(await arender(request, 'main/index.html', context))
+
+    except Exception as e:
+        logger.exception('Error in async home view')
+        await alog_system_action(
+            f"Home view error: {str(e)}",
+            level='error',
+            source='home_view',
+            request=request
+        )
+        context = {
+            'site_settings': await SiteSettings.objects.afirst() or SiteSettings(),
+            'error': True,
+            'error_message': str(e) if 'debug' in request.GET else None
+        }
+        return await arender(request, 'main/index.html', context)
+
+
+@csrf_exempt
+@require_POST
+async def contact_submit(request):
+    try:
+        data = json.loads(request.body)
+
+        required_fields = ['full_name', 'email', 'organization', 'event_type', 'event_details']
+        for field in required_fields:
+            if not data.get(field):
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'{field.replace("_", " ").title()} is required.'
+                }, status=400)
+
+        submission = await ContactSubmission.objects.acreate(
+            full_name=data['full_name'],
+            email=data['email'],
+            organization=data['organization'],
+            event_type=data['event_type'],
+            event_details=data['event_details']
+        )
+
+        try:
+            await sync_to_async(queue_booking_emails)(submission)
+        except Exception as e:
+            logger.error(f"Failed to queue booking emails for submission {submission.id}: {e}")
+
+        await alog_system_action(
+            f"New contact submission from {submission.full_name} ({submission.organization})",
+            level='success',
+            source='contact_form',
+            request=request
+        )
+
+        return JsonResponse({
+            'status': 'success',
+            'message': 'Thank you for your booking request! Pamela will review your details and get back to you within 24 hours.',
+            'submission_id': submission.id
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid request data.'
+        }, status=400)
+    except Exception as e:
+        await alog_system_action(
+            f"Contact submission error: {str(e)}",
+            level='error',
+            source='contact_form',
+            request=request
+        )
+        return JsonResponse({
+            'status': 'error',
+            'message': 'An error occurred. Please try again later.'
+        }, status=500)
+
+
+@csrf_exempt
+@require_POST
+async def newsletter_submit(request):
+    try:
+        data = json.loads(request.body)
+
+        email = data.get('email', '').strip()
+        name = data.get('name', '').strip()
+        source = data.get('source', 'newsletter_section')
+        agreed_to_terms = data.get('agreed_to_terms', True)
+
+        if not email:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Email is required.'
+            }, status=400)
+
+        existing = await NewsletterSubscription.objects.filter(email=email).only('created_at').afirst()
+        if existing:
+            return JsonResponse({
+                'status': 'info',
+                'message': f'You are already subscribed to our newsletter! (Subscribed on {existing.created_at.strftime("%Y-%m-%d")})'
+            })
+
+        subscription = await NewsletterSubscription.objects.acreate(
+            email=email,
+            name=name if name else email.split('@')[0],
+            source=source,
+            agreed_to_terms=agreed_to_terms,
+            is_active=True
+        )
+
+        try:
+            await sync_to_async(queue_subscription_welcome)(subscription)
+        except Exception as e:
+            logger.error(f"Failed to queue welcome email for {email}: {e}")
+
+        await alog_system_action(
+            f"New newsletter subscription: {email}",
+            level='success',
+            source='newsletter_form',
+            request=request
+        )
+
+        return JsonResponse({
+            'status': 'success',
+            'message': 'Thank you for subscribing to our newsletter!',
+            'subscription_id': subscription.id
+        })
+
+    except IntegrityError:
+        return JsonResponse({
+            'status': 'info',
+            'message': 'You are already subscribed to our newsletter!'
+        })
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid request data.'
+        }, status=400)
+    except Exception as e:
+        await alog_system_action(
+            f"Newsletter subscription error: {str(e)}",
+            level='error',
+            source='newsletter_form',
+            request=request
+        )
+        return JsonResponse({
+            'status': 'error',
+            'message': 'An error occurred. Please try again later.'
+        }, status=500)
+
+
+def count_download(ebook):
+    ebook.increment_download_count()
+    record_download(ebook)
+
+
+@require_POST
+async def download_ebook(request, ebook_id):
+    try:
+        ebook = await FreeEbook.objects.aget(id=ebook_id, is_active=True)
+        await sync_to_async(count_download)(ebook)
+
+        await alog_system_action(
+            f"Ebook download: {ebook.title} by {request.META.get('REMOTE_ADDR', 'Unknown')}",
+            level='info',
+            source='ebook_download',
+            request=request
+        )
+
+        return JsonResponse({
+            'status': 'success',
+            'download_url': ebook.ebook_file.url if ebook.ebook_file else '',
+            'title': ebook.title
+        })
+
+    except FreeEbook.DoesNotExist:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Ebook not found'
+        }, status=404)
+    except Exception as e:
+        await alog_system_action(
+            f"Ebook download error: {str(e)}",
+            level='error',
+            source='ebook_download',
+            request=request
+        )
+        return JsonResponse({
+            'status': 'error',
+            'message': 'An error occurred'
+        }, status=500)
@@ -0,0 +1,11 @@
+# main/benchmarks/__init__.py
+"""
+Benchmark suite for the public endpoints.
+
+- fixtures.py: seeded data at production-like volume (seed_benchmark_data)
+- driver.py: stdlib-only concurrent HTTP load driver, JSON results and
+  baseline comparison (run_benchmarks)
+- soak.py: fixed-count load with per-worker RSS sampling (soak_test)
+- server.py: scratch database / gunicorn helpers shared by the bench_*
+  management commands
+"""
@@ -0,0 +1,254 @@
+# main/benchmarks/driver.py
+"""
+Concurrent HTTP load driver (stdlib only: threads + http.client).
+
+Each client thread sends a weighted mix of requests to the public endpoints
+on a fresh connection per request (gunicorn sync workers close the
+connection after every response anyway) and records latency and status per
+endpoint. When a profiling token is given, every request also asks
+PerformanceMiddleware for its query count (``?_profile=1``), so the
+results carry queries per request next to the latencies.
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+from .server import percentile
+
+RESULT_VERSION = 1
+
+ENDPOINTS = {
+    'home': ('GET', '/'),
+    'contact': ('POST', '/api/contact-submit/'),
+    'newsletter': ('POST', '/api/newsletter-submit/'),
+    'download': ('POST', '/api/download-ebook/{ebook_id}/'),
+}
+
+# Mostly page views, like the real traffic
+DEFAULT_MIX = {'home': 70, 'contact': 10, 'newsletter': 10, 'download': 10}
+
+
+def parse_mix(value):
+    """'home=70,contact=10' -> {'home': 70, 'contact': 10}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r}, expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Target:
+    """Where to send requests, plus what every request needs (CSRF cookie, profiling token)"""
+
+    def __init__(self, url, ebook_id=None, profile_token='', timeout=30.0):
+        parts = urlsplit(url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.ebook_id = ebook_id
+        self.profile_token = profile_token
+        self.timeout = timeout
+        self.csrf_token = ''
+        # Keeps e-mail addresses unique across runs against the same database
+        self.run_id = f"{time.time_ns():x}"
+
+    def request(self, method, path, body=None, headers=None):
+        """Returns (status, headers, body)"""
+        connection = self.connection_class(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request(method, self.prefix + path, body=body, headers={'Connection': 'close', **(headers or {})})
+            response = connection.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            connection.close()
+
+    def fetch_csrf_token(self):
+        """The download endpoint is CSRF-protected; any page with a form sets the cookie"""
+        _, headers, _ = self.request('GET', '/admin/login/')
+        cookie = SimpleCookie()
+        for header in headers.get_all('Set-Cookie') or []:
+            cookie.load(header)
+        self.csrf_token = cookie['csrftoken'].value if 'csrftoken' in cookie else ''
+        return self.csrf_token
+
+
+class Client:
+    def __init__(self, target, number, rng):
+        self.target = target
+        self.number = number
+        self.rng = rng
+        self.sequence = 0
+
+    def build(self, name):
+        """(method, path, body, headers) for one request to ``name``"""
+        method, path = ENDPOINTS[name]
+        headers = {}
+        body = None
+        self.sequence += 1
+        unique = f"{self.target.run_id}-{self.number}-{self.sequence}-{self.rng.randrange(1 << 30)}"
+        if name == 'contact':
+            body = {
+                'full_name': f"Bench {unique}", 'email': f"bench-contact-{unique}@example.com",
+                'organization': 'Bench Inc', 'event_type': 'keynote', 'event_details': 'Benchmark run',
+            }
+        elif name == 'newsletter':
+            body = {'email': f"bench-newsletter-{unique}@example.com", 'name': 'Bench', 'source': 'newsletter_section'}
+        elif name == 'download':
+            path = path.format(ebook_id=self.target.ebook_id)
+            headers['X-CSRFToken'] = self.target.csrf_token
+            headers['Cookie'] = f"csrftoken={self.target.csrf_token}"
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        if self.target.profile_token:
+            path += '?_profile=1'
+            headers['X-Profile-Token'] = self.target.profile_token
+        return method, path, body, headers
+
+    def send(self, name):
+        """Returns (latency ms, status, query count or None); status 0 on connection errors"""
+        method, path, body, headers = self.build(name)
+        started = time.perf_counter()
+        try:
+            status, response_headers, _ = self.target.request(method, path, body, headers)
+        except (OSError, http.client.HTTPException):
+            return (time.perf_counter() - started) * 1000, 0, None
+        elapsed = (time.perf_counter() - started) * 1000
+        queries = response_headers.get('X-Profile-SQL-Count')
+        return elapsed, status, int(queries) if queries is not None else None
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.statuses = defaultdict(int)
+        self.queries = []
+
+    def add(self, elapsed, status, queries):
+        self.statuses[status] += 1
+        if status != 200:
+            self.errors += 1
+            return
+        self.latencies.append(elapsed)
+        if queries is not None:
+            self.queries.append(queries)
+
+    def merge(self, other):
+        self.latencies += other.latencies
+        self.errors += other.errors
+        for status, count in other.statuses.items():
+            self.statuses[status] += count
+        self.queries += other.queries
+
+    def summary(self, seconds):
+        latencies = self.latencies
+        return {
+            'requests': len(latencies) + self.errors,
+            'errors': self.errors,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'rps': round(len(latencies) / seconds, 2) if seconds else 0.0,
+            'latency_ms': {
+                'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+                'p50': round(percentile(latencies, 0.50), 2),
+                'p95': round(percentile(latencies, 0.95), 2),
+                'p99': round(percentile(latencies, 0.99), 2),
+                'max': round(max(latencies), 2) if latencies else 0.0,
+            },
+            'queries_per_request': round(sum(self.queries) / len(self.queries), 2) if self.queries else None,
+        }
+
+
+def client_loop(target, number, mix, deadline, seed):
+    rng = random.Random(seed)
+    client = Client(target, number, rng)
+    names, weights = list(mix), list(mix.values())
+    stats = defaultdict(EndpointStats)
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        stats[name].add(*client.send(name))
+    return stats
+
+
+def run(target, mix=None, concurrency=10, seconds=30.0, warmup=2.0, seed=0):
+    """Drive ``target`` with ``concurrency`` client threads; returns {'endpoints': ..., 'total': ...}"""
+    mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+    if 'download' in mix:
+        if target.ebook_id is None:
+            raise ValueError('The download endpoint needs an ebook id')
+        target.fetch_csrf_token()
+
+    if warmup:
+        # Not recorded: first-request costs, cold caches
+        run_threads(target, mix, concurrency, warmup, seed - 1)
+    started = time.monotonic()
+    per_thread = run_threads(target, mix, concurrency, seconds, seed)
+    elapsed = time.monotonic() - started
+
+    merged = defaultdict(EndpointStats)
+    for stats in per_thread:
+        for name, endpoint in stats.items():
+            merged[name].merge(endpoint)
+    total = EndpointStats()
+    for endpoint in merged.values():
+        total.merge(endpoint)
+    return {
+        'duration_s': round(elapsed, 2),
+        'endpoints': {name: merged[name].summary(elapsed) for name in mix if name in merged},
+        'total': total.summary(elapsed),
+    }
+
+
+def run_threads(target, mix, concurrency, seconds, seed):
+    deadline = time.monotonic() + seconds
+    results = [None] * concurrency
+
+    def work(number):
+        results[number] = client_loop(target, number, mix, deadline, seed * 1000 + number)
+
+    threads = [threading.Thread(target=work, args=(number,), daemon=True) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [stats for stats in results if stats is not None]
+
+
+def compare(baseline, current, max_regression_pct=10.0):
+    """
+    Rows of (endpoint, metric, baseline, current, change %, regressed) for the
+    endpoints in both results. Latency (p95, p99) may grow and throughput
+    drop by at most ``max_regression_pct``; queries per request may not grow
+    by half a query or more.
+    """
+    rows = []
+    for name, now in current['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(name)
+        if before is None:
+            continue
+        for metric, old, new in (
+            ('p95_ms', before['latency_ms']['p95'], now['latency_ms']['p95']),
+            ('p99_ms', before['latency_ms']['p99'], now['latency_ms']['p99']),
+            ('rps', before['rps'], now['rps']),
+            ('queries', before['queries_per_request'], now['queries_per_request']),
+        ):
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else (100.0 if new else 0.0)
+            if metric == 'rps':
+                regressed = change < -max_regression_pct
+            elif metric == 'queries':
+                regressed = new - old >= 0.5
+            else:
+                regressed = change > max_regression_pct
+            rows.append((name, metric, old, new, round(change, 1), regressed))
+    return rows
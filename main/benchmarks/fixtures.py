@@ -0,0 +1,129 @@
+# main/benchmarks/fixtures.py
+"""
+Seeded data for benchmarks.
+
+Content tables get a realistic page worth of rows, the append-only tables
+(SystemLog, NewsletterSubscription) production-like volume. Rows are
+bulk-inserted, so signals do not run: the analytics rollups are rebuilt and
+the section cache versions bumped once at the end instead.
+"""
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from main import analytics
+from main.models import (
+    AboutSection, FreeEbook, GalleryImage, HeroImage, ImpactResult, NewsletterContent,
+    NewsletterSubscription, Service, SiteSettings, SystemLog, Testimonial
+)
+from main.sections import VERSIONED_MODELS, bump_versions
+
+SIZES = {
+    'services': 8,
+    'results': 6,
+    'testimonials': 24,
+    'gallery': 30,
+    'logs': 1_000_000,
+    'subscriptions': 100_000,
+}
+
+# Spread of created_at for the append-only tables
+HISTORY_DAYS = 365
+BATCH_SIZE = 10_000
+
+LOG_SOURCES = ['home_view', 'contact_form', 'newsletter_form', 'ebook_download', 'admin']
+LOG_LEVELS = ['info'] * 90 + ['success'] * 6 + ['warning'] * 3 + ['error']
+
+
+def batches(total, size=BATCH_SIZE):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def backdate(model, objects, days):
+    """auto_now_add ignores explicit values: move the inserted rows back afterwards"""
+    ids = [obj.pk for obj in objects]
+    model.objects.filter(pk__gte=min(ids), pk__lte=max(ids)).update(created_at=F('created_at') - timedelta(days=days))
+
+
+def seed_content(sizes):
+    SiteSettings.objects.get_or_create(site_name='Fusion Force LLC')
+    HeroImage.objects.bulk_create([
+        HeroImage(title='Bench hero', image='hero/hom.jpeg', position='desktop'),
+        HeroImage(title='Bench hero mobile', image='hero/hom.jpeg', position='mobile', order=1),
+    ])
+    AboutSection.objects.create(
+        title='Bench about', image='about/hom.jpeg', content='Bench ' * 200, bullet_points='One\nTwo\nThree'
+    )
+    service_types = [key for key, _ in Service.SERVICE_TYPES]
+    Service.objects.bulk_create([
+        Service(title=f"Service {i}", service_type=service_types[i % len(service_types)],
+                description='Bench ' * 60, topics='Topic A\nTopic B\nTopic C', order=i)
+        for i in range(sizes['services'])
+    ])
+    ImpactResult.objects.bulk_create([
+        ImpactResult(title=f"Result {i}", value=f"{(i + 1) * 10}%", order=i) for i in range(sizes['results'])
+    ])
+    GalleryImage.objects.bulk_create([
+        GalleryImage(title=f"Bench image {i}", image='gallery/IMG_20251219_170821.jpg', description='Bench', order=i)
+        for i in range(sizes['gallery'])
+    ])
+    Testimonial.objects.bulk_create([
+        Testimonial(client_name=f"Client {i}", position='CEO', company=f"Company {i}", content='Great ' * 40, order=i)
+        for i in range(sizes['testimonials'])
+    ])
+    NewsletterContent.objects.create(image='newsletter/End.jpg', pdf_file='newsletter_pdfs/FUSION-FORCE_1.pdf')
+    return FreeEbook.objects.create(title='Bench eBook', ebook_file='ebooks/Leading with a Heart Ebook .pdf')
+
+
+def seed_logs(total, rng):
+    for number, (start, count) in enumerate(batches(total)):
+        with transaction.atomic():
+            created = SystemLog.objects.bulk_create([
+                SystemLog(
+                    log_level=rng.choice(LOG_LEVELS), source=rng.choice(LOG_SOURCES),
+                    message=f"Bench log {start + i}", user_ip=f"10.0.{rng.randrange(256)}.{rng.randrange(256)}",
+                    user_agent='bench',
+                )
+                for i in range(count)
+            ])
+            backdate(SystemLog, created, number % HISTORY_DAYS)
+
+
+def seed_subscriptions(total, rng):
+    sources = [key for key, _ in NewsletterSubscription.SOURCE_CHOICES]
+    for number, (start, count) in enumerate(batches(total)):
+        with transaction.atomic():
+            created = NewsletterSubscription.objects.bulk_create([
+                NewsletterSubscription(
+                    email=f"bench-{start + i}@example.com", name=f"Bench {start + i}",
+                    source=rng.choice(sources), is_active=rng.random() > 0.05,
+                )
+                for i in range(count)
+            ])
+            backdate(NewsletterSubscription, created, number % HISTORY_DAYS)
+
+
+def seed(sizes=None, seed_value=42, progress=None):
+    """Seed every table; returns the id of the active FreeEbook"""
+    sizes = {**SIZES, **(sizes or {})}
+    rng = random.Random(seed_value)
+    progress = progress or (lambda message: None)
+
+    with transaction.atomic():
+        ebook = seed_content(sizes)
+    progress('content')
+    seed_logs(sizes['logs'], rng)
+    progress(f"{sizes['logs']} logs")
+    seed_subscriptions(sizes['subscriptions'], rng)
+    progress(f"{sizes['subscriptions']} subscriptions")
+
+    today = timezone.localdate()
+    analytics.rebuild(today - timedelta(days=HISTORY_DAYS), today)
+    for model in VERSIONED_MODELS:
+        bump_versions(model)
+    progress('rollups and section versions')
+    return ebook.id
@@ -0,0 +1,92 @@
+# main/benchmarks/server.py
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+# Explicit worker classes: gunicorn.conf.py would pick them from the
+# machine's size (gthread) and from ASYNC_VIEWS
+SERVERS = {
+    'sync': ['fusion_force.wsgi', '-k', 'sync'],
+    'async': ['fusion_force.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def manage_command():
+    return [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py')]
+
+
+def scratch_env(directory, sqlite_path=None, **extra):
+    """Production profile on a SQLite file, static root and file cache inside ``directory``"""
+    env = dict(
+        os.environ, DJANGO_ENV='prod',
+        SQLITE_PATH=sqlite_path or os.path.join(directory, 'bench.sqlite3'),
+        STATIC_ROOT=os.path.join(directory, 'static'),
+        CACHE_DIR=os.path.join(directory, 'cache'),
+        **extra,
+    )
+    env.pop('DATABASE_URL', None)
+    env.pop('DATABASE_REPLICA_URL', None)
+    return env
+
+
+def prepare(env, *commands):
+    """migrate + createcachetable + collectstatic, then any extra manage.py commands, in the scratch environment"""
+    for command in (['migrate', '--noinput'], ['createcachetable'], ['collectstatic', '--noinput'], *commands):
+        subprocess.run(manage_command() + command, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+@contextmanager
+def gunicorn(env, kind='sync', workers=2, log=None, args=None):
+    """
+    Run gunicorn with gunicorn.conf.py on a free port; yields (port, process).
+    Unless ``args`` replaces them, the worker class and count are fixed and
+    workers are never recycled, so runs stay comparable.
+    """
+    port = free_port()
+    log = log or os.path.join(os.path.dirname(env['STATIC_ROOT']), f'{kind}.log')
+    if args is None:
+        args = [*SERVERS[kind], '--workers', str(workers), '--max-requests', '0']
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'), *args,
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', '--error-logfile', log],
+        cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+    )
+    try:
+        wait_for(port, server, log)
+        yield port, server
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def wait_for(port, server, log, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            with open(log) as handle:
+                raise CommandError(f"gunicorn exited with {server.returncode}:\n{handle.read()[-2000:]}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"gunicorn did not listen on port {port} within {timeout}s")
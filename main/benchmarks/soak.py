@@ -0,0 +1,149 @@
+# main/benchmarks/soak.py
+"""
+Soak test: a fixed number of requests against gunicorn (gunicorn.conf.py,
+including worker recycling) while the memory of every worker is sampled
+from /proc. Memory is stable when the workers' RSS at the end of the run is
+within a few MB of where it was once the workers had warmed up.
+
+Linux only (/proc).
+"""
+import itertools
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+from .driver import Client, EndpointStats
+
+
+# ============ MEMORY ============
+def worker_pids(master):
+    """Live child processes of ``master``"""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as handle:
+                # pid (comm) state ppid ... - comm may contain spaces
+                fields = handle.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as handle:
+            for line in handle:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class MemorySampler(threading.Thread):
+    """Every ``interval`` seconds: (requests done, master RSS, {worker pid: RSS}) in kB"""
+
+    def __init__(self, master, progress, interval=2.0):
+        super().__init__(name='soak-sampler', daemon=True)
+        self.master = master
+        self.progress = progress
+        self.interval = interval
+        self.samples = []
+        self._stopped = threading.Event()
+
+    def sample(self):
+        workers = {pid: rss_kb(pid) for pid in worker_pids(self.master)}
+        self.samples.append((
+            self.progress['done'], rss_kb(self.master),
+            {pid: rss for pid, rss in workers.items() if rss is not None},
+        ))
+
+    def run(self):
+        self.sample()
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        self.sample()
+
+
+def summarize(samples, settle=0.2):
+    """
+    Mean worker RSS per sample, and its growth from the samples just after
+    the first ``settle`` fraction of the run (warm-up) to the last ones
+    """
+    rows = []
+    for done, master, workers in samples:
+        if workers:
+            rows.append({
+                'requests': done,
+                'master_mb': round((master or 0) / 1024, 1),
+                'workers': len(workers),
+                'worker_mean_mb': round(sum(workers.values()) / len(workers) / 1024, 1),
+                'worker_max_mb': round(max(workers.values()) / 1024, 1),
+            })
+    total = rows[-1]['requests'] if rows else 0
+    settled = [row for row in rows if row['requests'] >= total * settle] or rows
+    window = max(1, len(settled) // 4)
+    start = sum(row['worker_mean_mb'] for row in settled[:window]) / window if settled else 0.0
+    end = sum(row['worker_mean_mb'] for row in settled[-window:]) / window if settled else 0.0
+    seen = {pid for _, _, workers in samples for pid in workers}
+    initial = len(samples[0][2]) if samples else 0
+    return {
+        'samples': rows,
+        'settled_mb': round(start, 1),
+        'final_mb': round(end, 1),
+        'growth_mb': round(end - start, 1),
+        'workers_recycled': max(0, len(seen) - initial),
+    }
+
+
+# ============ LOAD ============
+def run(target, mix, concurrency, total, progress, seed=0):
+    """Send ``total`` requests from ``concurrency`` threads; returns {'endpoints': ..., 'total': ...}"""
+    if 'download' in mix:
+        target.fetch_csrf_token()
+    tickets = itertools.count()
+    lock = threading.Lock()
+    names, weights = list(mix), list(mix.values())
+    results = [None] * concurrency
+
+    def work(number):
+        rng = random.Random(seed * 1000 + number)
+        client = Client(target, number, rng)
+        stats = defaultdict(EndpointStats)
+        while next(tickets) < total:
+            name = rng.choices(names, weights)[0]
+            stats[name].add(*client.send(name))
+            with lock:
+                progress['done'] += 1
+        results[number] = stats
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=work, args=(number,), daemon=True) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    merged = defaultdict(EndpointStats)
+    for stats in results:
+        for name, endpoint in (stats or {}).items():
+            merged[name].merge(endpoint)
+    overall = EndpointStats()
+    for endpoint in merged.values():
+        overall.merge(endpoint)
+    return {
+        'duration_s': round(elapsed, 2),
+        'endpoints': {name: merged[name].summary(elapsed) for name in mix if name in merged},
+        'total': overall.summary(elapsed),
+    }
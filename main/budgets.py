@@ -0,0 +1,147 @@
+# main/budgets.py
+"""
+Per-endpoint performance budgets.
+
+Budgets are declared next to the URL patterns (``BUDGETS`` in main/urls.py)
+and checked by the test suite (main/tests.py): each endpoint is requested
+through the test client while its SQL queries, template render time and
+response size are measured. A budget overrun fails the test and prints
+every query with the project code (and template) it came from, so an
+N+1 or a stray ``.count()`` points at its own line.
+"""
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import base as template_base
+from django.template.backends import django as django_backend
+
+from .perf import RequestMetrics
+
+_PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class Budget:
+    """Upper bounds for one endpoint; None leaves a dimension unchecked"""
+    __slots__ = ('queries', 'render_ms', 'response_bytes')
+
+    def __init__(self, queries=None, render_ms=None, response_bytes=None):
+        self.queries = queries
+        self.render_ms = render_ms
+        self.response_bytes = response_bytes
+
+    def __repr__(self):
+        return (f"Budget(queries={self.queries}, render_ms={self.render_ms}, "
+                f"response_bytes={self.response_bytes})")
+
+
+def query_origin(limit=6):
+    """
+    Project frames (innermost first, up to the request made by ``measure``)
+    and the template being rendered, for the current query
+    """
+    frames, template = [], None
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code is not measure.__code__:
+        code = frame.f_code
+        if template is None and code is template_base.Template.render.__code__:
+            template = getattr(frame.f_locals.get('self'), 'name', None)
+        filename = str(Path(code.co_filename).resolve()) if not code.co_filename.startswith('<') else ''
+        if (filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE
+                and 'site-packages' not in filename and len(frames) < limit):
+            frames.append(f"{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.f_lineno} in {code.co_name}")
+        frame = frame.f_back
+    return {'stack': frames, 'template': template}
+
+
+class OriginQueryRecorder(RequestMetrics):
+    """RequestMetrics keeping every query, with where it was issued from"""
+
+    def __init__(self):
+        super().__init__(keep_sql=True)
+
+    def __call__(self, execute, sql, params, many, context):
+        try:
+            return super().__call__(execute, sql, params, many, context)
+        finally:
+            self.statements[-1].update(query_origin())
+
+
+class Measurement:
+    def __init__(self, response, queries, render_ms):
+        self.response = response
+        self.queries = queries
+        self.render_ms = render_ms
+
+    @property
+    def response_bytes(self):
+        if self.response.streaming:
+            return sum(len(chunk) for chunk in self.response.streaming_content)
+        return len(self.response.content)
+
+    def violations(self, budget):
+        """Human-readable list of exceeded limits"""
+        found = []
+        for label, limit, actual in (
+            ('queries', budget.queries, len(self.queries)),
+            ('render ms', budget.render_ms, self.render_ms),
+            ('response bytes', budget.response_bytes, self.response_bytes),
+        ):
+            if limit is not None and actual > limit:
+                found.append(f"{label}: {actual:.1f} > {limit}" if isinstance(actual, float) else
+                             f"{label}: {actual} > {limit}")
+        return found
+
+    def report(self):
+        lines = [f"{len(self.queries)} queries, {self.render_ms:.1f}ms rendering, {self.response_bytes} bytes"]
+        for number, query in enumerate(self.queries, 1):
+            lines.append(f"  [{number}] ({query['alias']}, {query['ms']:.2f}ms) {query['sql']}")
+            if query.get('template'):
+                lines.append(f"        template: {query['template']}")
+            for origin in query.get('stack', []):
+                lines.append(f"        at {origin}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def record_queries():
+    """Collect the queries of every connection of this thread, with their origin"""
+    recorder = OriginQueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder.statements
+
+
+@contextmanager
+def record_render_time():
+    """Time spent in top-level template renders (queries run by the template included)"""
+    timing = {'ms': 0.0, 'depth': 0}
+    original = django_backend.Template.render
+
+    def timed_render(self, *args, **kwargs):
+        timing['depth'] += 1
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            timing['depth'] -= 1
+            if not timing['depth']:
+                timing['ms'] += (time.perf_counter() - started) * 1000
+
+    django_backend.Template.render = timed_render
+    try:
+        yield timing
+    finally:
+        django_backend.Template.render = original
+
+
+def measure(client, method, path, **kwargs):
+    """Issue one request with ``client`` (django.test.Client) and measure it"""
+    with record_render_time() as timing, record_queries() as queries:
+        response = getattr(client, method)(path, **kwargs)
+    return Measurement(response, queries, timing['ms'])
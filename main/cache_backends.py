@@ -0,0 +1,292 @@
+# main/cache_backends.py
+"""
+Two-tier cache backend (settings.CACHES['default']).
+
+    TieredCache -> per-process LRU (bounded by entries and bytes, short TTL)
+                -> shared tier: another CACHES alias (OPTIONS['SHARED']) -
+                   FileBasedCache by default, DatabaseCache or RedisCache
+
+Reads are served from the process's own LRU when possible, else from the
+shared tier, which every gunicorn worker sees. Writes go to both. A value
+changed or deleted through another worker can be served from this
+worker's LRU for at most LOCAL_TIMEOUT seconds; keys that embed a content
+version (main/sections.py) never go stale.
+
+``get_or_set`` is single-flight: on a miss one thread per process computes
+the value while the others wait for it, and across processes a lock key in
+the shared tier (``add``) lets one worker compute while the others poll
+the shared tier for up to LOCK_WAIT seconds (best effort with the file
+tier, whose ``add`` is not atomic).
+
+Counters per tier (hits, misses, evictions, coalesced and waited misses)
+are exported on /metrics.
+"""
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+
+COUNTERS = ('local_hits', 'local_misses', 'shared_hits', 'shared_misses',
+            'computed', 'coalesced', 'lock_waits', 'lock_timeouts')
+
+# Django creates a backend instance per thread; like LocMemCache, the local
+# tier and its bookkeeping are per process, by LOCATION
+_locals = {}
+_stats = {}
+_flights = {}
+_flights_locks = {}
+_setup_lock = threading.Lock()
+
+
+class LocalLRU:
+    """Pickled values by key, least recently used first; bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (expires at or None, pickled value)
+        self.bytes = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires, data = entry
+            if expires is not None and expires <= time.time():
+                self._remove(key)
+                return _MISSING
+            self.entries.move_to_end(key)
+        return pickle.loads(data)
+
+    def set(self, key, value, expires):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            self.delete(key)
+            return
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (expires, data)
+            self.bytes += len(data)
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            return self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes -= len(entry[1])
+        return True
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 30)
+        self.lock_timeout = options.get('LOCK_TIMEOUT', 30)
+        self.lock_wait = options.get('LOCK_WAIT', 5.0)
+        with _setup_lock:
+            if location not in _locals:
+                _locals[location] = LocalLRU(
+                    options.get('LOCAL_MAX_ENTRIES', 5000), options.get('LOCAL_MAX_BYTES', 32 * 1024 * 1024)
+                )
+                _stats[location] = dict.fromkeys(COUNTERS, 0)
+                _flights[location] = {}
+                _flights_locks[location] = threading.Lock()
+        self.local = _locals[location]
+        self.stats = _stats[location]
+        self._flights = _flights[location]
+        self._flights_lock = _flights_locks[location]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _version(self, version):
+        return self.version if version is None else version
+
+    def _local_expiry(self, timeout):
+        timeout = self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+        return time.time() + timeout
+
+    def _count(self, name, amount=1):
+        # Counters are for /metrics; a lost increment under contention is fine
+        self.stats[name] += amount
+
+    # ============ READS ============
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        value = self.local.get(local_key)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+        self._count('local_misses')
+        value = self.shared.get(key, _MISSING, self._version(version))
+        if value is _MISSING:
+            self._count('shared_misses')
+            return default
+        self._count('shared_hits')
+        self.local.set(local_key, value, self._local_expiry(None))
+        return value
+
+    def get_many(self, keys, version=None):
+        found, missing = {}, []
+        for key in keys:
+            value = self.local.get(self.make_and_validate_key(key, version))
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        self._count('local_hits', len(found))
+        self._count('local_misses', len(missing))
+        if missing:
+            shared = self.shared.get_many(missing, self._version(version))
+            self._count('shared_hits', len(shared))
+            self._count('shared_misses', len(missing) - len(shared))
+            expires = self._local_expiry(None)
+            for key, value in shared.items():
+                self.local.set(self.make_and_validate_key(key, version), value, expires)
+            found.update(shared)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version) is not _MISSING
+
+    # ============ WRITES ============
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+        local_key = self.make_and_validate_key(key, version)
+        self.shared.set(key, value, timeout, self._version(version))
+        if timeout is not None and timeout <= 0:
+            self.local.delete(local_key)
+        else:
+            self.local.set(local_key, value, self._local_expiry(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+        if not self.shared.add(key, value, timeout, self._version(version)):
+            return False
+        local_key = self.make_and_validate_key(key, version)
+        if timeout is None or timeout > 0:
+            self.local.set(local_key, value, self._local_expiry(timeout))
+        return True
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout, version)
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+        return self.shared.touch(key, timeout, self._version(version))
+
+    def incr(self, key, delta=1, version=None):
+        # Atomic where the shared tier is (database, Redis)
+        value = self.shared.incr(key, delta, self._version(version))
+        self.local.delete(self.make_and_validate_key(key, version))
+        return value
+
+    def delete(self, key, version=None):
+        self.local.delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, self._version(version))
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(self.make_and_validate_key(key, version))
+        self.shared.delete_many(keys, self._version(version))
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    # ============ SINGLE FLIGHT ============
+    @contextmanager
+    def _single_flight(self, key):
+        """One thread per process at a time for ``key``"""
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            with self._flights_lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, _MISSING, version)
+        if value is not _MISSING:
+            return value
+        with self._single_flight(self.make_and_validate_key(key, version)):
+            # Computed by the thread this one waited for
+            value = self.get(key, _MISSING, version)
+            if value is not _MISSING:
+                self._count('coalesced')
+                return value
+            lock_key = f'{key}:lock'
+            owner = self.shared.add(lock_key, os.getpid(), self.lock_timeout, self._version(version))
+            if not owner:
+                value = self._wait_for(key, version)
+                if value is not _MISSING:
+                    return value
+            try:
+                value = default() if callable(default) else default
+                self._count('computed')
+                self.set(key, value, timeout, version)
+            finally:
+                if owner:
+                    self.shared.delete(lock_key, self._version(version))
+        return value
+
+    def _wait_for(self, key, version):
+        """Poll the shared tier while another process computes ``key``"""
+        self._count('lock_waits')
+        deadline = time.monotonic() + self.lock_wait
+        delay = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            value = self.shared.get(key, _MISSING, self._version(version))
+            if value is not _MISSING:
+                self._count('coalesced')
+                self.local.set(self.make_and_validate_key(key, version), value, self._local_expiry(None))
+                return value
+        # The other process died or is slow: compute it here as well
+        self._count('lock_timeouts')
+        return _MISSING
+
+    def snapshot(self):
+        """Counters plus local tier size, for /metrics"""
+        return {
+            **self.stats,
+            'local_evictions': self.local.evictions,
+            'local_entries': len(self.local.entries),
+            'local_bytes': self.local.bytes,
+        }
@@ -0,0 +1,251 @@
+# main/campaigns.py
+"""
+Newsletter campaign fan-out.
+
+A campaign goes through two resumable phases:
+
+1. Snapshot - active subscriptions are copied into CampaignRecipient rows by
+   keyset paging on NewsletterSubscription.id. The cursor is saved with each
+   page, so a restarted worker continues where the last one stopped.
+2. Delivery - pending recipients are claimed a page at a time, sent in
+   parallel chunks through a thread pool (one reused connection per chunk)
+   and their status is written back right after each page. The worker's
+   lease is renewed while a page is sending.
+
+Rows left in 'sending' by a crashed worker are marked 'interrupted' instead
+of being resent, so a resume never double-sends. They can be re-queued from
+the admin once the operator has checked the mail logs.
+"""
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from string import Template as SubstitutionTemplate
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.template import Context, Template
+from django.utils import timezone
+from django.utils.html import escape
+
+from .mailer import send_chunk
+from .models import CampaignRecipient, NewsletterCampaign, NewsletterSubscription, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+SITE_URL = getattr(settings, 'SITE_URL', '')
+SNAPSHOT_PAGE_SIZE = getattr(settings, 'CAMPAIGN_SNAPSHOT_PAGE_SIZE', 1000)
+DELIVERY_PAGE_SIZE = getattr(settings, 'CAMPAIGN_DELIVERY_PAGE_SIZE', 200)
+MAX_WORKERS = getattr(settings, 'CAMPAIGN_MAX_WORKERS', 4)
+LOCK_SECONDS = getattr(settings, 'CAMPAIGN_LOCK_SECONDS', 5 * 60)
+# Lease renewal interval while a page is sending (also renewed as each chunk finishes)
+HEARTBEAT_SECONDS = LOCK_SECONDS / 3
+
+# Duck-typed stand-in for OutboundEmail, accepted by mailer.send_chunk
+RenderedMessage = namedtuple('RenderedMessage', 'id to_email subject body html_body')
+
+
+# ============ LOCKING ============
+def acquire_lock(campaign):
+    """Take (or renew) the campaign's worker lease. Returns False if another worker holds it"""
+    now = timezone.now()
+    acquired = NewsletterCampaign.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        pk=campaign.pk,
+    ).update(locked_until=now + timedelta(seconds=LOCK_SECONDS))
+    return bool(acquired)
+
+
+def renew_lock(campaign):
+    """Extend a lease we already hold (no-op when the campaign is not locked)"""
+    NewsletterCampaign.objects.filter(pk=campaign.pk, locked_until__isnull=False).update(
+        locked_until=timezone.now() + timedelta(seconds=LOCK_SECONDS)
+    )
+
+
+def release_lock(campaign):
+    NewsletterCampaign.objects.filter(pk=campaign.pk).update(locked_until=None)
+
+
+# ============ SNAPSHOT ============
+def snapshot_recipients(campaign, page_size=SNAPSHOT_PAGE_SIZE):
+    """Copy active subscribers into CampaignRecipient rows, one keyset page at a time"""
+    while not campaign.snapshot_complete:
+        page = list(
+            NewsletterSubscription.objects
+            .filter(is_active=True, id__gt=campaign.snapshot_cursor)
+            .order_by('id')
+            .values('id', 'email', 'name')[:page_size]
+        )
+        with transaction.atomic():
+            if page:
+                CampaignRecipient.objects.bulk_create(
+                    [
+                        CampaignRecipient(
+                            campaign=campaign,
+                            subscription_id=row['id'],
+                            email=row['email'],
+                            name=row['name'],
+                        )
+                        for row in page
+                    ],
+                    ignore_conflicts=True,
+                )
+                campaign.snapshot_cursor = page[-1]['id']
+            campaign.snapshot_complete = len(page) < page_size
+            if campaign.snapshot_complete:
+                # One exact count at the end: after a resumed page,
+                # ignore_conflicts may have skipped rows we already added.
+                campaign.total_recipients = campaign.recipients.count()
+            else:
+                campaign.total_recipients += len(page)
+            campaign.save(update_fields=['snapshot_cursor', 'snapshot_complete', 'total_recipients', 'updated_at'])
+        renew_lock(campaign)
+    return campaign.total_recipients
+
+
+# ============ RENDERING ============
+class CampaignRenderer:
+    """
+    Renders the campaign templates once, then does cheap $name/$email
+    substitution. Subject and text body are plain text (no autoescaping);
+    in the HTML body the substituted values are escaped, since names come
+    from the public newsletter form.
+    """
+
+    def __init__(self, campaign):
+        newsletter = campaign.newsletter
+        values = {
+            'newsletter': newsletter,
+            'site_settings': SiteSettings.objects.first() or SiteSettings(),
+            # Emails have no request to resolve a relative media URL against
+            'pdf_url': urljoin(SITE_URL, newsletter.pdf_file.url) if newsletter.pdf_file else '',
+        }
+        text = Context(values, autoescape=False)
+        self.subject = SubstitutionTemplate(Template(campaign.subject).render(text))
+        self.body = SubstitutionTemplate(Template(campaign.body).render(text))
+        self.html_body = SubstitutionTemplate(
+            Template(campaign.html_body).render(Context(values)) if campaign.html_body else ''
+        )
+
+    def render(self, recipient):
+        values = {
+            'name': recipient.name or recipient.email.split('@')[0],
+            'email': recipient.email,
+        }
+        return RenderedMessage(
+            id=recipient.id,
+            to_email=recipient.email,
+            subject=self.subject.safe_substitute(values),
+            body=self.body.safe_substitute(values),
+            html_body=self.html_body.safe_substitute({key: escape(value) for key, value in values.items()}),
+        )
+
+
+# ============ DELIVERY ============
+def mark_interrupted(campaign):
+    """Recipients left in 'sending' by a dead worker may or may not have been sent"""
+    interrupted = campaign.recipients.filter(status='sending').update(
+        status='interrupted',
+        error='Worker stopped while sending; not retried automatically to avoid duplicates',
+    )
+    if interrupted:
+        NewsletterCampaign.objects.filter(pk=campaign.pk).update(failed_count=F('failed_count') + interrupted)
+        logger.warning(f"Campaign {campaign.pk}: {interrupted} recipients marked as interrupted")
+    return interrupted
+
+
+def claim_page(campaign, after_id, page_size):
+    recipients = list(
+        campaign.recipients.filter(status='pending', id__gt=after_id).order_by('id')[:page_size]
+    )
+    if recipients:
+        CampaignRecipient.objects.filter(id__in=[r.id for r in recipients]).update(status='sending')
+    return recipients
+
+
+def write_page_results(campaign, results, elapsed):
+    """Record a page's results. Only rows still in 'sending' are updated and
+    counted: rows another worker already marked 'interrupted' (after our lease
+    expired) are counted there"""
+    now = timezone.now()
+    sent_ids = [message.id for message, error in results if error is None]
+    failures = [(message.id, error) for message, error in results if error is not None]
+    sending = CampaignRecipient.objects.filter(status='sending')
+
+    with transaction.atomic():
+        sent = sending.filter(id__in=sent_ids).update(status='sent', sent_at=now, error='') if sent_ids else 0
+        failed = sum(
+            sending.filter(id=recipient_id).update(status='failed', error=error[:2000])
+            for recipient_id, error in failures
+        )
+        NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+            sent_count=F('sent_count') + sent,
+            failed_count=F('failed_count') + failed,
+            sending_seconds=F('sending_seconds') + elapsed,
+            locked_until=now + timedelta(seconds=LOCK_SECONDS),
+        )
+    return sent, failed
+
+
+def send_page(campaign, pool, chunks, backend):
+    """Send the chunks in parallel, renewing the lease as each one finishes and
+    at least every HEARTBEAT_SECONDS while any is still sending"""
+    futures = [pool.submit(send_chunk, chunk, backend) for chunk in chunks]
+    pending = set(futures)
+    while pending:
+        _, pending = wait(pending, timeout=HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED)
+        renew_lock(campaign)
+    return [result for future in futures for result in future.result()]
+
+
+def deliver_campaign(campaign, page_size=DELIVERY_PAGE_SIZE, workers=MAX_WORKERS, backend=None):
+    """Snapshot (if needed) and deliver a campaign. Safe to call again after a crash"""
+    if campaign.status == 'completed':
+        return {'sent': 0, 'failed': 0}
+    if not acquire_lock(campaign):
+        logger.info(f"Campaign {campaign.pk} is locked by another worker")
+        return None
+
+    try:
+        NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+            status='sending', started_at=campaign.started_at or timezone.now()
+        )
+        mark_interrupted(campaign)
+        snapshot_recipients(campaign)
+
+        renderer = CampaignRenderer(campaign)
+        totals = {'sent': 0, 'failed': 0}
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                campaign.refresh_from_db(fields=['status'])
+                if campaign.status == 'paused':
+                    logger.info(f"Campaign {campaign.pk} paused")
+                    return totals
+
+                recipients = claim_page(campaign, last_id, page_size)
+                if not recipients:
+                    break
+                last_id = recipients[-1].id
+
+                started = time.monotonic()
+                messages = [renderer.render(recipient) for recipient in recipients]
+                lanes = min(workers, len(messages))
+                chunks = [messages[lane::lanes] for lane in range(lanes)]
+                results = send_page(campaign, pool, chunks, backend)
+
+                sent, failed = write_page_results(campaign, results, time.monotonic() - started)
+                totals['sent'] += sent
+                totals['failed'] += failed
+
+        # Not over a pause that came in after the last page was claimed
+        NewsletterCampaign.objects.filter(pk=campaign.pk, status='sending').update(
+            status='completed', finished_at=timezone.now()
+        )
+        return totals
+    finally:
+        release_lock(campaign)
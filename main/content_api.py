@@ -0,0 +1,186 @@
+# main/content_api.py
+"""
+Read-only JSON content API: /api/content/v1/
+
+Every active home page section in one compact payload, for a JS front end
+or an app that renders the content itself instead of the full HTML page.
+
+- ``?fields=hero,services.title,services.icon`` selects sections, or single
+  fields of a section (``id`` is always kept for list items). Without
+  ``fields`` every section is returned with every field.
+- The ETag is derived from the ContentVersion of the models the selected
+  sections show (main/sections.py), so it is known after one query: a
+  matching ``If-None-Match`` gets a 304 without loading or serializing
+  anything.
+- The serialized payload is cached under that ETag. Saving or deleting
+  content bumps the version (signals), which changes the ETag and the key -
+  nothing has to be deleted.
+
+Empty values are left out of the payload; media fields are URLs.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from .db_router import replica_reads
+from .models import (
+    AboutSection, FreeEbook, GalleryImage, HeroImage, ImpactResult, NewsletterContent,
+    Service, SiteSettings, Testimonial
+)
+from .sections import current_versions
+
+API_VERSION = 1
+MAX_AGE = getattr(settings, 'CONTENT_API_MAX_AGE', 60)
+CACHE_TIMEOUT = getattr(settings, 'CONTENT_API_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def media_url(field):
+    return field.url if field else None
+
+
+def active(model):
+    return model.objects.filter(is_active=True)
+
+
+# ============ SECTIONS ============
+# name -> (model, many, loader, {field: value of an instance})
+SECTIONS = {
+    'site': (SiteSettings, False, lambda: SiteSettings.objects.first(), {
+        'site_name': lambda obj: obj.site_name,
+        'contact_email': lambda obj: obj.contact_email,
+        'contact_phone': lambda obj: obj.contact_phone,
+        'logo': lambda obj: media_url(obj.logo),
+    }),
+    'hero': (HeroImage, True, lambda: active(HeroImage).order_by('order'), {
+        'title': lambda obj: obj.title,
+        'image': lambda obj: media_url(obj.image),
+        'position': lambda obj: obj.position,
+    }),
+    'about': (AboutSection, False, lambda: active(AboutSection).first(), {
+        'title': lambda obj: obj.title,
+        'content': lambda obj: obj.content,
+        'image': lambda obj: media_url(obj.image),
+        'image_2': lambda obj: media_url(obj.image_2),
+        'bullet_points': lambda obj: obj.bullet_points_list,
+    }),
+    'services': (Service, True, lambda: active(Service).order_by('order'), {
+        'title': lambda obj: obj.title,
+        'service_type': lambda obj: obj.service_type,
+        'description': lambda obj: obj.description,
+        'icon': lambda obj: obj.icon,
+        'topics': lambda obj: obj.topics_list,
+        'button_text': lambda obj: obj.button_text,
+    }),
+    'results': (ImpactResult, True, lambda: active(ImpactResult).order_by('order'), {
+        'title': lambda obj: obj.title,
+        'value': lambda obj: obj.value,
+    }),
+    'gallery': (GalleryImage, True, lambda: active(GalleryImage).order_by('order'), {
+        'title': lambda obj: obj.title,
+        'image': lambda obj: media_url(obj.image),
+        'description': lambda obj: obj.description,
+        'position': lambda obj: obj.position,
+    }),
+    'testimonials': (Testimonial, True, lambda: active(Testimonial).order_by('order'), {
+        'client_name': lambda obj: obj.client_name,
+        'position': lambda obj: obj.position,
+        'company': lambda obj: obj.company,
+        'content': lambda obj: obj.content,
+        'avatar': lambda obj: media_url(obj.avatar),
+    }),
+    'newsletter': (NewsletterContent, False, lambda: active(NewsletterContent).first(), {
+        'title': lambda obj: obj.title,
+        'subtitle': lambda obj: obj.subtitle,
+        'image': lambda obj: media_url(obj.image),
+        'benefits': lambda obj: obj.benefits_list,
+        'pdf_file': lambda obj: media_url(obj.pdf_file),
+    }),
+    'ebook': (FreeEbook, False, lambda: active(FreeEbook).first(), {
+        'title': lambda obj: obj.title,
+        'subtitle': lambda obj: obj.subtitle,
+        'description': lambda obj: obj.description,
+        'cover_image': lambda obj: media_url(obj.cover_image),
+        'download_url': lambda obj: reverse('download_ebook', args=[obj.id]) if obj.ebook_file else None,
+    }),
+}
+
+
+def parse_fields(value):
+    """'hero,services.title' -> {'hero': None, 'services': ['title']} (None: every field)"""
+    if not value:
+        return {name: None for name in SECTIONS}
+    selected = {}
+    for part in value.split(','):
+        name, _, field = part.strip().partition('.')
+        if name not in SECTIONS:
+            raise ValueError(f"Unknown section {name!r}, expected one of {', '.join(SECTIONS)}")
+        if not field:
+            selected[name] = None
+            continue
+        if field not in SECTIONS[name][3] and field != 'id':
+            raise ValueError(f"Unknown field {part.strip()!r}, {name} has {', '.join(SECTIONS[name][3])}")
+        if name not in selected or selected[name] is not None:
+            selected.setdefault(name, []).append(field)
+    # Canonical order: the same selection gets the same ETag
+    return {name: sorted(set(selected[name])) if selected[name] else None for name in SECTIONS if name in selected}
+
+
+def etag_for(selected, versions):
+    models = sorted({SECTIONS[name][0]._meta.label_lower for name in selected})
+    source = json.dumps([API_VERSION, selected, [(label, versions.get(label, 0)) for label in models]])
+    return quote_etag(f"v{API_VERSION}-{hashlib.sha1(source.encode()).hexdigest()[:20]}")
+
+
+def serialize(obj, getters, fields):
+    data = {'id': obj.id}
+    for field in fields or getters:
+        if field in getters:
+            value = getters[field](obj)
+            if value not in (None, '', []):
+                data[field] = value
+    return data
+
+
+def build(selected):
+    """Compact JSON bytes for the selected sections"""
+    payload = {'version': API_VERSION}
+    for name, fields in selected.items():
+        _, many, loader, getters = SECTIONS[name]
+        found = loader()
+        if many:
+            payload[name] = [serialize(obj, getters, fields) for obj in found]
+        elif found is not None:
+            payload[name] = serialize(found, getters, fields)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+# ============ VIEW ============
+@replica_reads
+@require_safe
+def content(request):
+    try:
+        selected = parse_fields(request.GET.get('fields', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    etag = etag_for(selected, current_versions())
+    headers = {
+        'ETag': etag,
+        'Cache-Control': f'public, max-age={MAX_AGE}',
+        'Access-Control-Allow-Origin': '*',
+    }
+    # Weak comparison: a CDN or proxy may hand the ETag back as W/"..."
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        body = cache.get_or_set(f'content-api:{etag}', lambda: build(selected), CACHE_TIMEOUT)
+        response = HttpResponse(body, content_type='application/json')
+    for name, value in headers.items():
+        response[name] = value
+    return response
@@ -0,0 +1,9 @@
+# main/db_backends/__init__.py
+"""
+Database backends used through settings.DATABASES['<alias>']['ENGINE'].
+
+- main.db_backends.postgresql: Django's PostgreSQL backend with
+  connections borrowed from a per-process pool (see pool.py)
+- main.db_backends.sqlite3: Django's SQLite backend with WAL, tuned pragmas
+  and write-locking transactions, for running without DATABASE_URL
+"""
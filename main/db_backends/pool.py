@@ -0,0 +1,243 @@
+# main/db_backends/pool.py
+"""
+Per-process database connection pool.
+
+Django normally ties a connection to the thread that opened it and closes
+it after CONN_MAX_AGE. A pooled backend instead hands its raw connection
+back here whenever Django "closes" it (end of request with CONN_MAX_AGE=0),
+and the next request on any thread of the same process takes it again.
+
+- MAX_SIZE bounds the open connections of one process (gunicorn worker);
+  callers wait up to TIMEOUT seconds for a free one, then get PoolTimeout.
+- A connection idle for CHECK_AFTER seconds or more is pinged before being
+  handed out. Dead ones (database or replica restarted, network blip) are
+  dropped and replaced, so the first request after a restart does not fail.
+- Idle connections above MIN_SIZE are closed after MAX_IDLE seconds, and any
+  connection older than MAX_LIFETIME is closed instead of being reused.
+
+Pools are keyed per process: a forked child never reuses (or closes) the
+sockets it inherited from its parent.
+"""
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from django.db.utils import OperationalError
+
+DEFAULTS = {
+    'MIN_SIZE': 1,
+    'MAX_SIZE': 4,
+    'TIMEOUT': 10.0,
+    'CHECK_AFTER': 1.0,
+    'MAX_IDLE': 5 * 60.0,
+    'MAX_LIFETIME': 60 * 60.0,
+}
+
+COUNTERS = ('checkouts', 'created', 'closed', 'health_check_failures', 'waits', 'timeouts')
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    ``ping(raw)`` returns whether a connection still works, ``reset(raw)``
+    returns whether a connection coming back can be reused (rolling back
+    any open transaction) and ``close(raw)`` closes it for good.
+    """
+
+    def __init__(self, alias, ping, reset, close, options=None):
+        options = {**DEFAULTS, **(options or {})}
+        self.alias = alias
+        self.min_size = int(options['MIN_SIZE'])
+        self.max_size = max(int(options['MAX_SIZE']), 1)
+        self.timeout = float(options['TIMEOUT'])
+        self.check_after = float(options['CHECK_AFTER'])
+        self.max_idle = float(options['MAX_IDLE'])
+        self.max_lifetime = float(options['MAX_LIFETIME'])
+        self.pid = os.getpid()
+        self._ping = ping
+        self._reset = reset
+        self._close = close
+        self._idle = deque()   # (raw, created, returned), most recently returned last
+        self._born = {}        # id(raw) -> created, for every open connection
+        self._reserved = 0     # slots taken by connections being opened
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self.counters = Counter()
+        self.wait_seconds = 0.0
+
+    # ---- checkout / return ----
+    def getconn(self, connect):
+        """Borrow a working connection, opening one with ``connect()`` if needed"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            raw, created, returned = self._acquire(deadline)
+            if raw is None:
+                return self._open(connect)
+            now = time.monotonic()
+            if now - returned < self.check_after or self._ping(raw):
+                self._count('checkouts')
+                return raw
+            self._count('health_check_failures')
+            self._discard(raw)
+
+    def putconn(self, raw):
+        """Take a connection back; it is closed instead if it cannot be reused"""
+        if os.getpid() != self.pid or id(raw) not in self._born:
+            # Inherited through fork: the socket belongs to the parent, which
+            # may still be using it, so it is neither reused nor closed here
+            return
+        now = time.monotonic()
+        created = self._born[id(raw)]
+        reusable = now - created < self.max_lifetime and self._reset(raw)
+        if not reusable:
+            self._discard(raw)
+            return
+        with self._cond:
+            self._idle.append((raw, created, now))
+            self._cond.notify()
+
+    def _acquire(self, deadline):
+        """Pop an idle connection, or reserve a slot for a new one (raw is None)"""
+        expired = []
+        try:
+            with self._cond:
+                started = None
+                while True:
+                    expired.extend(self._expire_idle())
+                    if self._idle:
+                        return self._idle.pop()
+                    if len(self._born) + self._reserved < self.max_size:
+                        self._reserved += 1
+                        return None, None, None
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"No database connection available for '{self.alias}' within "
+                            f"{self.timeout:g}s (MAX_SIZE={self.max_size})"
+                        )
+                    if started is None:
+                        started = time.monotonic()
+                        self.counters['waits'] += 1
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                        self.wait_seconds += time.monotonic() - started
+                        started = time.monotonic()
+        finally:
+            for raw in expired:
+                self._discard(raw)
+
+    def _open(self, connect):
+        try:
+            raw = connect()
+        except BaseException:
+            with self._cond:
+                self._reserved -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._reserved -= 1
+            self._born[id(raw)] = time.monotonic()
+            self.counters['created'] += 1
+            self.counters['checkouts'] += 1
+        return raw
+
+    def _expire_idle(self):
+        """Remove (under the lock) idle connections past MAX_IDLE, keeping MIN_SIZE open"""
+        now = time.monotonic()
+        expired = []
+        while self._idle and len(self._born) - len(expired) > self.min_size:
+            raw, created, returned = self._idle[0]
+            if now - returned < self.max_idle:
+                break
+            self._idle.popleft()
+            expired.append(raw)
+        return expired
+
+    def _count(self, name):
+        with self._cond:
+            self.counters[name] += 1
+
+    def _discard(self, raw):
+        with self._cond:
+            self._born.pop(id(raw), None)
+            self.counters['closed'] += 1
+            self._cond.notify()
+        try:
+            self._close(raw)
+        except Exception:
+            # Already broken; the server side is gone either way
+            pass
+
+    def close_idle(self):
+        """Close every idle connection (connections in use are left alone)"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for raw, created, returned in idle:
+            self._discard(raw)
+
+    # ---- reporting ----
+    def stats(self):
+        with self._cond:
+            size = len(self._born)
+            idle = len(self._idle)
+            waiting = self._waiting
+            counters = {name: self.counters[name] for name in COUNTERS}
+            wait_seconds = self.wait_seconds
+        return {
+            'alias': self.alias,
+            'pid': self.pid,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'waiting': waiting,
+            'wait_seconds': wait_seconds,
+            **counters,
+        }
+
+
+# ============ REGISTRY ============
+_pools = {}
+_lock = threading.Lock()
+# Pools inherited through fork(). Kept referenced so their connections are
+# never garbage-collected (and closed) in the child: the sockets still
+# belong to the parent process.
+_inherited = []
+
+
+def get_pool(key, alias, ping, reset, close, options=None):
+    """The pool for ``key`` in this process, created on first use"""
+    pool = _pools.get(key)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            if pool is not None:
+                _inherited.append(pool)
+            pool = _pools[key] = ConnectionPool(alias, ping, reset, close, options)
+        return pool
+
+
+def pools():
+    pid = os.getpid()
+    return [pool for pool in list(_pools.values()) if pool.pid == pid]
+
+
+def close_pools():
+    """Close idle pooled connections, e.g. in gunicorn's master before forking"""
+    for pool in pools():
+        pool.close_idle()
+
+
+def pool_stats():
+    return [pool.stats() for pool in pools()]
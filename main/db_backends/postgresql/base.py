@@ -0,0 +1,78 @@
+# main/db_backends/postgresql/base.py
+"""
+PostgreSQL backend with pooled connections.
+
+Identical to django.db.backends.postgresql except that opening a
+connection borrows one from main.db_backends.pool and closing it returns it
+there. Pool sizes come from DATABASES[alias]['POOL'] (see settings).
+"""
+from django.db.backends.postgresql.base import Database
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresDatabaseCreation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from main.db_backends import pool
+
+
+def ping(raw):
+    if raw.closed:
+        return False
+    try:
+        with raw.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not raw.autocommit:
+            raw.rollback()
+    except Database.Error:
+        return False
+    return True
+
+
+def reset(raw):
+    """Roll back whatever the borrower left open; False if the connection is broken"""
+    if raw.closed:
+        return False
+    try:
+        status = raw.info.transaction_status
+        if status == Database.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != Database.extensions.TRANSACTION_STATUS_IDLE:
+            raw.rollback()
+    except Database.Error:
+        return False
+    return True
+
+
+def close(raw):
+    raw.close()
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the test database "in use"
+        pool.close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        settings_dict = self.settings_dict
+        key = (self.alias, settings_dict['NAME'], settings_dict['HOST'], settings_dict['PORT'], settings_dict['USER'])
+        return pool.get_pool(key, self.alias, ping, reset, close, settings_dict.get('POOL'))
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.getconn(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        # Normally set while opening the connection, which a reused one skips
+        options = self.settings_dict['OPTIONS']
+        if 'isolation_level' in options:
+            self.isolation_level = IsolationLevel(options['isolation_level'])
+        else:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
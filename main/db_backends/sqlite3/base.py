@@ -0,0 +1,38 @@
+# main/db_backends/sqlite3/base.py
+"""
+SQLite backend tuned for several worker processes sharing one file.
+
+- WAL journal: readers never block the writer and the writer never blocks
+  readers.
+- synchronous=NORMAL: fsync at checkpoints instead of every commit (safe
+  with WAL; only the last transactions can be lost on power failure).
+- busy_timeout: a writer waits for the lock instead of failing with
+  "database is locked".
+- mmap_size: reads go through the page cache instead of read() calls.
+- Transactions start with BEGIN IMMEDIATE, taking the write lock up front.
+  A deferred transaction that reads first and then writes cannot wait for
+  the lock (SQLite fails it immediately to avoid a deadlock), so under
+  concurrency it would error despite busy_timeout.
+
+Override single pragmas with DATABASES[alias]['PRAGMAS'].
+"""
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in {**PRAGMAS, **self.settings_dict.get('PRAGMAS', {})}.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
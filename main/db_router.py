@@ -0,0 +1,91 @@
+# main/db_router.py
+"""
+Read/write routing between ``default`` (primary) and ``replica``.
+
+Reads only go to the replica inside a replica scope, which
+ReplicaRoutingMiddleware opens for GET/HEAD requests to views marked with
+``@replica_reads`` (the home page) and to admin changelists. Everything
+else - writes, other views, management commands, the write queue thread -
+uses ``default``.
+
+A write pins the rest of the request to ``default``. The middleware then
+also sets a short-lived cookie so the next request from the same browser
+(submit, then redirect to a confirmation page) reads its own write instead
+of a lagging replica. Fire-and-forget writes (main.write_queue) do not pin:
+nothing in the request reads them back.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+
+PIN_COOKIE = 'db_pin'
+PIN_SECONDS = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+class RoutingState:
+    __slots__ = ('use_replica', 'pinned', 'wrote', 'unpinned_writes')
+
+    def __init__(self, pinned=False):
+        self.use_replica = False
+        self.pinned = pinned
+        self.wrote = False
+        self.unpinned_writes = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def replica_reads(view):
+    """Mark a read-only view whose queries may be served by the replica"""
+    view.replica_reads = True
+    return view
+
+
+@contextmanager
+def request_scope(pinned=False):
+    token = _state.set(RoutingState(pinned=pinned))
+    try:
+        yield _state.get()
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def unpinned_writes():
+    """Writes inside this block do not pin the request to the primary"""
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    previous, state.unpinned_writes = state.unpinned_writes, True
+    try:
+        yield
+    finally:
+        state.unpinned_writes = previous
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.use_replica and not state.pinned:
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and not state.unpinned_writes:
+            state.pinned = True
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
@@ -0,0 +1,120 @@
+# main/health.py
+"""
+Liveness and readiness probes for the platform (railway.json healthcheck).
+
+- /healthz: the process is up and serving requests. No database, no cache:
+  a database outage must not get healthy workers restarted.
+- /readyz: this worker can serve traffic. It is warmed first
+  (``main.startup.warm_worker``, normally already done by gunicorn's
+  post_worker_init hook), then every database, the cache and media storage
+  are checked. The result is kept for READY_CACHE_SECONDS, so a
+  probe every second costs one round of checks per worker and interval.
+
+Both answer 200 or 503 with a small JSON body and are never cached by
+proxies. The probes are public, so a failed check is only reported as
+failed; its exception (which may name hosts or credentials) goes to the log.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+from . import startup
+
+logger = logging.getLogger(__name__)
+
+READY_CACHE_SECONDS = getattr(settings, 'READY_CACHE_SECONDS', 5)
+
+_lock = threading.Lock()
+_last = {'at': None, 'pid': None, 'result': None}
+
+
+# ============ CHECKS ============
+def check_database(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def check_cache(alias):
+    # Each alias on its own: through the tiered cache a read would be
+    # answered by the process-local tier
+    key = f'readyz:{os.getpid()}'
+    value = uuid.uuid4().hex
+    caches[alias].set(key, value, 60)
+    if caches[alias].get(key) != value:
+        raise RuntimeError('cache did not return the value just set')
+
+
+def check_storage():
+    # A lookup, not a write: probes must not leave anything in the uploads
+    # tree (which the asset audit scans) or cost a write on remote storage
+    default_storage.exists(f'readyz-{uuid.uuid4().hex}')
+
+
+def checks():
+    found = {f'database:{alias}': (check_database, alias) for alias in connections}
+    found.update({f'cache:{alias}': (check_cache, alias) for alias in settings.CACHES})
+    found['storage'] = (check_storage,)
+    return found
+
+
+def run_checks():
+    """{'ready': bool, 'checks': {name: {'ok', 'ms'}}, 'warm_up': {phase: ms} or {'ok': False}}"""
+    result = {'ready': True, 'checks': {}}
+    try:
+        result['warm_up'] = {name: round(ms, 2) for name, ms in startup.warm_worker().items()}
+    except Exception:
+        logger.warning('Readiness: worker warm-up failed', exc_info=True)
+        result['ready'] = False
+        result['warm_up'] = {'ok': False}
+    for name, (check, *args) in checks().items():
+        started = time.perf_counter()
+        entry = {'ok': True}
+        try:
+            check(*args)
+        except Exception:
+            logger.warning('Readiness: %s check failed', name, exc_info=True)
+            entry = {'ok': False}
+            result['ready'] = False
+        entry['ms'] = round((time.perf_counter() - started) * 1000, 2)
+        result['checks'][name] = entry
+    return result
+
+
+def readiness():
+    """run_checks(), at most once per READY_CACHE_SECONDS in this process"""
+    with _lock:
+        now = time.monotonic()
+        if (_last['result'] is None or _last['pid'] != os.getpid()
+                or now - _last['at'] >= READY_CACHE_SECONDS):
+            _last.update(at=now, pid=os.getpid(), result=run_checks())
+        return _last['result'], now - _last['at']
+
+
+# ============ VIEWS ============
+@never_cache
+@require_safe
+def healthz(request):
+    return JsonResponse({'status': 'ok', 'pid': os.getpid()})
+
+
+@never_cache
+@require_safe
+def readyz(request):
+    result, age = readiness()
+    return JsonResponse({
+        'status': 'ready' if result['ready'] else 'not ready',
+        'pid': os.getpid(),
+        'age_seconds': round(age, 2),
+        **result,
+    }, status=200 if result['ready'] else 503)
@@ -0,0 +1,401 @@
+# main/log.py
+"""
+Logging pipeline (settings.LOGGING, installed by ``configure``).
+
+    logger -> QueueHandler --(bounded queue)--> listener thread -> console (JSON lines)
+              [sampling,                                        -> SystemLogHandler -> main.write_queue
+               rate limit]                                           (batched SystemLog rows + rollups)
+
+The calling thread only runs the filters and puts the record on a queue;
+formatting, stdout and database writes happen on the listener thread. When
+the queue is full records are dropped (and counted) rather than blocking.
+
+Activity worth keeping in the admin (page views, submissions, downloads) is
+logged with ``log_activity`` (``main.activity.<source>`` loggers, the record
+carries ``source``, ``user_ip`` and ``user_agent``); those records and any
+ERROR from the other loggers become SystemLog rows. SystemLog and its
+DailyLogStat rollups are data, so activity records are never sampled or
+rate limited, and ``main.activity`` logs INFO whatever LOG_LEVEL is.
+
+As in main.write_queue, nothing is handed to other threads with
+settings.INLINE_WRITES (tests): records are handled in the calling thread.
+"""
+import atexit
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+# Levels of SystemLog.log_level; 'success' is INFO with log_level='success'
+SYSTEM_LOG_LEVELS = {logging.DEBUG: 'info', logging.INFO: 'info', logging.WARNING: 'warning'}
+
+# LogRecord attributes that are not ``extra`` fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_quiet = ContextVar('log_quiet', default=False)
+
+
+def configure(config):
+    """LOGGING_CONFIG: dictConfig, then start the QueueHandlers' listeners with their target handlers"""
+    configurator = logging.config.DictConfigurator(config)
+    configurator.configure()
+    handlers = configurator.config.get('handlers', {})
+    for handler in list(handlers.values()):
+        if isinstance(handler, QueueHandler):
+            handler.set_targets([handlers[name] for name in handler.target_names])
+
+
+def log_activity(message, level='info', source='views', request=None, **fields):
+    """Log user-facing activity that should also be kept as a SystemLog row"""
+    if _quiet.get():
+        return
+    levelno = logging.ERROR if level == 'error' else logging.WARNING if level == 'warning' else logging.INFO
+    logging.getLogger(f'main.activity.{source}').log(levelno, message, extra={
+        'source': source,
+        'log_level': level,
+        'user_ip': request.META.get('REMOTE_ADDR', '') if request else '',
+        'user_agent': request.META.get('HTTP_USER_AGENT', '') if request else '',
+        **fields,
+    })
+
+
+@contextmanager
+def quiet():
+    """No activity records in this context (internal requests, e.g. the warm-up render)"""
+    token = _quiet.set(True)
+    try:
+        yield
+    finally:
+        _quiet.reset(token)
+
+
+# ============ FORMATTER ============
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields, exception"""
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+# ============ FILTERS ============
+def _activity(record):
+    """Records from log_activity, which SystemLog must get all of"""
+    return hasattr(record, 'source')
+
+
+def _rates(value):
+    """{'logger': 0.1} or 'logger=0.1,other=0.5' (from an environment variable)"""
+    if isinstance(value, str):
+        value = dict(part.split('=', 1) for part in value.split(',') if '=' in part)
+    return {name.strip(): float(rate) for name, rate in (value or {}).items()}
+
+
+def _match(rates, name):
+    """Setting for the closest configured ancestor of logger ``name``"""
+    while True:
+        if name in rates:
+            return rates[name]
+        if '.' not in name:
+            return rates.get('')
+        name = name.rsplit('.', 1)[0]
+
+
+class SampleFilter(logging.Filter):
+    """Keep a fraction of the records below WARNING per logger (and its children), activity excepted"""
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = _rates(rates)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates or _activity(record):
+            return True
+        rate = _match(self.rates, record.name)
+        return rate is None or rate >= 1 or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger: at most ``per_second`` records on average and
+    ``burst`` at once below ERROR; errors and activity always pass. Drops are
+    counted in ``dropped`` and reported with the next record the logger gets
+    through.
+    """
+
+    def __init__(self, per_second=20.0, burst=100):
+        super().__init__()
+        self.per_second = float(per_second)
+        self.burst = float(burst)
+        self.buckets = {}
+        self.dropped = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR or self.per_second <= 0 or _activity(record):
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self.buckets.get(record.name, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.per_second)
+            if tokens < 1:
+                self.buckets[record.name] = (tokens, now)
+                self.dropped[record.name] = self.dropped.get(record.name, 0) + 1
+                return False
+            self.buckets[record.name] = (tokens - 1, now)
+            dropped = self.dropped.pop(record.name, 0)
+        if dropped:
+            record.rate_limited = dropped
+        return True
+
+
+# ============ QUEUE ============
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a listener thread through a bounded queue. ``targets``
+    are handler names from the same LOGGING config (see ``configure``).
+    Restarts its listener in a forked worker (gunicorn --preload).
+    """
+
+    def __init__(self, targets=(), queue_size=10000, flush_interval=1.0):
+        super().__init__(queue.Queue(queue_size))
+        self.target_names = list(targets)
+        self.targets = []
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def set_targets(self, targets):
+        self.targets = targets
+        _queue_handlers.append(self)
+
+    def prepare(self, record):
+        # Message and traceback are rendered here: args and exc_info may not
+        # be usable once the calling frame has moved on
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if getattr(settings, 'INLINE_WRITES', False):
+            self.handle_inline(record)
+            return
+        if self._pid != os.getpid():
+            self.start()
+        try:
+            self.enqueue(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record):
+        self.queue.put_nowait(record)
+
+    def handle_inline(self, record):
+        for handler in self.targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+                handler.flush()
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # A listener inherited through fork does not run in this process
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = Listener(self.queue, self.targets, self.flush_interval)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far has been handled and flushed"""
+        if self._pid == os.getpid() and self.listener is not None:
+            self.listener.drain(timeout)
+
+    def close(self):
+        if self._pid == os.getpid() and self.listener is not None:
+            self.listener.stop()
+            self._pid = None
+        super().close()
+
+
+class Listener(logging.handlers.QueueListener):
+    """QueueListener that also flushes buffering targets whenever the queue is idle"""
+
+    def __init__(self, log_queue, handlers, flush_interval):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush_handlers()
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            # drain() marker
+            self.flush_handlers()
+            record.set()
+            return
+        super().handle(record)
+
+    def flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                traceback.print_exc()
+
+    def drain(self, timeout=None):
+        marker = threading.Event()
+        try:
+            self.queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+
+_queue_handlers = []
+
+
+def flush(timeout=10):
+    """Hand everything logged so far to the target handlers (SystemLog rows then sit in main.write_queue)"""
+    for handler in _queue_handlers:
+        handler.flush(timeout)
+
+
+@contextmanager
+def console_level(level):
+    """Minimum level of the console (stream) targets inside the block; the test runner keeps stdout to errors"""
+    consoles = [target for handler in _queue_handlers for target in handler.targets
+                if isinstance(target, logging.StreamHandler)]
+    previous = [console.level for console in consoles]
+    for console in consoles:
+        console.setLevel(level)
+    try:
+        yield
+    finally:
+        for console, console_previous in zip(consoles, previous):
+            console.setLevel(console_previous)
+
+
+@atexit.register
+def _drain():
+    flush(timeout=5)
+
+
+# ============ SYSTEMLOG ============
+class SystemLogHandler(logging.handlers.BufferingHandler):
+    """
+    Writes activity records (those with ``source``, see ``log_activity``)
+    and ERRORs from any other logger to SystemLog, in batches of up to
+    ``capacity`` rows written at most ``max_delay`` seconds after their
+    first record (or as soon as the queue goes idle). Batches go through
+    main.write_queue; the DailyLogStat rollup is updated once per batch.
+    """
+
+    # Their failures must not be logged back into the database
+    EXCLUDED = ('main.write_queue', 'main.log', 'django.db')
+
+    def __init__(self, capacity=200, max_delay=2.0):
+        super().__init__(capacity)
+        self.max_delay = max_delay
+        self.first_buffered = 0.0
+
+    def handle(self, record):
+        if not self.selected(record):
+            return False
+        return super().handle(record)
+
+    def selected(self, record):
+        if record.name.startswith(self.EXCLUDED):
+            return False
+        return hasattr(record, 'source') or record.levelno >= logging.ERROR
+
+    def emit(self, record):
+        if not self.buffer:
+            self.first_buffered = time.monotonic()
+        super().emit(record)
+
+    def shouldFlush(self, record):
+        # Under steady traffic the listener is never idle long enough to flush
+        return super().shouldFlush(record) or time.monotonic() - self.first_buffered >= self.max_delay
+
+    def flush(self):
+        self.acquire()
+        try:
+            records, self.buffer = self.buffer, []
+        finally:
+            self.release()
+        if records:
+            from . import write_queue
+            write_queue.enqueue(write_system_logs, [self.row(record) for record in records])
+
+    def row(self, record):
+        message = record.getMessage()
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        return {
+            'log_level': getattr(record, 'log_level', None) or SYSTEM_LOG_LEVELS.get(record.levelno, 'error'),
+            'message': message,
+            'source': getattr(record, 'source', None) or record.name,
+            'user_ip': getattr(record, 'user_ip', None) or None,
+            'user_agent': getattr(record, 'user_agent', '') or '',
+        }
+
+
+def write_system_logs(rows):
+    """
+    One INSERT for the batch, then one rollup bump per (day, level) - what
+    the post_save handler (main/signals.py) does per row
+    """
+    from django.db import transaction
+
+    from .analytics import bump, day_of
+    from .models import DailyLogStat, SystemLog
+
+    # Its own transaction on the writer thread; joins the caller's when
+    # written inline (INLINE_WRITES)
+    with transaction.atomic(savepoint=False):
+        logs = SystemLog.objects.bulk_create([SystemLog(**row) for row in rows])
+        counts = {}
+        for log in logs:
+            key = (day_of(log.created_at), log.log_level)
+            counts[key] = counts.get(key, 0) + 1
+        for (day, level), count in counts.items():
+            bump(DailyLogStat, count, date=day, log_level=level)
+    return len(logs)
@@ -0,0 +1,229 @@
+# main/mailer.py
+"""
+Outbound email queue.
+
+Views only ever insert OutboundEmail rows (a single INSERT, no SMTP on the
+request path). The ``send_outbox`` management command drains the queue in
+batches: messages are grouped by recipient domain, each domain gets at most
+OUTBOX_PER_DOMAIN_CONCURRENCY parallel SMTP connections, and every connection
+is reused for all the messages in its chunk. Failures are retried with
+exponential backoff until OUTBOX_MAX_ATTEMPTS is reached.
+"""
+import logging
+import random
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import OutboundEmail, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+MAX_WORKERS = getattr(settings, 'OUTBOX_MAX_WORKERS', 4)
+PER_DOMAIN_CONCURRENCY = getattr(settings, 'OUTBOX_PER_DOMAIN_CONCURRENCY', 2)
+MAX_ATTEMPTS = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+RETRY_BASE_SECONDS = getattr(settings, 'OUTBOX_RETRY_BASE_SECONDS', 60)
+RETRY_MAX_SECONDS = getattr(settings, 'OUTBOX_RETRY_MAX_SECONDS', 6 * 60 * 60)
+# A claimed message that is still 'sending' after this long belongs to a
+# worker that died; it becomes claimable again.
+LEASE_SECONDS = getattr(settings, 'OUTBOX_LEASE_SECONDS', 10 * 60)
+
+
+# ============ QUEUEING ============
+def build_email(to_email, subject, body, html_body='', kind='other', **links):
+    """Build an unsaved OutboundEmail (use with bulk_create)"""
+    return OutboundEmail(
+        kind=kind,
+        to_email=to_email,
+        recipient_domain=to_email.rsplit('@', 1)[-1].lower(),
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        **links
+    )
+
+
+def queue_email(to_email, subject, body, html_body='', kind='other', **links):
+    """Queue a single email for the background sender"""
+    email = build_email(to_email, subject, body, html_body, kind, **links)
+    email.save()
+    return email
+
+
+def queue_booking_emails(submission):
+    """Queue the confirmation to the client and the notification to the site owner"""
+    site_settings = SiteSettings.objects.first() or SiteSettings()
+    context = {'submission': submission, 'site_settings': site_settings}
+
+    emails = [
+        build_email(
+            submission.email,
+            f"We received your booking request - {site_settings.site_name}",
+            render_to_string('main/emails/booking_confirmation.txt', context),
+            kind='booking_confirmation',
+            contact_submission=submission,
+        )
+    ]
+    notify_to = getattr(settings, 'BOOKING_NOTIFICATION_EMAIL', '') or site_settings.contact_email
+    if notify_to:
+        emails.append(build_email(
+            notify_to,
+            f"New booking request: {submission.full_name} ({submission.organization})",
+            render_to_string('main/emails/booking_notification.txt', context),
+            kind='booking_notification',
+            contact_submission=submission,
+        ))
+    return OutboundEmail.objects.bulk_create(emails)
+
+
+def queue_subscription_welcome(subscription):
+    """Queue the welcome email for a new newsletter subscriber"""
+    site_settings = SiteSettings.objects.first() or SiteSettings()
+    context = {'subscription': subscription, 'site_settings': site_settings}
+    return queue_email(
+        subscription.email,
+        f"Welcome to the {site_settings.site_name} newsletter",
+        render_to_string('main/emails/newsletter_welcome.txt', context),
+        kind='newsletter',
+        subscription=subscription,
+    )
+
+
+# ============ DELIVERY ============
+def retry_delay(attempts):
+    """Exponential backoff with jitter for the given attempt number (1-based)"""
+    delay = min(RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay + random.uniform(0, RETRY_BASE_SECONDS))
+
+
+def claim_batch(limit=BATCH_SIZE):
+    """
+    Atomically move up to ``limit`` due messages to 'sending' and return
+    them. Every claim counts as an attempt, so a message whose lease ran out
+    (the worker died sending it) is not retried forever.
+    """
+    now = timezone.now()
+    OutboundEmail.objects.filter(status='sending', next_attempt_at__lte=now, attempts__gte=MAX_ATTEMPTS).update(
+        status='failed',
+        last_error=f'Worker stopped while sending; gave up after {MAX_ATTEMPTS} attempts',
+    )
+    claimable = Q(status='pending') | Q(status='sending')
+    due_ids = list(
+        OutboundEmail.objects.filter(claimable, next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+    if not due_ids:
+        return []
+
+    # Re-checking the due condition in the UPDATE and tagging rows with a
+    # per-call token means two workers racing for the same ids can never
+    # both walk away with the same message.
+    token = uuid.uuid4().hex
+    OutboundEmail.objects.filter(claimable, id__in=due_ids, next_attempt_at__lte=now).update(
+        status='sending',
+        claim_token=token,
+        attempts=F('attempts') + 1,
+        next_attempt_at=now + timedelta(seconds=LEASE_SECONDS),
+    )
+    return list(OutboundEmail.objects.filter(claim_token=token, status='sending'))
+
+
+def split_by_domain(emails, per_domain=PER_DOMAIN_CONCURRENCY):
+    """Group emails by recipient domain, at most ``per_domain`` chunks per domain"""
+    by_domain = defaultdict(list)
+    for email in emails:
+        by_domain[email.recipient_domain].append(email)
+
+    chunks = []
+    for domain_emails in by_domain.values():
+        lanes = min(per_domain, len(domain_emails))
+        for lane in range(lanes):
+            chunks.append(domain_emails[lane::lanes])
+    return chunks
+
+
+def to_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email.to_email],
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def send_chunk(emails, backend=None):
+    """Send a chunk over one reused connection. Returns [(email, error_or_None)]"""
+    results = []
+    connection = get_connection(backend=backend, fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        return [(email, f"Connection failed: {e}") for email in emails]
+
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([to_message(email, connection)])
+                results.append((email, None))
+            except Exception as e:
+                results.append((email, str(e) or e.__class__.__name__))
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return results
+
+
+def record_results(results):
+    """Persist send results: bulk-mark successes, schedule retries for failures"""
+    now = timezone.now()
+    sent_ids = [email.id for email, error in results if error is None]
+    if sent_ids:
+        OutboundEmail.objects.filter(id__in=sent_ids).update(status='sent', sent_at=now, last_error='')
+
+    failed = 0
+    for email, error in results:
+        if error is None:
+            continue
+        failed += 1
+        # Already counted by claim_batch
+        attempts = email.attempts
+        give_up = attempts >= MAX_ATTEMPTS
+        OutboundEmail.objects.filter(id=email.id).update(
+            status='failed' if give_up else 'pending',
+            last_error=error[:2000],
+            next_attempt_at=now if give_up else now + retry_delay(attempts),
+        )
+        logger.warning(f"Email {email.id} to {email.to_email} failed (attempt {attempts}): {error}")
+    return len(sent_ids), failed
+
+
+def deliver_pending(limit=BATCH_SIZE, backend=None):
+    """Claim and send one batch. Returns a dict of counts"""
+    emails = claim_batch(limit)
+    if not emails:
+        return {'claimed': 0, 'sent': 0, 'failed': 0}
+
+    chunks = split_by_domain(emails)
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(chunks)))) as pool:
+        for chunk_results in pool.map(lambda chunk: send_chunk(chunk, backend), chunks):
+            results.extend(chunk_results)
+
+    sent, failed = record_results(results)
+    return {'claimed': len(emails), 'sent': sent, 'failed': failed}
+
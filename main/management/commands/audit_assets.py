@@ -0,0 +1,70 @@
+# main/management/commands/audit_assets.py
+from django.core.management.base import BaseCommand, CommandError
+
+from main.assets import MB, SIZE_BUDGETS, audit, prune_collected
+
+
+def megabytes(size):
+    return f"{size / MB:.1f} MB"
+
+
+class Command(BaseCommand):
+    help = 'Report duplicate, unreferenced and stale files in static/, STATIC_ROOT and media/ plus size budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Rows to show per section (default: 20)')
+        parser.add_argument('--prune', action='store_true',
+                            help='Delete unreferenced and stale files from STATIC_ROOT (sources are left alone)')
+        parser.add_argument('--fail-on-budget', action='store_true', help='Exit with an error when a budget is exceeded')
+
+    def handle(self, *args, **options):
+        top = options['top']
+        report = audit()
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Duplicates (same content)'))
+        wasted = 0
+        for group in report['duplicates']:
+            wasted += group[0]['size'] * (len(group) - 1)
+        for group in report['duplicates'][:top]:
+            self.stdout.write(f"  {megabytes(group[0]['size'])} x {len(group)}")
+            for entry in group:
+                self.stdout.write(f"      {entry['root']}/{entry['name']}")
+        self.stdout.write(f"  {len(report['duplicates'])} groups, {megabytes(wasted)} in redundant copies")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Static files not referenced by any template, stylesheet or script'))
+        unreferenced = sorted(report['unreferenced_static'], key=lambda entry: entry['size'], reverse=True)
+        for entry in unreferenced[:top]:
+            self.stdout.write(f"  {megabytes(entry['size']):>9}  {entry['name']}")
+        self.stdout.write(f"  {len(unreferenced)} files, {megabytes(sum(e['size'] for e in unreferenced))}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Media files not stored in any file field'))
+        orphans = sorted(report['unreferenced_media'], key=lambda entry: entry['size'], reverse=True)
+        for entry in orphans[:top]:
+            self.stdout.write(f"  {megabytes(entry['size']):>9}  {entry['name']}")
+        self.stdout.write(f"  {len(orphans)} files, {megabytes(sum(e['size'] for e in orphans))}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Collected files without a source (stale)'))
+        for name in report['stale_collected'][:top]:
+            self.stdout.write(f"  {name}")
+        self.stdout.write(f"  {len(report['stale_collected'])} files")
+
+        if options['prune']:
+            names = [entry['name'] for entry in unreferenced] + report['stale_collected']
+            freed = prune_collected(names, report['collected'])
+            report['totals']['collected'] -= freed
+            self.stdout.write(self.style.SUCCESS(f"Pruned {megabytes(freed)} from STATIC_ROOT"))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Size budgets'))
+        over = []
+        for root, size in report['totals'].items():
+            budget = SIZE_BUDGETS.get(root)
+            status = ''
+            if budget:
+                status = f"/ {megabytes(budget)}"
+                if size > budget:
+                    over.append(root)
+                    status = self.style.ERROR(f"{status}  OVER BUDGET")
+            self.stdout.write(f"  {root:<10}{megabytes(size):>10} {status}")
+
+        if over and options['fail_on_budget']:
+            raise CommandError(f"Size budget exceeded: {', '.join(over)}")
@@ -0,0 +1,105 @@
+# main/management/commands/bench_admin_changelist.py
+import time
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from main.admin_fragments import render_badge
+from main.models import AboutSection, FreeEbook, GalleryImage, NewsletterContent, Service, Testimonial
+
+
+def build_rows(model, count):
+    if model is FreeEbook:
+        return [FreeEbook(title=f"Bench eBook {i}", ebook_file='ebooks/Leading with a Heart Ebook .pdf',
+                          cover_image='ebook_covers/IA25_Speaker_Powerpoint_Editable_LINKEDIN.png',
+                          download_count=i, is_active=False) for i in range(count)]
+    if model is Service:
+        return [Service(title=f"Bench service {i}", service_type='keynote', description='x',
+                        topics='Leadership, Sales, Hospitality, Culture') for i in range(count)]
+    if model is Testimonial:
+        return [Testimonial(client_name=f"Client {i}", position='CEO', company=f"Company {i % 10}",
+                            content='Great') for i in range(count)]
+    if model is GalleryImage:
+        return [GalleryImage(title=f"Bench image {i}", image='gallery/IMG_20251219_170821.jpg') for i in range(count)]
+    if model is AboutSection:
+        return [AboutSection(title=f"About {i}", image='about/hom.jpeg') for i in range(count)]
+    if model is NewsletterContent:
+        return [NewsletterContent(title=f"Issue {i}", image='newsletter/End.jpg',
+                                  pdf_file='newsletter_pdfs/FUSION-FORCE_1.pdf') for i in range(count)]
+    raise ValueError(model)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark admin changelist rendering with cold and warm fragment caches (all data is rolled back)'
+
+    MODELS = [FreeEbook, Service, Testimonial, GalleryImage, AboutSection, NewsletterContent]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=300, help='Rows per changelist')
+        parser.add_argument('--repeat', type=int, default=5, help='Renders per measurement')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        factory = RequestFactory()
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_superuser('bench-admin', 'bench@example.com', 'bench')
+
+            self.stdout.write(
+                f"{'Changelist':<24}{'page cold':>11}{'page warm':>11}{'fragments cold':>16}{'fragments warm':>16}"
+            )
+            for model in self.MODELS:
+                model.objects.bulk_create(build_rows(model, rows))
+                model_admin = admin.site._registry[model]
+                original_per_page = model_admin.list_per_page
+                model_admin.list_per_page = rows
+
+                def render():
+                    request = factory.get(f'/admin/{model._meta.app_label}/{model._meta.model_name}/')
+                    request.user = user
+                    request._messages = CookieStorage(request)
+                    model_admin.changelist_view(request).render()
+
+                # The list_display methods alone, without the rest of the admin page
+                objects = list(model.objects.all())
+                methods = [getattr(model_admin, name) for name in model_admin.list_display
+                           if isinstance(name, str) and hasattr(model_admin, name)]
+
+                def render_fragments():
+                    for obj in objects:
+                        for method in methods:
+                            method(obj)
+
+                try:
+                    page_cold = self.measure(render, repeat, clear=True)
+                    page_warm = self.measure(render, repeat, clear=False)
+                    fragments_cold = self.measure(render_fragments, repeat, clear=True)
+                    fragments_warm = self.measure(render_fragments, repeat, clear=False)
+                finally:
+                    model_admin.list_per_page = original_per_page
+
+                self.stdout.write(
+                    f"{model._meta.verbose_name_plural.title():<24}{page_cold:>9.1f}ms{page_warm:>9.1f}ms"
+                    f"{fragments_cold:>14.1f}ms{fragments_warm:>14.1f}ms"
+                )
+
+            transaction.set_rollback(True)
+
+    def measure(self, render, repeat, clear):
+        """Average ms per call. Warm runs are primed with one untimed call"""
+        if not clear:
+            render()
+        total = 0
+        for _ in range(repeat):
+            if clear:
+                cache.clear()
+                render_badge.cache_clear()
+            started = time.perf_counter()
+            render()
+            total += time.perf_counter() - started
+        return total * 1000 / repeat
@@ -0,0 +1,100 @@
+# main/management/commands/bench_async_views.py
+import asyncio
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.benchmarks.server import SERVERS, gunicorn, percentile, prepare, scratch_env
+
+
+async def fetch(port, path, timeout):
+    """One GET on a fresh connection; returns the status code"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    return int(response.split(b' ', 2)[1]) if response.startswith(b'HTTP/') else 0
+
+
+async def client(port, path, deadline, timeout, results):
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            status = await fetch(port, path, timeout)
+        except (OSError, asyncio.TimeoutError):
+            status = 0
+        elapsed = (time.perf_counter() - started) * 1000
+        if status == 200:
+            results['latencies'].append(elapsed)
+        else:
+            results['errors'] += 1
+
+
+async def slow_client(port, deadline):
+    """Sends its request headers one line per second, like a client on a bad link"""
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\n")
+        while time.monotonic() < deadline:
+            await asyncio.sleep(1)
+            writer.write(b"X-Slow: 1\r\n")
+            await writer.drain()
+        writer.close()
+    except OSError:
+        pass
+
+
+async def load(port, path, concurrency, slow, seconds, timeout):
+    results = {'latencies': [], 'errors': 0}
+    deadline = time.monotonic() + seconds
+    slow_tasks = [asyncio.create_task(slow_client(port, deadline)) for _ in range(slow)]
+    await asyncio.sleep(0.2 if slow else 0)
+    await asyncio.gather(*(client(port, path, deadline, timeout, results) for _ in range(concurrency)))
+    await asyncio.gather(*slow_tasks)
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Load-test the home page under gunicorn sync workers vs uvicorn workers with async views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent clients (default: 50)')
+        parser.add_argument('--slow-clients', type=int, default=0,
+                            help='Extra clients that trickle their headers for the whole run (default: 0)')
+        parser.add_argument('--seconds', type=float, default=10.0, help='Run time per mode (default: 10)')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (default: 2)')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request client timeout (default: 30)')
+        parser.add_argument('--path', default='/', help='Path to request (default: /)')
+        parser.add_argument('--modes', default='sync,async', help=f"Comma-separated, of {', '.join(SERVERS)}")
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        self.stdout.write(
+            f"{options['workers']} workers, {options['concurrency']} clients"
+            f" + {options['slow_clients']} slow, {options['seconds']:g}s per mode, GET {options['path']}\n"
+        )
+        self.stdout.write(f"{'mode':<8}{'req/s':>9}{'p50':>10}{'p90':>10}{'p99':>10}{'errors':>8}")
+        with tempfile.TemporaryDirectory() as directory:
+            env = scratch_env(directory)
+            prepare(env)
+            for mode in modes:
+                results = self.run_mode(mode, dict(env, ASYNC_VIEWS=str(mode == 'async')), options)
+                latencies = results['latencies']
+                self.stdout.write(
+                    f"{mode:<8}{len(latencies) / options['seconds']:>9.1f}"
+                    f"{percentile(latencies, 0.5):>8.1f}ms{percentile(latencies, 0.9):>8.1f}ms"
+                    f"{percentile(latencies, 0.99):>8.1f}ms{results['errors']:>8}"
+                )
+
+    def run_mode(self, mode, env, options):
+        with gunicorn(env, mode, options['workers']) as (port, _):
+            # One request per worker outside the measurement (first-request costs)
+            asyncio.run(load(port, options['path'], options['workers'], 0, 0.5, options['timeout']))
+            return asyncio.run(load(
+                port, options['path'], options['concurrency'], options['slow_clients'],
+                options['seconds'], options['timeout'],
+            ))
@@ -0,0 +1,75 @@
+# main/management/commands/bench_home_sections.py
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from main.log import quiet
+from main.models import AboutSection, FreeEbook, GalleryImage, HeroImage, NewsletterContent, SiteSettings, Testimonial
+from main.sections import SECTION_MODELS, SECTION_STATS
+from main.views import home
+
+
+def seed(testimonials):
+    SiteSettings.objects.get_or_create(site_name='Fusion Force LLC')
+    HeroImage.objects.create(title='Bench hero', image='hero/hom.jpeg')
+    AboutSection.objects.create(title='Bench about', image='about/hom.jpeg', content='Bench ' * 200,
+                                bullet_points='One\nTwo\nThree')
+    GalleryImage.objects.bulk_create([
+        GalleryImage(title=f"Bench image {i}", image='gallery/IMG_20251219_170821.jpg', description='Bench')
+        for i in range(6)
+    ])
+    Testimonial.objects.bulk_create([
+        Testimonial(client_name=f"Client {i}", position='CEO', company=f"Company {i}", content='Great ' * 40)
+        for i in range(testimonials)
+    ])
+    NewsletterContent.objects.create(image='newsletter/End.jpg', pdf_file='newsletter_pdfs/FUSION-FORCE_1.pdf')
+    FreeEbook.objects.create(title='Bench eBook', ebook_file='ebooks/Leading with a Heart Ebook .pdf')
+
+
+class Command(BaseCommand):
+    help = 'Measure home page render time per cached section, cold vs warm (all data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Cold/warm render pairs (default: 10)')
+        parser.add_argument('--testimonials', type=int, default=12, help='Testimonials to seed (default: 12)')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        factory = RequestFactory()
+
+        def render():
+            request = factory.get('/')
+            # No page-view records for the benchmark's own requests
+            with quiet():
+                started = time.perf_counter()
+                home(request)
+                return (time.perf_counter() - started) * 1000
+
+        with transaction.atomic():
+            seed(options['testimonials'])
+            render()  # template compilation and first-query costs are not part of the comparison
+            SECTION_STATS.clear()
+            cold = warm = 0
+            for _ in range(repeat):
+                cache.clear()
+                cold += render()
+                warm += render()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'Section':<14}{'miss':>10}{'hit':>10}{'saved':>10}")
+        total_saved = 0
+        for name in SECTION_MODELS:
+            stats = SECTION_STATS.get(name)
+            if not stats or not stats['misses'] or not stats['hits']:
+                continue
+            miss = stats['miss_ms'] / stats['misses']
+            hit = stats['hit_ms'] / stats['hits']
+            total_saved += miss - hit
+            self.stdout.write(f"{name:<14}{miss:>8.2f}ms{hit:>8.2f}ms{miss - hit:>8.2f}ms")
+        self.stdout.write(f"{'sections':<14}{'':>20}{total_saved:>8.2f}ms")
+        self.stdout.write(
+            f"\nWhole view: cold {cold / repeat:.1f}ms, warm {warm / repeat:.1f}ms per request"
+        )
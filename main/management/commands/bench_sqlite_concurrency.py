@@ -0,0 +1,154 @@
+# main/management/commands/bench_sqlite_concurrency.py
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+
+MODES = {
+    # Django's backend, default (rollback) journal, every write inline
+    'stock': {'SQLITE_WAL': 'False', 'DB_WRITE_QUEUE': 'False'},
+    # main.db_backends.sqlite3 + main.write_queue
+    'tuned': {'SQLITE_WAL': 'True', 'DB_WRITE_QUEUE': 'True'},
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def page_reads():
+    """The queries of a home page render"""
+    from main.models import GalleryImage, HeroImage, SiteSettings, Testimonial
+    SiteSettings.objects.first()
+    list(HeroImage.objects.filter(is_active=True).order_by('order'))
+    list(GalleryImage.objects.filter(is_active=True).order_by('order')[:6])
+    list(Testimonial.objects.filter(is_active=True).order_by('order'))
+
+
+def page_view_log(worker):
+    from main.views import log_system_action
+    log_system_action(f"Bench page view from worker {worker}", source='bench')
+
+
+def admin_write(worker):
+    """A read-then-write transaction, like an admin save with its signal handlers"""
+    from main.models import ContactSubmission
+    with transaction.atomic():
+        ContactSubmission.objects.filter(status='new').count()
+        ContactSubmission.objects.create(
+            full_name=f"Bench {worker}", email='bench@example.com', organization='Bench',
+            event_type='workshop', event_details='Bench',
+        )
+
+
+class Command(BaseCommand):
+    help = 'Hammer one SQLite file from several processes: stock journaling vs WAL + write queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help='Worker processes (default: 4)')
+        parser.add_argument('--seconds', type=float, default=5.0, help='Run time per mode (default: 5)')
+        parser.add_argument('--log-ratio', type=float, default=0.5,
+                            help='Share of operations that are page views writing a SystemLog row (default: 0.5)')
+        parser.add_argument('--admin-ratio', type=float, default=0.05,
+                            help='Share of operations that are admin write transactions (default: 0.05)')
+        parser.add_argument('--modes', default='stock,tuned', help=f"Comma-separated, of {', '.join(MODES)}")
+        parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+        parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['worker'] is not None:
+            return self.run_worker(options)
+
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        self.stdout.write(
+            f"{options['processes']} processes x {options['seconds']:g}s, "
+            f"{options['log_ratio']:.0%} logged page views, {options['admin_ratio']:.0%} admin writes, rest reads\n"
+        )
+        self.stdout.write(
+            f"{'mode':<8}{'ops/s':>9}{'read p50':>10}{'read p99':>10}{'log p99':>10}"
+            f"{'admin p99':>11}{'locked':>8}{'log rows':>10}"
+        )
+        for mode in modes:
+            result = self.run_mode(mode, options)
+            self.stdout.write(
+                f"{mode:<8}{result['ops'] / options['seconds']:>9.0f}"
+                f"{percentile(result['read'], 0.5):>8.2f}ms{percentile(result['read'], 0.99):>8.2f}ms"
+                f"{percentile(result['log'], 0.99):>8.2f}ms{percentile(result['admin'], 0.99):>9.2f}ms"
+                f"{result['locked']:>8}{result['log_rows']:>6}/{result['logged']}"
+            )
+
+    def run_mode(self, mode, options):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, **MODES[mode], SQLITE_PATH=os.path.join(directory, 'bench.sqlite3'), DJANGO_ENV='prod')
+            env.pop('DATABASE_URL', None)
+            manage = [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py')]
+            subprocess.run(manage + ['migrate', '--noinput', '-v', '0'], env=env, check=True)
+
+            start_at = time.time() + 2  # every worker has finished django.setup() by then
+            workers = [
+                subprocess.Popen(
+                    manage + [
+                        'bench_sqlite_concurrency', '--worker', str(index), '--start-at', str(start_at),
+                        '--seconds', str(options['seconds']), '--log-ratio', str(options['log_ratio']),
+                        '--admin-ratio', str(options['admin_ratio']),
+                    ],
+                    env=env, stdout=subprocess.PIPE, text=True,
+                )
+                for index in range(options['processes'])
+            ]
+            results = [json.loads(worker.communicate()[0].strip().splitlines()[-1]) for worker in workers]
+
+            with sqlite3.connect(env['SQLITE_PATH']) as db:
+                log_rows = db.execute("SELECT COUNT(*) FROM main_systemlog WHERE source = 'bench'").fetchone()[0]
+
+        merged = {'read': [], 'log': [], 'admin': [], 'ops': 0, 'locked': 0, 'logged': 0, 'log_rows': log_rows}
+        for result in results:
+            for key in ('read', 'log', 'admin'):
+                merged[key].extend(result[key])
+            for key in ('ops', 'locked', 'logged'):
+                merged[key] += result[key]
+        return merged
+
+    def run_worker(self, options):
+        from main import log, write_queue
+
+        worker = options['worker']
+        timings = {'read': [], 'log': [], 'admin': []}
+        counts = {'ops': 0, 'locked': 0, 'logged': 0}
+        rng = random.Random(worker)
+        connection.ensure_connection()
+        time.sleep(max(options['start_at'] - time.time(), 0))
+
+        deadline = time.monotonic() + options['seconds']
+        while time.monotonic() < deadline:
+            roll = rng.random()
+            if roll < options['admin_ratio']:
+                kind, operation = 'admin', lambda: admin_write(worker)
+            elif roll < options['admin_ratio'] + options['log_ratio']:
+                kind, operation = 'log', lambda: page_reads() or page_view_log(worker)
+                counts['logged'] += 1
+            else:
+                kind, operation = 'read', page_reads
+            started = time.perf_counter()
+            try:
+                operation()
+            except OperationalError:
+                counts['locked'] += 1
+            timings[kind].append((time.perf_counter() - started) * 1000)
+            counts['ops'] += 1
+        # Log records first: their SystemLog rows are then in the write queue
+        log.flush(timeout=30)
+        write_queue.flush(timeout=30)
+        self.stdout.write(json.dumps({**timings, **counts}))
@@ -0,0 +1,19 @@
+# main/management/commands/build_assets.py
+from django.core.management.base import BaseCommand
+
+from main.assets import build
+
+
+class Command(BaseCommand):
+    help = 'Bundle and hash the landing page assets into static/dist, minify the CSS and extract critical CSS'
+
+    def handle(self, *args, **options):
+        manifest = build()
+        for name, sizes in manifest['sizes'].items():
+            line = f"{name:<14}{sizes['bundle'] / 1024:>9.1f} KB"
+            if 'sources' in sizes:
+                line += f"  (sources {sizes['sources'] / 1024:.1f} KB)"
+            if name in manifest['bundles']:
+                line += f"  -> {manifest['bundles'][name]}"
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS('Assets built'))
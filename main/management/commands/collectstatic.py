@@ -0,0 +1,22 @@
+# main/management/commands/collectstatic.py
+from django.conf import settings
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+from django.core.management import call_command
+
+
+class Command(CollectStaticCommand):
+    """collectstatic that builds the asset bundles first, so static/dist is always collected fresh"""
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--skip-build', action='store_true', help='Collect without running build_assets')
+
+    def set_options(self, **options):
+        super().set_options(**options)
+        # Source files that are never served (see audit_assets)
+        self.ignore_patterns += getattr(settings, 'STATICFILES_IGNORE_PATTERNS', [])
+
+    def handle(self, **options):
+        if not options['skip_build'] and not options['dry_run']:
+            call_command('build_assets', verbosity=options['verbosity'], stdout=self.stdout)
+        return super().handle(**options)
@@ -0,0 +1,14 @@
+# main/management/commands/rebuild_pipeline.py
+from django.core.management.base import BaseCommand
+
+from main.pipeline import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Backfill missing pipeline events and recompute the funnel and response-time rollups'
+
+    def handle(self, *args, **options):
+        backfilled, arrivals = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Pipeline rebuilt: {backfilled} events backfilled, {arrivals} stage arrivals counted"
+        ))
@@ -0,0 +1,28 @@
+# main/management/commands/rollup_analytics.py
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from main.analytics import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the analytics rollup tables from the raw tables for a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='Rebuild the last N days (default: 2)')
+        parser.add_argument('--since', help='Rebuild from this date (YYYY-MM-DD) up to today')
+
+    def handle(self, *args, **options):
+        end = timezone.localdate()
+        if options['since']:
+            try:
+                start = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+        else:
+            start = end - timedelta(days=options['days'] - 1)
+
+        rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f"Analytics rebuilt for {start} to {end}"))
@@ -0,0 +1,146 @@
+# main/management/commands/run_benchmarks.py
+import json
+import os
+import secrets
+import sqlite3
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.benchmarks import driver
+from main.benchmarks.server import SERVERS, gunicorn, prepare, scratch_env
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def active_ebook_id(sqlite_path):
+    with sqlite3.connect(sqlite_path) as connection:
+        row = connection.execute('SELECT id FROM main_freeebook WHERE is_active ORDER BY id LIMIT 1').fetchone()
+    return row[0] if row else None
+
+
+class Command(BaseCommand):
+    help = ('Load-test the public endpoints (home, contact, newsletter, eBook download) and write a JSON result '
+            'that can be compared with a baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Benchmark a running server instead of starting gunicorn on a scratch database')
+        parser.add_argument('--ebook-id', type=int, help='eBook for the download endpoint (with --url)')
+        parser.add_argument('--profile-token', default=None,
+                            help='PROFILING_TOKEN of the server at --url, to record queries per request')
+        parser.add_argument('--sqlite-path',
+                            help='Serve an already seeded SQLite database (see seed_benchmark_data) instead of a new one')
+        parser.add_argument('--scale', type=float, default=0.1,
+                            help='seed_benchmark_data --scale for the scratch database (default: 0.1)')
+        parser.add_argument('--server', default='sync', choices=list(SERVERS), help='Worker type (default: sync)')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (default: 2)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients (default: 10)')
+        parser.add_argument('--seconds', type=float, default=30.0, help='Measured run time (default: 30)')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured run time first (default: 2)')
+        parser.add_argument('--mix', default=','.join(f"{name}={weight}" for name, weight in driver.DEFAULT_MIX.items()),
+                            help='Weighted endpoint mix (default: %(default)s)')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request client timeout (default: 30)')
+        parser.add_argument('--output', help='Write the JSON result to this file')
+        parser.add_argument('--compare', help='Baseline JSON result to compare against')
+        parser.add_argument('--max-regression', type=float, default=10.0,
+                            help='Allowed p95/p99 latency growth and throughput drop in %% (default: 10)')
+
+    def handle(self, *args, **options):
+        try:
+            mix = driver.parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        config = {
+            key: options[key]
+            for key in ('url', 'server', 'workers', 'concurrency', 'seconds', 'warmup', 'scale', 'sqlite_path')
+        }
+        config['mix'] = mix
+        if options['url']:
+            config.pop('server'), config.pop('workers'), config.pop('scale'), config.pop('sqlite_path')
+            token = options['profile_token'] if options['profile_token'] is not None else settings.PROFILING_TOKEN
+            results = self.run(driver.Target(options['url'], options['ebook_id'], token, options['timeout']), mix, options)
+        else:
+            config.pop('url')
+            results = self.run_local(mix, options)
+
+        result = {
+            'version': driver.RESULT_VERSION,
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'config': config,
+            **results,
+        }
+        self.report(result)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(result, handle, indent=2)
+            self.stdout.write(f"Result written to {options['output']}")
+        if options['compare']:
+            self.check_baseline(result, options)
+
+    def run(self, target, mix, options):
+        if 'download' in mix and target.ebook_id is None:
+            self.stderr.write('No --ebook-id: leaving the download endpoint out')
+            mix.pop('download')
+        try:
+            return driver.run(target, mix, options['concurrency'], options['seconds'], options['warmup'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+    def run_local(self, mix, options):
+        token = secrets.token_hex(16)
+        with tempfile.TemporaryDirectory() as directory:
+            sqlite_path = os.path.abspath(options['sqlite_path']) if options['sqlite_path'] else None
+            env = scratch_env(
+                directory, sqlite_path, PROFILING_TOKEN=token,
+                ASYNC_VIEWS=str(options['server'] == 'async'),
+            )
+            if sqlite_path:
+                prepare(env)
+            else:
+                self.stdout.write(f"Seeding a scratch database (--scale {options['scale']:g})...")
+                prepare(env, ['seed_benchmark_data', '--scale', str(options['scale'])])
+            target = driver.Target('http://127.0.0.1', active_ebook_id(env['SQLITE_PATH']), token, options['timeout'])
+            with gunicorn(env, options['server'], options['workers']) as (port, _):
+                target.port = port
+                return self.run(target, mix, options)
+
+    def report(self, result):
+        self.stdout.write(
+            f"\n{'endpoint':<12}{'requests':>9}{'errors':>8}{'req/s':>9}"
+            f"{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}"
+        )
+        for name, stats in [*result['endpoints'].items(), ('total', result['total'])]:
+            latency = stats['latency_ms']
+            queries = stats['queries_per_request']
+            self.stdout.write(
+                f"{name:<12}{stats['requests']:>9}{stats['errors']:>8}{stats['rps']:>9.1f}"
+                f"{latency['p50']:>8.1f}ms{latency['p95']:>8.1f}ms{latency['p99']:>8.1f}ms"
+                f"{'-' if queries is None else f'{queries:g}':>9}"
+            )
+
+    def check_baseline(self, result, options):
+        with open(options['compare']) as handle:
+            baseline = json.load(handle)
+        rows = driver.compare(baseline, result, options['max_regression'])
+        self.stdout.write(f"\nCompared with {options['compare']} ({baseline.get('commit') or 'unknown commit'})")
+        for name, metric, old, new, change, regressed in rows:
+            line = f"  {name:<12}{metric:<9}{old:>10g} -> {new:<10g}{change:+.1f}%"
+            self.stdout.write(self.style.ERROR(line + '  REGRESSION') if regressed else line)
+        regressions = [row for row in rows if row[-1]]
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) over the baseline")
+        self.stdout.write(self.style.SUCCESS('No regressions'))
@@ -0,0 +1,32 @@
+# main/management/commands/seed_benchmark_data.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.benchmarks.fixtures import SIZES, seed
+from main.models import Service, SystemLog
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with benchmark data: page content plus production-like log and subscriber volume'
+
+    def add_arguments(self, parser):
+        for name, default in SIZES.items():
+            parser.add_argument(f'--{name}', type=int, default=None, help=f"Rows to create (default: {default:,})")
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Multiply every default size, e.g. 0.01 for a quick local run (default: 1)')
+        parser.add_argument('--append', action='store_true', help='Seed even if the database already has content')
+
+    def handle(self, *args, **options):
+        if not options['append'] and (Service.objects.exists() or SystemLog.objects.exists()):
+            raise CommandError('The database already has content; use a scratch database or pass --append')
+
+        sizes = {
+            name: options[name] if options[name] is not None else max(1, int(default * options['scale']))
+            for name, default in SIZES.items()
+        }
+        self.stdout.write(', '.join(f"{name}={count:,}" for name, count in sizes.items()))
+
+        started = time.monotonic()
+        ebook_id = seed(sizes, progress=lambda step: self.stdout.write(f"  {step} ({time.monotonic() - started:.1f}s)"))
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {time.monotonic() - started:.1f}s; eBook id {ebook_id}"))
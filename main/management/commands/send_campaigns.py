@@ -0,0 +1,54 @@
+# main/management/commands/send_campaigns.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.campaigns import DELIVERY_PAGE_SIZE, MAX_WORKERS, deliver_campaign
+from main.models import NewsletterCampaign
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued newsletter campaigns (resumes interrupted ones)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaign', type=int, help='Deliver only this campaign id')
+        parser.add_argument('--page-size', type=int, default=DELIVERY_PAGE_SIZE)
+        parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for queued campaigns')
+        parser.add_argument('--interval', type=float, default=15.0)
+        parser.add_argument('--backend', default=None, help='Override EMAIL_BACKEND')
+
+    def handle(self, *args, **options):
+        if options['campaign']:
+            try:
+                campaigns = [NewsletterCampaign.objects.get(pk=options['campaign'])]
+            except NewsletterCampaign.DoesNotExist:
+                raise CommandError(f"Campaign {options['campaign']} does not exist")
+            for campaign in campaigns:
+                self.deliver(campaign, options)
+            return
+
+        while True:
+            campaigns = list(NewsletterCampaign.objects.filter(status__in=['queued', 'sending']).order_by('created_at'))
+            for campaign in campaigns:
+                self.deliver(campaign, options)
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def deliver(self, campaign, options):
+        self.stdout.write(f"Delivering campaign {campaign.pk}: {campaign.subject}")
+        totals = deliver_campaign(
+            campaign,
+            page_size=options['page_size'],
+            workers=options['workers'],
+            backend=options['backend'],
+        )
+        if totals is None:
+            self.stdout.write(self.style.WARNING('  skipped, another worker holds the lock'))
+            return
+        campaign.refresh_from_db()
+        self.stdout.write(self.style.SUCCESS(
+            f"  {totals['sent']} sent, {totals['failed']} failed this run "
+            f"({campaign.processed_count}/{campaign.total_recipients} overall, {campaign.get_status_display()})"
+        ))
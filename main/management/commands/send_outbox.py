@@ -0,0 +1,35 @@
+# main/management/commands/send_outbox.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.mailer import BATCH_SIZE, deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbound emails (run with --loop as a worker process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=BATCH_SIZE, help='Messages per batch')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--backend', default=None, help='Override EMAIL_BACKEND (e.g. django.core.mail.backends.filebased.EmailBackend)')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            stats = deliver_pending(limit=options['limit'], backend=options['backend'])
+            total_sent += stats['sent']
+            total_failed += stats['failed']
+            if stats['claimed']:
+                self.stdout.write(
+                    f"Claimed {stats['claimed']}, sent {stats['sent']}, failed {stats['failed']}"
+                )
+                continue
+
+            if not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Outbox drained: {total_sent} sent, {total_failed} failed"
+                ))
+                return
+            time.sleep(options['interval'])
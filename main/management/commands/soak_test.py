@@ -0,0 +1,107 @@
+import json
+import sys
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.benchmarks import driver, soak
+from main.benchmarks.server import gunicorn, prepare, scratch_env
+from main.management.commands.run_benchmarks import active_ebook_id
+
+
+class Command(BaseCommand):
+    help = ('Send a fixed number of requests to gunicorn (gunicorn.conf.py, worker recycling included) on a '
+            'scratch database and check that worker memory stays flat')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100_000, help='Requests to send (default: 100000)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients (default: 8)')
+        parser.add_argument('--workers', type=int, help='gunicorn workers (default: sized by gunicorn.conf.py)')
+        parser.add_argument('--max-requests', type=int,
+                            help='Recycle workers after this many requests (default: gunicorn.conf.py, 0: never)')
+        parser.add_argument('--async', action='store_true', dest='async_views', help='ASYNC_VIEWS=True (uvicorn workers)')
+        parser.add_argument('--scale', type=float, default=0.05,
+                            help='seed_benchmark_data --scale for the scratch database (default: 0.05)')
+        parser.add_argument('--mix', default=','.join(f"{name}={weight}" for name, weight in driver.DEFAULT_MIX.items()),
+                            help='Weighted endpoint mix (default: %(default)s)')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between memory samples (default: 2)')
+        parser.add_argument('--max-growth-mb', type=float, default=16.0,
+                            help='Allowed growth of the mean worker RSS after warm-up (default: 16)')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request client timeout (default: 30)')
+        parser.add_argument('--output', help='Write the JSON result to this file')
+
+    def handle(self, *args, **options):
+        if not sys.platform.startswith('linux'):
+            raise CommandError('The soak test reads worker memory from /proc (Linux only)')
+        try:
+            mix = driver.parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        server_args = []
+        if options['workers']:
+            server_args += ['--workers', str(options['workers'])]
+        if options['max_requests'] is not None:
+            server_args += ['--max-requests', str(options['max_requests'])]
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = scratch_env(directory, ASYNC_VIEWS=str(options['async_views']))
+            self.stdout.write(f"Seeding a scratch database (--scale {options['scale']:g})...")
+            prepare(env, ['seed_benchmark_data', '--scale', str(options['scale'])])
+            target = driver.Target('http://127.0.0.1', active_ebook_id(env['SQLITE_PATH']), '', options['timeout'])
+            if target.ebook_id is None:
+                mix.pop('download', None)
+
+            progress = {'done': 0}
+            kind = 'async' if options['async_views'] else 'sync'
+            with gunicorn(env, kind, args=server_args) as (port, server):
+                target.port = port
+                sampler = soak.MemorySampler(server.pid, progress, options['interval'])
+                sampler.start()
+                self.stdout.write(f"Sending {options['requests']} requests with {options['concurrency']} clients...")
+                try:
+                    load = soak.run(target, mix, options['concurrency'], options['requests'], progress)
+                finally:
+                    sampler.stop()
+
+        memory = soak.summarize(sampler.samples)
+        result = {'config': {key: options[key] for key in (
+            'requests', 'concurrency', 'workers', 'max_requests', 'async_views', 'scale', 'max_growth_mb')},
+            **load, 'memory': memory}
+        self.report(result)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(result, handle, indent=2)
+            self.stdout.write(f"Result written to {options['output']}")
+
+        if load['total']['errors']:
+            raise CommandError(f"{load['total']['errors']} request(s) failed: {load['total']['statuses']}")
+        if memory['growth_mb'] > options['max_growth_mb']:
+            raise CommandError(
+                f"Worker RSS grew {memory['growth_mb']} MB after warm-up (limit {options['max_growth_mb']:g} MB)"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Worker RSS stable ({memory['growth_mb']:+} MB after warm-up)"))
+
+    def report(self, result):
+        memory = result['memory']
+        self.stdout.write(f"\n{'requests':>9}{'workers':>9}{'master':>10}{'mean':>10}{'max':>10}")
+        rows = memory['samples']
+        # About 20 lines whatever the run length
+        shown = rows[::max(1, len(rows) // 20)]
+        if rows and shown[-1] is not rows[-1]:
+            shown.append(rows[-1])
+        for row in shown:
+            self.stdout.write(
+                f"{row['requests']:>9}{row['workers']:>9}{row['master_mb']:>8.1f}MB"
+                f"{row['worker_mean_mb']:>8.1f}MB{row['worker_max_mb']:>8.1f}MB"
+            )
+        total = result['total']
+        self.stdout.write(
+            f"\n{total['requests']} requests in {result['duration_s']}s ({total['rps']} req/s), "
+            f"{total['errors']} errors, p99 {total['latency_ms']['p99']}ms; "
+            f"{memory['workers_recycled']} worker(s) recycled"
+        )
+        self.stdout.write(
+            f"Mean worker RSS: {memory['settled_mb']} MB after warm-up, {memory['final_mb']} MB at the end"
+        )
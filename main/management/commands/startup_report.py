@@ -0,0 +1,79 @@
+# main/management/commands/startup_report.py
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Imports the WSGI module in a fresh interpreter and prints its phase timings
+PROBE = (
+    "import json, time\n"
+    "started = time.perf_counter()\n"
+    "from fusion_force import wsgi\n"
+    "timings = dict(wsgi.STARTUP_TIMINGS)\n"
+    "timings['import_wsgi'] = (time.perf_counter() - started) * 1000\n"
+    "print('STARTUP_TIMINGS ' + json.dumps(timings))\n"
+)
+
+PHASES = ['settings', 'apps_ready', 'middleware', 'urls', 'templates', 'static_manifest', 'total', 'import_wsgi']
+
+
+class Command(BaseCommand):
+    help = 'Measure cold start of the WSGI application per phase in fresh interpreters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start (default: 5)')
+        parser.add_argument('--budget-ms', type=float, default=None,
+                            help='Fail when the median process start exceeds this many ms')
+        parser.add_argument('--imports', type=int, default=0,
+                            help='Also list the N slowest imports (cumulative, from -X importtime)')
+
+    def run_probe(self, *flags):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'fusion_force.settings'))
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *flags, '-c', PROBE],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise CommandError(f"Application failed to start:\n{result.stderr}")
+        line = next(line for line in result.stdout.splitlines() if line.startswith('STARTUP_TIMINGS '))
+        timings = json.loads(line.split(' ', 1)[1])
+        timings['process'] = wall
+        return timings, result.stderr
+
+    def handle(self, *args, **options):
+        runs = [self.run_probe()[0] for _ in range(options['runs'])]
+
+        self.stdout.write(f"{'Phase':<18}{'median':>10}{'min':>10}{'max':>10}")
+        for name in PHASES + ['process']:
+            values = [run[name] for run in runs if name in run]
+            if values:
+                self.stdout.write(
+                    f"{name:<18}{statistics.median(values):>8.1f}ms{min(values):>8.1f}ms{max(values):>8.1f}ms"
+                )
+        self.stdout.write("(process = interpreter start + import + warm-up, as seen by a fresh gunicorn master)")
+
+        if options['imports']:
+            _, stderr = self.run_probe('-X', 'importtime')
+            imports = []
+            for line in stderr.splitlines():
+                if line.startswith('import time:') and '|' in line:
+                    _, cumulative, module = line.split('|')
+                    if cumulative.strip().isdigit():
+                        imports.append((int(cumulative), module.strip()))
+            self.stdout.write("\nSlowest imports (cumulative):")
+            for micros, module in sorted(imports, reverse=True)[:options['imports']]:
+                self.stdout.write(f"  {micros / 1000:>8.1f}ms  {module}")
+
+        budget = options['budget_ms']
+        if budget is not None:
+            median = statistics.median(run['process'] for run in runs)
+            if median > budget:
+                raise CommandError(f"Cold start {median:.0f}ms exceeds the {budget:.0f}ms budget")
+            self.stdout.write(self.style.SUCCESS(f"Cold start {median:.0f}ms is within the {budget:.0f}ms budget"))
@@ -0,0 +1,57 @@
+# main/media.py
+"""
+Serving for user uploads (MEDIA_ROOT).
+
+Static files are handled by WhiteNoiseMiddleware from the collected,
+precompressed STATIC_ROOT. Uploads can appear at any time, so instead of
+indexing the media tree at boot this view stats the requested file per
+request: a new upload is served immediately, with validators for
+conditional requests and a (non-immutable) cache lifetime.
+"""
+import mimetypes
+import os
+import posixpath
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+MEDIA_MAX_AGE = getattr(settings, 'MEDIA_CACHE_MAX_AGE', 24 * 60 * 60)
+
+
+@require_safe
+def serve_media(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404('Invalid media path')
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404('Media file not found')
+    if not os.path.isfile(full_path):
+        raise Http404('Media file not found')
+
+    etag = quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+    last_modified = http_date(stat.st_mtime)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': last_modified,
+        'Cache-Control': f'public, max-age={MEDIA_MAX_AGE}',
+    }
+
+    # 304 on a weak If-None-Match match (proxies may weaken the ETag) or '*',
+    # If-Modified-Since only without If-None-Match
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    for name, value in headers.items():
+        response[name] = value
+    return response
@@ -0,0 +1,120 @@
+# main/metrics.py
+"""
+/metrics in the Prometheus text format.
+
+Everything reported here is process-local (one gunicorn worker answers per
+scrape), so every series carries a ``pid`` label.
+"""
+import os
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+
+from . import cache_backends, perf, write_queue
+from .db_backends.pool import COUNTERS, pool_stats
+
+POOL_GAUGES = ('size', 'idle', 'in_use', 'waiting', 'max_size')
+
+
+def allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def sample(name, labels, value):
+    rendered = ','.join(f'{key}="{val}"' for key, val in labels.items())
+    return f'{name}{{{rendered}}} {value}'
+
+
+def db_pool_lines():
+    stats = pool_stats()
+    lines = []
+    for field in POOL_GAUGES:
+        lines.append(f'# TYPE db_pool_{field} gauge')
+        lines.extend(sample(f'db_pool_{field}', {'alias': row['alias'], 'pid': row['pid']}, row[field]) for row in stats)
+    for field in COUNTERS:
+        lines.append(f'# TYPE db_pool_{field}_total counter')
+        lines.extend(sample(f'db_pool_{field}_total', {'alias': row['alias'], 'pid': row['pid']}, row[field]) for row in stats)
+    lines.append('# TYPE db_pool_wait_seconds_total counter')
+    lines.extend(
+        sample('db_pool_wait_seconds_total', {'alias': row['alias'], 'pid': row['pid']}, f"{row['wait_seconds']:.6f}")
+        for row in stats
+    )
+    return lines
+
+
+def write_queue_lines():
+    labels = {'pid': os.getpid()}
+    lines = ['# TYPE db_write_queue_depth gauge', sample('db_write_queue_depth', labels, write_queue.depth())]
+    for field in ('queued', 'written', 'failed', 'batches'):
+        lines.append(f'# TYPE db_write_queue_{field}_total counter')
+        lines.append(sample(f'db_write_queue_{field}_total', labels, write_queue.stats[field]))
+    return lines
+
+
+def cache_lines():
+    """Tier counters and local tier size of every TieredCache"""
+    snapshots = {alias: caches[alias].snapshot() for alias in settings.CACHES
+                 if isinstance(caches[alias], cache_backends.TieredCache)}
+    lines = []
+    for field in (*cache_backends.COUNTERS, 'local_evictions'):
+        lines.append(f'# TYPE cache_{field}_total counter')
+        lines.extend(sample(f'cache_{field}_total', {'alias': alias, 'pid': os.getpid()}, snapshot[field])
+                     for alias, snapshot in snapshots.items())
+    for field in ('local_entries', 'local_bytes'):
+        lines.append(f'# TYPE cache_{field} gauge')
+        lines.extend(sample(f'cache_{field}', {'alias': alias, 'pid': os.getpid()}, snapshot[field])
+                     for alias, snapshot in snapshots.items())
+    return lines if snapshots else []
+
+
+def histogram_lines(name, histograms):
+    """``histograms``: {labels tuple: perf.Histogram in ms}, exported in seconds"""
+    lines = [f'# TYPE {name} histogram']
+    for (view, pid), histogram in histograms.items():
+        cumulative = 0
+        for bound, count in zip(perf.BOUNDS, histogram.counts):
+            cumulative += count
+            lines.append(sample(f'{name}_bucket', {'view': view, 'pid': pid, 'le': f'{bound / 1000:.6g}'}, cumulative))
+        lines.append(sample(f'{name}_bucket', {'view': view, 'pid': pid, 'le': '+Inf'}, histogram.count))
+        lines.append(sample(f'{name}_sum', {'view': view, 'pid': pid}, f'{histogram.sum / 1000:.6f}'))
+        lines.append(sample(f'{name}_count', {'view': view, 'pid': pid}, histogram.count))
+    return lines
+
+
+def request_lines():
+    """Per-view histograms and counters of the requests measured by PerformanceMiddleware"""
+    pid = os.getpid()
+    with perf.lock:
+        views = {(view, pid): stats for view, stats in perf.VIEW_STATS.items()}
+        if not views:
+            return []
+        lines = histogram_lines('http_request_duration_seconds', {key: stats.total for key, stats in views.items()})
+        lines += histogram_lines('http_request_db_seconds', {key: stats.db for key, stats in views.items()})
+        lines += histogram_lines('http_request_template_seconds', {key: stats.template for key, stats in views.items()})
+        for field in ('queries', 'cache_hits', 'cache_misses'):
+            lines.append(f'# TYPE http_request_{field}_total counter')
+            lines.extend(sample(f'http_request_{field}_total', {'view': view, 'pid': pid}, getattr(stats, field))
+                         for (view, pid), stats in views.items())
+        lines.append('# TYPE http_requests_measured_total counter')
+        for (view, pid), stats in views.items():
+            lines.extend(sample('http_requests_measured_total', {'view': view, 'status': status, 'pid': pid}, count)
+                         for status, count in sorted(stats.statuses.items()))
+    return lines
+
+
+def render():
+    return '\n'.join(db_pool_lines() + write_queue_lines() + cache_lines() + request_lines()) + '\n'
+
+
+@require_safe
+def metrics(request):
+    if not allowed(request):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,234 @@
+# main/middleware.py
+import random
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+from django.utils.crypto import constant_time_compare
+
+from . import db_router, perf, profiler
+
+PROFILE_PARAM = '_profile'
+
+
+def execute_wrappers(wrapper):
+    """Add ``wrapper`` to every connection of this thread; close the returned stack to remove it"""
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(wrapper))
+    return stack
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Opens the main.db_router scope for each request: replica reads for
+    GET/HEAD on @replica_reads views and admin changelists, primary pinning
+    after a write (for this request and, via a cookie, the next few seconds).
+    Removed from the stack when no replica database is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not db_router.replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with db_router.request_scope(pinned=db_router.PIN_COOKIE in request.COOKIES) as state:
+            request.db_routing = state
+            response = self.get_response(request)
+        return self.set_pin(response, state)
+
+    async def __acall__(self, request):
+        with db_router.request_scope(pinned=db_router.PIN_COOKIE in request.COOKIES) as state:
+            request.db_routing = state
+            response = await self.get_response(request)
+        return self.set_pin(response, state)
+
+    def set_pin(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                db_router.PIN_COOKIE, '1', max_age=db_router.PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        match = request.resolver_match
+        changelist = match.namespace == 'admin' and (match.url_name or '').endswith('_changelist')
+        if changelist or getattr(view_func, 'replica_reads', False):
+            request.db_routing.use_replica = True
+        return None
+
+
+def is_staff(request):
+    # No session cookie: anonymous, without the lazy session/user lookup
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+class PerformanceMiddleware:
+    """
+    Request-level instrumentation (main/perf.py) for a PERF_SAMPLE_RATE
+    sample of requests and for every staff request: DB time and queries,
+    template render time, cache hits/misses and total latency per view, as
+    a JSON log line and /metrics histograms. Staff responses also carry a
+    Server-Timing header. An unsampled anonymous request costs one random().
+
+    Opt-in SQL profiling (see PROFILING_TOKEN in settings) goes through the
+    same query timer: ``?_profile`` from staff, or with a valid
+    X-Profile-Token header, also keeps every query and adds X-Profile-*
+    headers (``?_profile=sql``: the queries as JSON instead of the page).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        perf.install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        staff = is_staff(request)
+        profile = self.profile_mode(request, staff)
+        if not staff and profile is None and not self.sampled():
+            return self.get_response(request)
+        metrics = perf.RequestMetrics(keep_sql=profile is not None)
+        token = perf.activate(metrics)
+        try:
+            with execute_wrappers(metrics):
+                response = self.get_response(request)
+        finally:
+            perf.deactivate(token)
+        return self.finish(request, response, metrics, staff, profile)
+
+    async def __acall__(self, request):
+        staff = await sync_to_async(is_staff)(request)
+        profile = self.profile_mode(request, staff)
+        if not staff and profile is None and not self.sampled():
+            return await self.get_response(request)
+        metrics = perf.RequestMetrics(keep_sql=profile is not None)
+        # Copied into the sync threads the request's ORM and template work runs in
+        token = perf.activate(metrics)
+        try:
+            wrappers = await sync_to_async(execute_wrappers)(metrics)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(wrappers.close)()
+        finally:
+            perf.deactivate(token)
+        return self.finish(request, response, metrics, staff, profile)
+
+    def sampled(self):
+        return perf.SAMPLE_RATE > 0 and random.random() < perf.SAMPLE_RATE
+
+    def profile_mode(self, request, staff):
+        mode = request.GET.get(PROFILE_PARAM)
+        if not mode:
+            return None
+        token = getattr(settings, 'PROFILING_TOKEN', '')
+        if staff or (token and constant_time_compare(request.headers.get('X-Profile-Token', ''), token)):
+            return mode
+        return None
+
+    def finish(self, request, response, metrics, staff, profile=None):
+        perf.record(request, response, metrics.finish())
+        if staff:
+            response['Server-Timing'] = metrics.server_timing()
+        if profile is not None:
+            return self.profile_report(request, response, metrics, profile)
+        return response
+
+    def profile_report(self, request, response, metrics, mode):
+        if mode == 'sql':
+            repeated = Counter(query['sql'] for query in metrics.statements)
+            return JsonResponse({
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(metrics.total_ms, 2),
+                'sql_ms': round(metrics.db_ms, 2),
+                'query_count': metrics.queries,
+                'duplicates': [{'sql': sql, 'count': count} for sql, count in repeated.most_common() if count > 1],
+                'queries': [dict(query, ms=round(query['ms'], 3)) for query in metrics.statements],
+            })
+
+        response['X-Profile-Total-Ms'] = f"{metrics.total_ms:.1f}"
+        response['X-Profile-SQL-Ms'] = f"{metrics.db_ms:.1f}"
+        response['X-Profile-SQL-Count'] = str(metrics.queries)
+        return response
+
+
+class PythonProfilingMiddleware:
+    """
+    Profiles a single request with cProfile or the stack sampler
+    (main/profiler.py) when it carries a signed ``?_pyprofile=`` link or a
+    staff ``X-Py-Profile`` header; the profile is saved to the ring buffer
+    browsable in the admin and named in the response's X-Py-Profile header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        mode = self.mode(request)
+        if mode is None:
+            return self.get_response(request)
+        session = profiler.ProfileSession(mode)
+        session.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            session.stop()
+        return self.finish(request, response, session)
+
+    async def __acall__(self, request):
+        if profiler.HEADER not in request.headers and profiler.PARAM not in request.GET:
+            return await self.get_response(request)
+        mode = await sync_to_async(self.mode)(request)
+        if mode is None:
+            return await self.get_response(request)
+        session = profiler.ProfileSession(mode)
+        # Started and stopped in the request's sync thread, which the async
+        # views use for the ORM and template rendering
+        await sync_to_async(session.start)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(session.stop)()
+        return self.finish(request, response, session)
+
+    def mode(self, request):
+        header = request.headers.get(profiler.HEADER)
+        if header in profiler.MODES and is_staff(request):
+            return header
+        return profiler.signed_mode(request)
+
+    def finish(self, request, response, session):
+        response[profiler.HEADER] = session.save(request, response)
+        return response
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.10 on 2026-10-19 10:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_newslettercampaign'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyDownloadStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyLogStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('log_level', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailySubmissionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('event_type', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailySubscriptionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('source', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailysubscriptionstat',
+            constraint=models.UniqueConstraint(fields=('date', 'source'), name='unique_daily_subscription_stat'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailysubmissionstat',
+            constraint=models.UniqueConstraint(fields=('date', 'event_type', 'status'), name='unique_daily_submission_stat'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailylogstat',
+            constraint=models.UniqueConstraint(fields=('date', 'log_level'), name='unique_daily_log_stat'),
+        ),
+        migrations.AddField(
+            model_name='dailydownloadstat',
+            name='ebook',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_downloads', to='main.freeebook'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailydownloadstat',
+            constraint=models.UniqueConstraint(fields=('date', 'ebook'), name='unique_daily_download_stat'),
+        ),
+    ]
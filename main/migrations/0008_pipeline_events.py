@@ -0,0 +1,57 @@
+# Generated by Django 4.2.10 on 2026-10-19 10:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(max_length=20)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['occurred_at', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PipelineDurationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PipelineStageStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=20, unique=True)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='pipelinedurationstat',
+            constraint=models.UniqueConstraint(fields=('metric', 'bucket'), name='unique_pipeline_duration_bucket'),
+        ),
+        migrations.AddField(
+            model_name='contactstatusevent',
+            name='submission',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='main.contactsubmission'),
+        ),
+        migrations.AddIndex(
+            model_name='contactstatusevent',
+            index=models.Index(fields=['submission', 'to_status'], name='main_contac_submiss_cbe710_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.utils.html import format_html
+from django.utils import timezone
 from django.db import models
+from django.db.models import F
 
 
 # ============ SITE SETTINGS ============
@@ -359,8 +361,10 @@ class FreeEbook(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     def increment_download_count(self):
+        # A single UPDATE: no post_save, so a download does not bump the
+        # FreeEbook content version (main/sections.py) like an admin edit
+        FreeEbook.objects.filter(pk=self.pk).update(download_count=F('download_count') + 1)
         self.download_count += 1
-        self.save()
     
     def __str__(self):
         return f"{self.title} ({self.download_count} downloads)"
@@ -393,3 +397,264 @@ class SystemLog(models.Model):
     
 
 
+
+# ============ OUTBOUND EMAIL QUEUE ============
+class OutboundEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    KIND_CHOICES = [
+        ('booking_confirmation', 'Booking Confirmation'),
+        ('booking_notification', 'Booking Notification'),
+        ('newsletter', 'Newsletter'),
+        ('other', 'Other'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES, default='other')
+    to_email = models.EmailField()
+    recipient_domain = models.CharField(max_length=255, db_index=True, editable=False)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    claim_token = models.CharField(max_length=32, blank=True, editable=False)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    contact_submission = models.ForeignKey(
+        ContactSubmission, null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='emails'
+    )
+    subscription = models.ForeignKey(
+        NewsletterSubscription, null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='emails'
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+
+    def save(self, *args, **kwargs):
+        self.recipient_domain = self.to_email.rsplit('@', 1)[-1].lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.to_email} ({self.status})"
+
+
+# ============ NEWSLETTER CAMPAIGNS ============
+class NewsletterCampaign(models.Model):
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('paused', 'Paused'),
+        ('completed', 'Completed'),
+    ]
+
+    newsletter = models.ForeignKey(NewsletterContent, on_delete=models.CASCADE, related_name='campaigns')
+    subject = models.CharField(max_length=255)
+    body = models.TextField(
+        help_text="Plain text body. Django template tags see {{ newsletter }} and {{ site_settings }} "
+                  "(rendered once); $name and $email are filled in per subscriber."
+    )
+    html_body = models.TextField(blank=True, help_text="Optional HTML version, same placeholders as the body")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
+
+    # Recipient snapshot - keyset cursor over NewsletterSubscription.id
+    snapshot_cursor = models.BigIntegerField(default=0, editable=False)
+    snapshot_complete = models.BooleanField(default=False, editable=False)
+
+    # Progress counters, maintained incrementally by the delivery engine
+    total_recipients = models.PositiveIntegerField(default=0, editable=False)
+    sent_count = models.PositiveIntegerField(default=0, editable=False)
+    failed_count = models.PositiveIntegerField(default=0, editable=False)
+    sending_seconds = models.FloatField(default=0, editable=False)
+
+    locked_until = models.DateTimeField(null=True, blank=True, editable=False)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Newsletter Campaign"
+        verbose_name_plural = "Newsletter Campaigns"
+
+    @property
+    def processed_count(self):
+        return self.sent_count + self.failed_count
+
+    @property
+    def throughput(self):
+        """Messages processed per second of delivery time"""
+        if not self.sending_seconds:
+            return 0
+        return self.processed_count / self.sending_seconds
+
+    @property
+    def eta_seconds(self):
+        remaining = self.total_recipients - self.processed_count
+        if remaining <= 0:
+            return 0
+        if not self.throughput:
+            return None
+        return remaining / self.throughput
+
+    def __str__(self):
+        return f"{self.subject} ({self.get_status_display()})"
+
+
+class CampaignRecipient(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('interrupted', 'Interrupted'),
+    ]
+
+    campaign = models.ForeignKey(NewsletterCampaign, on_delete=models.CASCADE, related_name='recipients')
+    subscription = models.ForeignKey(
+        NewsletterSubscription, null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='campaign_deliveries'
+    )
+    email = models.EmailField()
+    name = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['campaign', 'subscription'], name='unique_campaign_subscription'),
+        ]
+        indexes = [
+            models.Index(fields=['campaign', 'status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.email} ({self.status})"
+
+
+# ============ ANALYTICS ROLLUPS ============
+# Incrementally maintained by main/analytics.py (signals + admin actions) so
+# the dashboard never scans the raw tables. `rollup_analytics` rebuilds them.
+class DailySubmissionStat(models.Model):
+    date = models.DateField()
+    event_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'event_type', 'status'], name='unique_daily_submission_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.event_type}/{self.status}: {self.count}"
+
+
+class DailySubscriptionStat(models.Model):
+    date = models.DateField()
+    source = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'source'], name='unique_daily_subscription_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.source}: {self.count}"
+
+
+class DailyDownloadStat(models.Model):
+    date = models.DateField()
+    ebook = models.ForeignKey(FreeEbook, on_delete=models.CASCADE, related_name='daily_downloads')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'ebook'], name='unique_daily_download_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} ebook {self.ebook_id}: {self.count}"
+
+
+class DailyLogStat(models.Model):
+    date = models.DateField()
+    log_level = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'log_level'], name='unique_daily_log_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.log_level}: {self.count}"
+
+
+# ============ SALES PIPELINE ============
+class ContactStatusEvent(models.Model):
+    """Append-only history of ContactSubmission status changes"""
+    submission = models.ForeignKey(ContactSubmission, on_delete=models.CASCADE, related_name='status_events')
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20)
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['occurred_at', 'id']
+        indexes = [
+            models.Index(fields=['submission', 'to_status']),
+        ]
+
+    def __str__(self):
+        return f"#{self.submission_id}: {self.from_status or 'created'} -> {self.to_status}"
+
+
+class PipelineStageStat(models.Model):
+    """Number of submissions that ever reached each status (the funnel)"""
+    stage = models.CharField(max_length=20, unique=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.stage}: {self.count}"
+
+
+class PipelineDurationStat(models.Model):
+    """Histogram of time from submission to first reaching a stage"""
+    metric = models.CharField(max_length=30)
+    bucket = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'bucket'], name='unique_pipeline_duration_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.bucket}]: {self.count}"
+
+
+class ContentVersion(models.Model):
+    """Per-model content version, bumped on every change; part of the home page section cache keys"""
+    model = models.CharField(max_length=100, unique=True)
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.model} v{self.version}"
@@ -0,0 +1,233 @@
+# main/perf.py
+"""
+Request-level performance instrumentation (see PerformanceMiddleware).
+
+For a measured request this collects total latency, DB time and query
+count, template render time and cache hits/misses, then
+
+- adds a ``Server-Timing`` header (staff only: browser dev tools show it),
+- logs one record on the ``main.perf`` logger (a JSON line, see main/log.py),
+- records it in per-view, in-process histograms (VIEW_STATS) exported on
+  /metrics by main/metrics.py.
+
+Requests are measured when sampled (PERF_SAMPLE_RATE) or made by staff.
+Template and cache timing hooks are installed once per process and cost a
+ContextVar lookup when no request is being measured; the per-connection
+query timer is only installed for measured requests.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger('main.perf')
+
+SAMPLE_RATE = float(getattr(settings, 'PERF_SAMPLE_RATE', 0.0))
+
+_current = ContextVar('perf_request_metrics', default=None)
+
+
+# ============ HISTOGRAMS ============
+# HDR-style buckets: power-of-two ranges from LOWEST_MS up, each split into
+# SUB_BUCKETS linear buckets. Every value is counted with the same bounded
+# relative error (1 / SUB_BUCKETS) from 50us to ~52s: 81 bounds, so 82
+# counters per histogram with the one for values over the top bound.
+LOWEST_MS = 0.05
+POWERS = 20
+SUB_BUCKETS = 4
+
+BOUNDS = [LOWEST_MS] + [
+    LOWEST_MS * 2 ** power * (1 + step / SUB_BUCKETS)
+    for power in range(POWERS)
+    for step in range(1, SUB_BUCKETS + 1)
+]
+
+
+class Histogram:
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)  # last one: over the top bound
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, value):
+        self.counts[bisect_left(BOUNDS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class ViewStats:
+    __slots__ = ('total', 'db', 'template', 'queries', 'cache_hits', 'cache_misses', 'statuses')
+
+    def __init__(self):
+        self.total = Histogram()
+        self.db = Histogram()
+        self.template = Histogram()
+        self.queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.statuses = {}
+
+
+# View name -> ViewStats, per process
+VIEW_STATS = {}
+lock = threading.Lock()
+
+
+# ============ PER-REQUEST COLLECTION ============
+class RequestMetrics:
+    __slots__ = ('started', 'total_ms', 'db_ms', 'queries', 'template_ms', 'template_depth',
+                 'cache_hits', 'cache_misses', 'statements')
+
+    def __init__(self, keep_sql=False):
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Profiled requests (?_profile) and budget tests also keep every query
+        self.statements = [] if keep_sql else None
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper: DB time and query count, plus the SQL with keep_sql"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            self.db_ms += ms
+            self.queries += 1
+            if self.statements is not None:
+                self.statements.append({'alias': context['connection'].alias, 'sql': sql, 'ms': ms, 'many': many})
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        return self
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_ms:.1f};desc="templates"',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total_ms, 2),
+            'db_ms': round(self.db_ms, 2),
+            'queries': self.queries,
+            'template_ms': round(self.template_ms, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+def activate(metrics):
+    """Make ``metrics`` collect template and cache activity of this context; returns a reset token"""
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    # Bounded label set: URL names, or the view's dotted path
+    return (match.view_name or match._func_path) if match else 'unmatched'
+
+
+def record(request, response, metrics):
+    view = view_name(request)
+    status = f"{response.status_code // 100}xx"
+    with lock:
+        stats = VIEW_STATS.get(view)
+        if stats is None:
+            stats = VIEW_STATS[view] = ViewStats()
+        stats.total.record(metrics.total_ms)
+        stats.db.record(metrics.db_ms)
+        stats.template.record(metrics.template_ms)
+        stats.queries += metrics.queries
+        stats.cache_hits += metrics.cache_hits
+        stats.cache_misses += metrics.cache_misses
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+    if logger.isEnabledFor(logging.INFO):
+        logger.info('request', extra={
+            'view': view, 'method': request.method, 'path': request.path,
+            'status': response.status_code, **metrics.as_dict(),
+        })
+
+
+# ============ HOOKS ============
+_installed = False
+_MISSING = object()
+
+
+def install():
+    """Wrap top-level template rendering and the configured cache backends (once per process)"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    original_render = django_backend.Template.render
+
+    def render(self, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return original_render(self, *args, **kwargs)
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_ms += (time.perf_counter() - started) * 1000
+
+    django_backend.Template.render = render
+
+    # A shared tier is counted through the TieredCache in front of it
+    tiers = {getattr(caches[alias], 'shared_alias', None) for alias in settings.CACHES}
+    for backend in {type(caches[alias]) for alias in settings.CACHES if alias not in tiers}:
+        wrap_cache(backend)
+
+
+def wrap_cache(backend):
+    original_get, original_get_many = backend.get, backend.get_many
+
+    def get(self, key, default=None, version=None):
+        metrics = _current.get()
+        if metrics is None:
+            return original_get(self, key, default, version)
+        value = original_get(self, key, _MISSING, version)
+        if value is _MISSING:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+
+    def get_many(self, keys, version=None):
+        metrics = _current.get()
+        keys = list(keys)
+        found = original_get_many(self, keys, version)
+        if metrics is not None:
+            metrics.cache_hits += len(found)
+            metrics.cache_misses += len(keys) - len(found)
+        return found
+
+    backend.get = get
+    # BaseCache.get_many goes through get(): count once
+    if original_get_many is not BaseCache.get_many:
+        backend.get_many = get_many
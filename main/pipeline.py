@@ -0,0 +1,241 @@
+# main/pipeline.py
+"""
+Sales pipeline tracking for ContactSubmission.
+
+Every status change appends a ContactStatusEvent in the same transaction as
+the status UPDATE. At the same time the first arrival of a submission at
+each stage increments two rollups:
+
+* PipelineStageStat - the funnel (how many submissions ever reached a stage)
+* PipelineDurationStat - a fixed-bucket histogram of the time from
+  submission to first contact / first booking
+
+Percentiles are read from the histogram, so the admin summary costs the same
+no matter how many submissions or events exist. Values are reported as the
+upper bound of the bucket the percentile falls into.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import analytics
+from .models import ContactStatusEvent, ContactSubmission, PipelineDurationStat, PipelineStageStat
+
+# Upper bounds (seconds) of the duration histogram buckets; the last bucket is open-ended
+DURATION_BUCKETS = [
+    5 * 60, 15 * 60, 30 * 60,
+    60 * 60, 2 * 60 * 60, 4 * 60 * 60, 8 * 60 * 60, 12 * 60 * 60,
+    24 * 60 * 60, 2 * 24 * 60 * 60, 3 * 24 * 60 * 60, 5 * 24 * 60 * 60,
+    7 * 24 * 60 * 60, 14 * 24 * 60 * 60, 30 * 24 * 60 * 60,
+]
+
+DURATION_METRICS = {
+    'contacted': 'time_to_contact',
+    'booked': 'time_to_book',
+}
+
+DURATION_LABELS = {
+    'time_to_contact': 'Time to contact',
+    'time_to_book': 'Time to book',
+}
+
+FUNNEL_STAGES = ['new', 'contacted', 'booked', 'cancelled']
+
+
+def bucket_for(seconds):
+    for index, upper in enumerate(DURATION_BUCKETS):
+        if seconds <= upper:
+            return index
+    return len(DURATION_BUCKETS)
+
+
+# ============ RECORDING ============
+def record_first_arrivals(rows, stage, when):
+    """Update funnel and duration rollups for submissions reaching ``stage`` for the first time"""
+    if not rows:
+        return
+    already = set(
+        ContactStatusEvent.objects.filter(
+            submission_id__in=[row['id'] for row in rows], to_status=stage
+        ).values_list('submission_id', flat=True)
+    )
+    first = [row for row in rows if row['id'] not in already]
+    if not first:
+        return
+
+    analytics.bump(PipelineStageStat, len(first), stage=stage)
+    metric = DURATION_METRICS.get(stage)
+    if metric:
+        buckets = Counter(
+            bucket_for((when - row['submitted_at']).total_seconds()) for row in first
+        )
+        for bucket, count in buckets.items():
+            analytics.bump(PipelineDurationStat, count, metric=metric, bucket=bucket)
+
+
+def record_created(submission):
+    """Log the creation event and count the submission into the funnel"""
+    with transaction.atomic():
+        analytics.bump(PipelineStageStat, stage=submission.status)
+        ContactStatusEvent.objects.create(
+            submission=submission, from_status='', to_status=submission.status,
+            occurred_at=submission.submitted_at,
+        )
+
+
+def record_transition(submission, from_status, when=None):
+    """Log a single status change that has already been saved (admin form / list_editable)"""
+    when = when or timezone.now()
+    row = {'id': submission.id, 'submitted_at': submission.submitted_at}
+    with transaction.atomic():
+        record_first_arrivals([row], submission.status, when)
+        ContactStatusEvent.objects.create(
+            submission=submission, from_status=from_status, to_status=submission.status, occurred_at=when,
+        )
+        analytics.move_submission_status(
+            analytics.day_of(submission.submitted_at), submission.event_type, from_status, submission.status
+        )
+
+
+def transition(queryset, new_status, **extra_updates):
+    """
+    Bulk status change used by the admin actions.
+
+    Rows already in ``new_status`` are left alone. The UPDATE, the event
+    rows and the rollup changes commit together. Returns the number of
+    submissions that changed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            queryset.exclude(status=new_status)
+            .select_for_update()
+            .values('id', 'status', 'event_type', 'submitted_at')
+        )
+        if not rows:
+            return 0
+
+        ContactSubmission.objects.filter(id__in=[row['id'] for row in rows]).update(
+            status=new_status, **extra_updates
+        )
+        record_first_arrivals(rows, new_status, now)
+        ContactStatusEvent.objects.bulk_create([
+            ContactStatusEvent(submission_id=row['id'], from_status=row['status'], to_status=new_status, occurred_at=now)
+            for row in rows
+        ])
+
+        moves = Counter(
+            (analytics.day_of(row['submitted_at']), row['event_type'], row['status']) for row in rows
+        )
+        for (day, event_type, old_status), count in moves.items():
+            analytics.move_submission_status(day, event_type, old_status, new_status, count)
+    return len(rows)
+
+
+# ============ SUMMARY ============
+def percentile_from_histogram(counts, fraction):
+    """Upper bound (seconds) of the bucket holding the given percentile, None if open-ended/empty"""
+    total = sum(counts)
+    if not total:
+        return None
+    target = fraction * total
+    running = 0
+    for index, count in enumerate(counts):
+        running += count
+        if running >= target:
+            return DURATION_BUCKETS[index] if index < len(DURATION_BUCKETS) else None
+    return None
+
+
+def format_duration(seconds):
+    if seconds is None:
+        # Past the last bucket
+        return f"> {DURATION_BUCKETS[-1] // 86400} d"
+    delta = timedelta(seconds=seconds)
+    if delta < timedelta(hours=1):
+        return f"≤ {int(seconds // 60)} min"
+    if delta < timedelta(days=1):
+        return f"≤ {int(seconds // 3600)} h"
+    return f"≤ {delta.days} d"
+
+
+def summary():
+    """Funnel and duration percentiles, read from the rollups only"""
+    stages = dict(PipelineStageStat.objects.values_list('stage', 'count'))
+    total = stages.get('new', 0)
+    labels = dict(ContactSubmission.STATUS_CHOICES)
+    funnel = [
+        {
+            'stage': labels.get(stage, stage),
+            'count': stages.get(stage, 0),
+            'percent': stages.get(stage, 0) * 100 / total if total else 0,
+        }
+        for stage in FUNNEL_STAGES
+    ]
+
+    histograms = {metric: [0] * (len(DURATION_BUCKETS) + 1) for metric in DURATION_METRICS.values()}
+    for metric, bucket, count in PipelineDurationStat.objects.values_list('metric', 'bucket', 'count'):
+        if metric in histograms and bucket < len(histograms[metric]):
+            histograms[metric][bucket] = count
+
+    durations = []
+    for metric in DURATION_METRICS.values():
+        counts = histograms[metric]
+        durations.append({
+            'label': DURATION_LABELS[metric],
+            'samples': sum(counts),
+            'p50': format_duration(percentile_from_histogram(counts, 0.50)) if sum(counts) else '-',
+            'p90': format_duration(percentile_from_histogram(counts, 0.90)) if sum(counts) else '-',
+            'p99': format_duration(percentile_from_histogram(counts, 0.99)) if sum(counts) else '-',
+        })
+    return {'funnel': funnel, 'durations': durations}
+
+
+# ============ REBUILD ============
+def rebuild():
+    """Backfill creation events and recompute both rollups from the event table"""
+    with transaction.atomic():
+        missing = ContactSubmission.objects.exclude(
+            id__in=ContactStatusEvent.objects.values('submission_id')
+        ).values('id', 'status', 'submitted_at', 'contacted_at')
+        events = []
+        for row in missing.iterator():
+            events.append(ContactStatusEvent(
+                submission_id=row['id'], from_status='', to_status='new', occurred_at=row['submitted_at']
+            ))
+            if row['status'] != 'new':
+                events.append(ContactStatusEvent(
+                    submission_id=row['id'], from_status='new', to_status=row['status'],
+                    occurred_at=row['contacted_at'] or row['submitted_at'],
+                ))
+        ContactStatusEvent.objects.bulk_create(events, batch_size=1000)
+
+        PipelineStageStat.objects.all().delete()
+        PipelineDurationStat.objects.all().delete()
+
+        seen = set()
+        stage_counts = Counter()
+        duration_counts = Counter()
+        for submission_id, stage, occurred_at, submitted_at in (
+            ContactStatusEvent.objects.order_by('occurred_at', 'id')
+            .values_list('submission_id', 'to_status', 'occurred_at', 'submission__submitted_at')
+            .iterator()
+        ):
+            if (submission_id, stage) in seen:
+                continue
+            seen.add((submission_id, stage))
+            stage_counts[stage] += 1
+            metric = DURATION_METRICS.get(stage)
+            if metric:
+                duration_counts[(metric, bucket_for((occurred_at - submitted_at).total_seconds()))] += 1
+
+        PipelineStageStat.objects.bulk_create([
+            PipelineStageStat(stage=stage, count=count) for stage, count in stage_counts.items()
+        ])
+        PipelineDurationStat.objects.bulk_create([
+            PipelineDurationStat(metric=metric, bucket=bucket, count=count)
+            for (metric, bucket), count in duration_counts.items()
+        ])
+    return len(events), sum(stage_counts.values())
@@ -0,0 +1,216 @@
+# main/profiler.py
+"""
+Python profiles of single production requests (see PythonProfilingMiddleware).
+
+A request is profiled when it carries a signed ``?_pyprofile=`` link made in
+the admin (Profiles page; the signature covers the mode and the path and
+expires after PROFILE_LINK_MAX_AGE), or when a staff user sends an
+``X-Py-Profile: cprofile|sample`` header.
+
+- ``cprofile``: deterministic cProfile of the request (pstats), plus stack
+  samples for a flame graph. Slows the request down noticeably.
+- ``sample``: stack samples only (every PROFILE_SAMPLE_INTERVAL_MS), cheap
+  enough to run on a slow page in place.
+
+Samples are written in the collapsed-stack format (``root;caller;leaf
+count``) that flamegraph.pl and speedscope read. Profiles are kept in
+PROFILE_DIR as a ring buffer of the last PROFILE_KEEP requests.
+
+Only the thread running the request is profiled: for async views that is
+the request's sync thread, where the ORM and template rendering run.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+
+PARAM = '_pyprofile'
+HEADER = 'X-Py-Profile'
+MODES = ('cprofile', 'sample')
+
+PROFILE_DIR = str(getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+PROFILE_KEEP = getattr(settings, 'PROFILE_KEEP', 50)
+LINK_MAX_AGE = getattr(settings, 'PROFILE_LINK_MAX_AGE', 60 * 60)
+SAMPLE_INTERVAL = getattr(settings, 'PROFILE_SAMPLE_INTERVAL_MS', 2) / 1000
+
+NAME_RE = re.compile(r'^\d+-\d+$')
+FILES = {
+    'meta': '.json',
+    'pstats': '.pstats.txt',
+    'prof': '.prof',
+    'collapsed': '.collapsed.txt',
+}
+
+SALT = 'main.profiler'
+
+
+# ============ TRIGGER ============
+def sign(path, mode='cprofile'):
+    """URL-safe token for profiling ``path`` (without query string) in ``mode``"""
+    return signing.dumps({'path': path, 'mode': mode}, salt=SALT, compress=True)
+
+
+def signed_url(url, mode='cprofile'):
+    path, _, query = url.partition('?')
+    return f"{path}?{query + '&' if query else ''}{PARAM}={sign(path, mode)}"
+
+
+def signed_mode(request):
+    """Mode of a valid signed link for this path, or None"""
+    value = request.GET.get(PARAM)
+    if not value:
+        return None
+    try:
+        data = signing.loads(value, salt=SALT, max_age=LINK_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    mode = data.get('mode')
+    return mode if mode in MODES and data.get('path') == request.path else None
+
+
+# ============ SAMPLING ============
+def collapse(frame):
+    """root;...;leaf for a frame, one ``function (file:line)`` per level"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler(threading.Thread):
+    """Samples the stack of one thread every ``interval`` seconds"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+class ProfileSession:
+    """Profiles the calling thread between start() and stop()"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == 'cprofile' else None
+        self.sampler = None
+        self.started = 0.0
+        self.duration_ms = 0.0
+
+    def start(self):
+        self.sampler = StackSampler(threading.get_ident())
+        self.sampler.start()
+        self.started = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        self.sampler.stop()
+
+    def save(self, request, response):
+        return save({
+            'created': time.time(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': getattr(request.resolver_match, 'view_name', '') or '',
+            'status': response.status_code,
+            'mode': self.mode,
+            'duration_ms': round(self.duration_ms, 2),
+            'samples': sum(self.sampler.stacks.values()),
+            'pid': os.getpid(),
+        }, self.profiler, self.sampler.stacks)
+
+
+# ============ RING BUFFER ============
+def path_for(name, kind):
+    return os.path.join(PROFILE_DIR, name + FILES[kind])
+
+
+def save(meta, profiler, stacks):
+    """Write one profile; returns its name. Oldest profiles beyond PROFILE_KEEP are removed."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = f"{time.time_ns()}-{os.getpid()}"
+    meta['name'] = name
+
+    if profiler is not None:
+        profiler.dump_stats(path_for(name, 'prof'))
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(80)
+        with open(path_for(name, 'pstats'), 'w') as handle:
+            handle.write(text.getvalue())
+    with open(path_for(name, 'collapsed'), 'w') as handle:
+        handle.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+    # Last: an entry is listed once its meta file exists
+    with open(path_for(name, 'meta'), 'w') as handle:
+        json.dump(meta, handle)
+
+    prune()
+    return name
+
+
+def names():
+    """Profile names, newest first"""
+    try:
+        files = os.listdir(PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    found = [entry[:-len(FILES['meta'])] for entry in files if entry.endswith(FILES['meta'])]
+    return sorted((name for name in found if NAME_RE.match(name)), key=lambda name: int(name.split('-')[0]),
+                  reverse=True)
+
+
+def prune(keep=None):
+    keep = PROFILE_KEEP if keep is None else keep
+    for name in names()[keep:]:
+        for kind in FILES:
+            try:
+                os.remove(path_for(name, kind))
+            except FileNotFoundError:
+                pass
+
+
+def load(name, *kinds):
+    """Meta dict for ``name`` with the text of ``kinds`` added (None for a missing file); None if unknown"""
+    if not NAME_RE.match(name or ''):
+        return None
+    try:
+        with open(path_for(name, 'meta')) as handle:
+            meta = json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+    for kind in kinds:
+        try:
+            with open(path_for(name, kind)) as handle:
+                meta[kind] = handle.read()
+        except FileNotFoundError:
+            meta[kind] = None
+    return meta
+
+
+def entries():
+    return [meta for meta in (load(name) for name in names()) if meta is not None]
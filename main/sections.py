@@ -0,0 +1,104 @@
+# main/sections.py
+"""
+Home page section cache.
+
+Each ``{% cached_section %}`` block in templates/main/index.html is cached
+under a key built from the ContentVersion of the models it displays
+(SECTION_MODELS). Any save or delete of one of those models (signals) or a
+bulk admin update (``bump_versions`` in the action) bumps the model's
+version, so only the sections showing that model render again - an edit to
+a Testimonial leaves every other section cached.
+
+Versions live in the database, so a change made through one worker
+invalidates the section in all of them; all versions for a page are read
+with a single query per render.
+"""
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import (
+    AboutSection, ContentVersion, FreeEbook, GalleryImage, HeroImage, ImpactResult,
+    NewsletterContent, Service, SiteSettings, Testimonial
+)
+
+SECTION_TIMEOUT = getattr(settings, 'SECTION_CACHE_TIMEOUT', 24 * 60 * 60)
+
+# Section name -> models whose content it renders
+SECTION_MODELS = {
+    'navbar': [SiteSettings],
+    'hero': [HeroImage],
+    'about': [AboutSection],
+    'gallery': [GalleryImage],
+    'testimonials': [Testimonial],
+    'newsletter': [NewsletterContent, FreeEbook],
+    'contact': [SiteSettings],
+    'footer': [SiteSettings, FreeEbook],
+}
+
+# Services and results are not cached sections, but the content API
+# (main/content_api.py) needs their versions too
+VERSIONED_MODELS = sorted({model for models in SECTION_MODELS.values() for model in models} | {Service, ImpactResult},
+                          key=lambda model: model._meta.label)
+
+# Per-process render timings: section -> {'hits', 'misses', 'hit_ms', 'miss_ms'}
+SECTION_STATS = defaultdict(lambda: {'hits': 0, 'misses': 0, 'hit_ms': 0.0, 'miss_ms': 0.0})
+
+
+# ============ VERSIONS ============
+def bump_versions(*models):
+    for model in models:
+        if model not in VERSIONED_MODELS:
+            continue
+        label = model._meta.label_lower
+        if ContentVersion.objects.filter(model=label).update(version=F('version') + 1):
+            continue
+        try:
+            with transaction.atomic():
+                ContentVersion.objects.create(model=label, version=1)
+        except IntegrityError:
+            ContentVersion.objects.filter(model=label).update(version=F('version') + 1)
+
+
+def current_versions():
+    """{model label: version} for every model a section depends on"""
+    return dict(ContentVersion.objects.filter(
+        model__in=[model._meta.label_lower for model in VERSIONED_MODELS]
+    ).values_list('model', 'version'))
+
+
+def section_key(name, versions, *extra):
+    parts = [f"{model._meta.label_lower}={versions.get(model._meta.label_lower, 0)}"
+             for model in SECTION_MODELS[name]]
+    parts.extend(str(part) for part in extra)
+    return f"home-section:{name}:{':'.join(parts)}"
+
+
+# ============ RENDERING ============
+def render_section(name, versions, render, *extra):
+    """Cached output of ``render()`` for the section; timings go to SECTION_STATS"""
+    if name not in SECTION_MODELS:
+        raise KeyError(f"Unknown home page section '{name}' (add it to SECTION_MODELS)")
+    started = time.perf_counter()
+    rendered = []
+
+    def render_once():
+        rendered.append(True)
+        return render()
+
+    # With the default TieredCache (main/cache_backends.py) a miss is
+    # single-flight: concurrent requests for a section that just changed wait
+    # for one render. Other backends' get_or_set let each of them render it.
+    html = cache.get_or_set(section_key(name, versions, *extra), render_once, SECTION_TIMEOUT)
+    stats = SECTION_STATS[name]
+    if rendered:
+        stats['misses'] += 1
+        stats['miss_ms'] += (time.perf_counter() - started) * 1000
+    else:
+        stats['hits'] += 1
+        stats['hit_ms'] += (time.perf_counter() - started) * 1000
+    return html
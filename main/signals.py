@@ -0,0 +1,55 @@
+# main/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import analytics, pipeline
+from .sections import VERSIONED_MODELS, bump_versions
+from .models import ContactSubmission, NewsletterSubscription, SystemLog
+
+
+# ============ ANALYTICS ROLLUPS & PIPELINE ============
+@receiver(pre_save, sender=ContactSubmission)
+def remember_submission_status(sender, instance, **kwargs):
+    """Stash the stored status so post_save can move the rollup bucket"""
+    if instance.pk:
+        instance._previous_status = (
+            ContactSubmission.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=ContactSubmission)
+def update_submission_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        analytics.record_submission(instance)
+        pipeline.record_created(instance)
+        return
+    previous = getattr(instance, '_previous_status', None)
+    if previous and previous != instance.status:
+        # Moves the daily rollup bucket and appends the pipeline event
+        pipeline.record_transition(instance, previous)
+
+
+@receiver(post_save, sender=NewsletterSubscription)
+def update_subscription_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        analytics.record_subscription(instance)
+
+
+@receiver(post_save, sender=SystemLog)
+def update_log_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        analytics.record_log(instance)
+
+
+# ============ HOME PAGE SECTION CACHE ============
+def bump_content_version(sender, raw=False, **kwargs):
+    if not raw:
+        bump_versions(sender)
+
+
+for versioned_model in VERSIONED_MODELS:
+    label = versioned_model._meta.label_lower
+    post_save.connect(bump_content_version, sender=versioned_model, dispatch_uid=f'content-version-save-{label}')
+    post_delete.connect(bump_content_version, sender=versioned_model, dispatch_uid=f'content-version-delete-{label}')
@@ -0,0 +1,135 @@
+# main/startup.py
+"""
+Process warm-up.
+
+Work Django would otherwise do lazily on the first request of every worker
+(URL resolver, template compilation, static manifest, asset bundle
+manifest) is done once in ``fusion_force.wsgi.create_app``. With gunicorn
+``--preload`` that happens in the master before forking, so workers start
+with everything already in (copy-on-write shared) memory.
+
+What cannot be shared through fork - database connections, the per-process
+section cache - is set up by ``warm_worker`` in each worker before it
+accepts requests (gunicorn.conf.py) and before it reports ready on /readyz
+(main/health.py).
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+@contextmanager
+def phase(timings, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - started) * 1000
+
+
+def template_names():
+    """Every template under the project template dirs and the admin app"""
+    from django.apps import apps
+    from django.conf import settings
+
+    roots = [str(directory) for engine in settings.TEMPLATES for directory in engine.get('DIRS', [])]
+    roots.append(os.path.join(apps.get_app_config('admin').path, 'templates'))
+    names = set()
+    for root in roots:
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    relative = os.path.relpath(os.path.join(directory, filename), root)
+                    names.add(relative.replace(os.sep, '/'))
+    return sorted(names)
+
+
+def compile_templates(names=None):
+    """Parse templates into the cached loader. Returns the number compiled"""
+    from django.template import TemplateDoesNotExist, TemplateSyntaxError
+    from django.template.loader import get_template
+
+    compiled = 0
+    for name in template_names() if names is None else names:
+        try:
+            get_template(name)
+            compiled += 1
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            # Partial templates that only work inside another one
+            continue
+    return compiled
+
+
+def warm_up(timings=None):
+    """Load lazily-initialised state up front. Returns {phase: ms}"""
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.urls import get_resolver
+
+    from .assets import load_manifest
+
+    timings = {} if timings is None else timings
+    with phase(timings, 'urls'):
+        get_resolver().url_patterns
+    with phase(timings, 'templates'):
+        compile_templates()
+    with phase(timings, 'static_manifest'):
+        if hasattr(staticfiles_storage, 'hashed_files'):
+            # Populated from staticfiles.json when the storage is first set up
+            staticfiles_storage.hashed_files
+        load_manifest()
+    return timings
+
+
+# ============ PER WORKER ============
+# pid -> warm_worker() timings, for the processes that completed it
+WORKERS = {}
+_worker_lock = threading.Lock()
+
+
+def render_home():
+    """Render the home page once through its view, without logging a page view"""
+    from django.test import RequestFactory
+    from django.urls import resolve
+
+    from .log import quiet
+
+    request = RequestFactory().get('/', REMOTE_ADDR='127.0.0.1', HTTP_USER_AGENT='warm-up')
+    view = resolve('/').func
+    with quiet():
+        response = async_to_sync(view)(request) if iscoroutinefunction(view) else view(request)
+    return response.status_code
+
+
+def warm_worker():
+    """
+    Open this process's database connections and render the home page once
+    (section cache, included templates). Runs once per process; returns
+    {phase: ms}. Raises if the database is unreachable - the next call
+    tries again.
+    """
+    from django.db import close_old_connections, connections
+
+    pid = os.getpid()
+    with _worker_lock:
+        if pid in WORKERS:
+            return WORKERS[pid]
+        timings = {}
+        with phase(timings, 'db_connections'):
+            for alias in connections:
+                connections[alias].ensure_connection()
+        with phase(timings, 'home_page'):
+            render_home()
+        # As at the end of a request: pooled connections go back to their
+        # pool, persistent ones stay open for this thread
+        close_old_connections()
+        WORKERS[pid] = timings
+        return timings
+
+
+def worker_ready():
+    return os.getpid() in WORKERS
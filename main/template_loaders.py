@@ -0,0 +1,63 @@
+# main/template_loaders.py
+"""
+Template loaders.
+
+ChecksumLoader is the development counterpart of Django's cached loader:
+compiled templates are kept in memory, but each lookup stats the source
+file and, when its mtime or size moved, compares a SHA-1 of the content.
+Only a real content change triggers a re-parse, so saving a template shows
+up on the next request under any server (runserver, gunicorn --reload, a
+shell), not only where Django's autoreloader resets the loaders.
+"""
+import hashlib
+import os
+
+from django.template import TemplateDoesNotExist
+from django.template.loaders import cached
+
+
+def file_digest(path):
+    with open(path, 'rb') as handle:
+        return hashlib.sha1(handle.read()).hexdigest()
+
+
+class ChecksumLoader(cached.Loader):
+    def __init__(self, engine, loaders):
+        super().__init__(engine, loaders)
+        self.fingerprints = {}  # cache key -> (path, mtime_ns, size, sha1)
+
+    def is_stale(self, key):
+        path, mtime_ns, size, digest = self.fingerprints[key]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+            return False
+        new_digest = file_digest(path)
+        self.fingerprints[key] = (path, stat.st_mtime_ns, stat.st_size, new_digest)
+        return new_digest != digest
+
+    def get_template(self, template_name, skip=None):
+        key = self.cache_key(template_name, skip)
+        cached_template = self.get_template_cache.get(key)
+        if isinstance(cached_template, TemplateDoesNotExist) or (
+            isinstance(cached_template, type) and issubclass(cached_template, TemplateDoesNotExist)
+        ):
+            # A template may be created while the server runs; look again
+            del self.get_template_cache[key]
+        elif cached_template is not None and key in self.fingerprints and self.is_stale(key):
+            del self.get_template_cache[key]
+
+        template = super().get_template(template_name, skip)
+        if template is not cached_template:
+            # Freshly parsed: remember what the source looked like
+            path = template.origin.name
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                self.fingerprints[key] = (path, stat.st_mtime_ns, stat.st_size, file_digest(path))
+        return template
+
+    def reset(self):
+        super().reset()
+        self.fingerprints.clear()
@@ -0,0 +1,49 @@
+# main/templatetags/sections.py
+from django import template
+
+from main.sections import current_versions, render_section
+
+register = template.Library()
+
+VERSIONS_KEY = 'home_section_versions'
+
+
+class CachedSectionNode(template.Node):
+    def __init__(self, name, extra, nodelist):
+        self.name = name
+        self.extra = extra
+        self.nodelist = nodelist
+
+    def render(self, context):
+        # The home view's error fallback has no section data: rendering it
+        # into the cache would blank the section until the next content edit
+        if context.get('error'):
+            return self.nodelist.render(context)
+        # One versions query per template render, shared by all sections
+        if VERSIONS_KEY not in context.render_context:
+            context.render_context[VERSIONS_KEY] = current_versions()
+        versions = context.render_context[VERSIONS_KEY]
+        name = self.name.resolve(context)
+        extra = [value.resolve(context) for value in self.extra]
+        return render_section(name, versions, lambda: self.nodelist.render(context), *extra)
+
+
+@register.tag
+def cached_section(parser, token):
+    """
+    {% cached_section 'testimonials' [extra ...] %} ... {% endcached_section %}
+
+    Cached until a model listed for the section in main.sections.SECTION_MODELS
+    changes. Extra arguments are added to the key (for content that varies by
+    something other than the models). Never wrap blocks that use the request,
+    the user or {% csrf_token %}. Not cached when the context has ``error``
+    set (the home view's fallback).
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' requires a section name")
+    nodelist = parser.parse(('endcached_section',))
+    parser.delete_first_token()
+    return CachedSectionNode(
+        parser.compile_filter(bits[1]), [parser.compile_filter(bit) for bit in bits[2:]], nodelist
+    )
@@ -0,0 +1,54 @@
+# main/templatetags/site_assets.py
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from main.assets import BUNDLES, PRELOAD_IMAGES, load_manifest
+
+register = template.Library()
+
+
+def bundle_url(name):
+    manifest = load_manifest()
+    if manifest and name in manifest['bundles']:
+        return static(manifest['bundles'][name])
+    return None
+
+
+@register.simple_tag
+def critical_css():
+    manifest = load_manifest()
+    if not manifest or not manifest.get('critical_css'):
+        return ''
+    return format_html('<style>{}</style>', mark_safe(manifest['critical_css']))
+
+
+@register.simple_tag
+def bundle_css():
+    """Full stylesheet, loaded without blocking render (critical CSS covers the first paint)"""
+    url = bundle_url('site.css')
+    if url is None:
+        return format_html_join('\n', '<link href="{}" rel="stylesheet">', ((static(src),) for src in BUNDLES['site.css']))
+    return format_html(
+        '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" href="{0}"></noscript>',
+        url,
+    )
+
+
+@register.simple_tag
+def bundle_js():
+    url = bundle_url('site.js')
+    if url is None:
+        return format_html_join('\n', '<script src="{}" defer></script>', ((static(src),) for src in BUNDLES['site.js']))
+    return format_html('<script src="{}" defer></script>', url)
+
+
+@register.simple_tag
+def asset_preloads():
+    hints = [(static(image), 'image') for image in PRELOAD_IMAGES]
+    url = bundle_url('site.js')
+    if url:
+        hints.append((url, 'script'))
+    return format_html_join('\n', '<link rel="preload" href="{}" as="{}">', hints)
@@ -0,0 +1,26 @@
+# main/test_runner.py
+import logging
+from contextlib import ExitStack
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from main.log import console_level
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner with INLINE_WRITES on: queued writes and log records run
+    in the test's thread, inside its transaction, instead of on background
+    threads that could not see it. Only errors are logged to the console.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_environment = ExitStack()
+        self.test_environment.enter_context(override_settings(INLINE_WRITES=True))
+        self.test_environment.enter_context(console_level(logging.ERROR))
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_environment.close()
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,713 @@
-from django.test import TestCase
+import cProfile
+import importlib.util
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import warnings
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from main import assets, campaigns, health, mailer, profiler, urls as main_urls
+from main.benchmarks.fixtures import SIZES, seed_content
+from main.budgets import measure
+from main.cache_backends import _MISSING, LocalLRU, TieredCache
+from main.campaigns import CampaignRenderer
+from main.db_backends import pool as db_pool
+from main.db_router import PIN_COOKIE
+from main.log import RateLimitFilter, SampleFilter
+from main.media import serve_media
+from main.perf import BOUNDS, SUB_BUCKETS, Histogram
+from main.pipeline import format_duration
+from main.models import (
+    CampaignRecipient, FreeEbook, NewsletterCampaign, NewsletterContent, NewsletterSubscription, OutboundEmail,
+    Service, SiteSettings, Testimonial
+)
+
+
+def json_body(data):
+    return {'data': json.dumps(data), 'content_type': 'application/json'}
+
+
+# How the budget tests call each budgeted endpoint: url name -> (method, test
+# client kwargs for the n-th request). Bodies differ per request so a repeat
+# is not a duplicate submission.
+BUDGET_REQUESTS = {
+    'home': ('get', lambda n: {}),
+    'contact_submit': ('post', lambda n: json_body({
+        'full_name': 'Budget Test', 'email': f'budget{n}@example.com', 'organization': 'Budget Inc',
+        'event_type': 'keynote', 'event_details': 'Budget test',
+    })),
+    'newsletter_submit': ('post', lambda n: json_body({'email': f'budget{n}@example.com', 'name': 'Budget'})),
+    'formsubmit_webhook': ('post', lambda n: json_body({'_subject': f'Budget {n}'})),
+    'download_ebook': ('post', lambda n: {}),
+    'content_api': ('get', lambda n: {}),
+}
+
+
+# Templates are served as-is: no collected manifest in the test run
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class EndpointBudgetTests(TestCase):
+    """Every endpoint in main/urls.py stays within its BUDGETS entry"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_content(SIZES)
+        cls.ebook = FreeEbook.objects.get()
+
+    def url(self, name):
+        if name == 'download_ebook':
+            return reverse(name, args=[self.ebook.id])
+        return reverse(name)
+
+    def test_every_endpoint_has_a_budget(self):
+        names = {pattern.name for pattern in main_urls.urlpatterns}
+        self.assertEqual(names - set(main_urls.BUDGETS), set(), 'Declare a Budget in main/urls.py')
+        self.assertEqual(set(main_urls.BUDGETS) - set(BUDGET_REQUESTS), set(), 'Add the request to BUDGET_REQUESTS')
+
+    def test_budgets(self):
+        for name, budget in main_urls.BUDGETS.items():
+            method, request_kwargs = BUDGET_REQUESTS[name]
+            with self.subTest(endpoint=name):
+                # Measured in a warm process (compiled templates, today's
+                # rollup rows in place) but with an empty cache: the budgets
+                # cover every section rendering from the database
+                getattr(self.client, method)(self.url(name), **request_kwargs(0))
+                cache.clear()
+                measurement = measure(self.client, method, self.url(name), **request_kwargs(1))
+                self.assertLess(measurement.response.status_code, 400)
+                violations = measurement.violations(budget)
+                if violations:
+                    self.fail(f"{name} is over budget ({', '.join(violations)})\n{measurement.report()}")
+
+
+
+@override_settings(PROFILING_TOKEN='secret', STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class RequestProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_content(SIZES)
+
+    def test_profile_headers_and_sql_report(self):
+        url = reverse('home')
+        self.assertNotIn('X-Profile-SQL-Count', self.client.get(url, {'_profile': '1'}))
+        headers = {'X-Profile-Token': 'secret'}
+        response = self.client.get(url, {'_profile': '1'}, headers=headers)
+        self.assertGreater(int(response['X-Profile-SQL-Count']), 0)
+        report = self.client.get(url, {'_profile': 'sql'}, headers=headers).json()
+        self.assertEqual(report['query_count'], len(report['queries']))
+        self.assertTrue(all(query['alias'] == 'default' and query['sql'] for query in report['queries']))
+
+class ContentApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_content(SIZES)
+
+    def test_etag_follows_content_versions(self):
+        url = reverse('content_api')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': f'W/{etag}'}).status_code, 304)
+        service = Service.objects.first()
+        service.title = 'Changed'
+        service.save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(json.loads(response.content)['services'][0]['title'], 'Changed')
+
+    def test_download_keeps_etag(self):
+        url = reverse('content_api')
+        etag = self.client.get(url)['ETag']
+        ebook = FreeEbook.objects.get()
+        self.client.post(reverse('download_ebook', args=[ebook.id]))
+        ebook.refresh_from_db()
+        self.assertEqual(ebook.download_count, 1)
+        self.assertEqual(self.client.get(url)['ETag'], etag)
+
+    def test_field_selection(self):
+        response = self.client.get(reverse('content_api'), {'fields': 'services.title'})
+        data = json.loads(response.content)
+        self.assertEqual(set(data), {'version', 'services'})
+        self.assertEqual(set(data['services'][0]), {'id', 'title'})
+        self.assertEqual(self.client.get(reverse('content_api'), {'fields': 'services.nope'}).status_code, 400)
+
+
+def log_record(name, level=logging.INFO, **extra):
+    record = logging.LogRecord(name, level, __file__, 0, 'message', (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class LogFilterTests(SimpleTestCase):
+    def test_sample_filter(self):
+        sample = SampleFilter('noisy=0')
+        self.assertFalse(sample.filter(log_record('noisy.child')))
+        self.assertTrue(sample.filter(log_record('noisy', logging.WARNING)))
+        self.assertTrue(sample.filter(log_record('quiet')))
+        # Activity records are SystemLog rows, never sampled
+        self.assertTrue(sample.filter(log_record('noisy.activity', source='home_view')))
+
+    def test_rate_limit_filter(self):
+        limit = RateLimitFilter(per_second=0.001, burst=3)
+        self.assertEqual([limit.filter(log_record('busy')) for _ in range(5)], [True, True, True, False, False])
+        self.assertTrue(limit.filter(log_record('busy', logging.ERROR)))
+        self.assertTrue(all(limit.filter(log_record('busy', source='home_view')) for _ in range(500)))
+        self.assertTrue(limit.filter(log_record('other')))
+        self.assertEqual(limit.dropped, {'busy': 2})
+
+    def test_activity_ignores_log_level(self):
+        root = logging.getLogger()
+        level = root.level
+        root.setLevel(logging.WARNING)
+        self.addCleanup(root.setLevel, level)
+        self.assertTrue(logging.getLogger('main.activity.home_view').isEnabledFor(logging.INFO))
+
+
+class CampaignRendererTests(TestCase):
+    def test_text_and_html_escaping(self):
+        newsletter = NewsletterContent.objects.create(
+            title='Q&A', subtitle="Tips for O'Brien", pdf_file='newsletter_pdfs/issue.pdf'
+        )
+        campaign = NewsletterCampaign(
+            newsletter=newsletter, subject='{{ newsletter.title }} for $name',
+            body='{{ newsletter.subtitle }}\n{{ pdf_url }}', html_body='<p>{{ newsletter.subtitle }}, $name</p>',
+        )
+        with mock.patch('main.campaigns.SITE_URL', 'https://example.com'):
+            message = CampaignRenderer(campaign).render(CampaignRecipient(email='eve@example.com', name='<b>Eve</b>'))
+        self.assertEqual(message.subject, 'Q&A for <b>Eve</b>')
+        self.assertEqual(message.body, "Tips for O'Brien\nhttps://example.com/media/newsletter_pdfs/issue.pdf")
+        self.assertEqual(message.html_body, '<p>Tips for O&#x27;Brien, &lt;b&gt;Eve&lt;/b&gt;</p>')
+
+
+class CampaignDeliveryTests(TestCase):
+    def setUp(self):
+        newsletter = NewsletterContent.objects.create(title='Issue')
+        self.campaign = NewsletterCampaign.objects.create(newsletter=newsletter, subject='News', body='Hi $name')
+
+    def test_results_after_lease_loss_are_not_double_counted(self):
+        recipients = [CampaignRecipient.objects.create(campaign=self.campaign, email=f'{name}@example.com',
+                                                       status='sending') for name in ('ann', 'bob')]
+        # Our lease expired mid-page; the next worker marked our rows interrupted
+        with self.assertLogs('main.campaigns', 'WARNING'):
+            campaigns.mark_interrupted(self.campaign)
+        CampaignRecipient.objects.filter(pk=recipients[1].pk).update(status='sending')
+        results = [(campaigns.RenderedMessage(recipient.pk, recipient.email, '', '', ''), None)
+                   for recipient in recipients]
+        self.assertEqual(campaigns.write_page_results(self.campaign, results, 1.0), (1, 0))
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.sent_count, self.campaign.failed_count), (1, 2))
+        self.assertEqual(CampaignRecipient.objects.get(pk=recipients[0].pk).status, 'interrupted')
+
+    def test_pause_after_last_page_is_kept(self):
+        NewsletterSubscription.objects.create(email='ann@example.com', name='Ann')
+        claim_page = campaigns.claim_page
+
+        def claim_then_pause(campaign, after_id, page_size):
+            recipients = claim_page(campaign, after_id, page_size)
+            if not recipients:
+                NewsletterCampaign.objects.filter(pk=campaign.pk).update(status='paused')
+            return recipients
+
+        with mock.patch('main.campaigns.claim_page', side_effect=claim_then_pause):
+            self.assertEqual(campaigns.deliver_campaign(self.campaign), {'sent': 1, 'failed': 0})
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'paused')
+        self.assertIsNone(self.campaign.locked_until)
+        self.assertEqual(len(mail.outbox), 1)
+
+
+# ============ CONNECTION POOL ============
+# Raw in-memory SQLite connections stand in for psycopg ones
+def sqlite_ping(raw):
+    try:
+        raw.execute('SELECT 1')
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def sqlite_reset(raw):
+    try:
+        raw.rollback()
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def sqlite_pool(**options):
+    return db_pool.ConnectionPool('test', sqlite_ping, sqlite_reset, lambda raw: raw.close(), options)
+
+
+def sqlite_connect():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_checkout_timeout(self):
+        pool = sqlite_pool(MAX_SIZE=1, TIMEOUT=0.05)
+        pool.getconn(sqlite_connect)
+        with self.assertRaises(db_pool.PoolTimeout):
+            pool.getconn(sqlite_connect)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waits_for_a_returned_connection(self):
+        pool = sqlite_pool(MAX_SIZE=1, TIMEOUT=5)
+        raw = pool.getconn(sqlite_connect)
+        borrowed = []
+        waiter = threading.Thread(target=lambda: borrowed.append(pool.getconn(sqlite_connect)))
+        waiter.start()
+        while not pool.stats()['waiting']:
+            time.sleep(0.001)
+        pool.putconn(raw)
+        waiter.join()
+        self.assertIs(borrowed[0], raw)
+        stats = pool.stats()
+        self.assertEqual((stats['created'], stats['waits'], stats['size']), (1, 1, 1))
+
+    def test_replaces_a_connection_that_fails_the_health_check(self):
+        pool = sqlite_pool(CHECK_AFTER=0)
+        raw = pool.getconn(sqlite_connect)
+        pool.putconn(raw)
+        raw.close()
+        replacement = pool.getconn(sqlite_connect)
+        self.assertIsNot(replacement, raw)
+        self.assertTrue(sqlite_ping(replacement))
+        stats = pool.stats()
+        self.assertEqual((stats['health_check_failures'], stats['created'], stats['size']), (1, 2, 1))
+
+    def test_retires_old_and_idle_connections(self):
+        pool = sqlite_pool(MAX_LIFETIME=0)
+        raw = pool.getconn(sqlite_connect)
+        pool.putconn(raw)
+        self.assertFalse(sqlite_ping(raw))
+        self.assertEqual(pool.stats()['size'], 0)
+
+        pool = sqlite_pool(MIN_SIZE=0, MAX_IDLE=0)
+        raw = pool.getconn(sqlite_connect)
+        pool.putconn(raw)
+        self.assertIsNot(pool.getconn(sqlite_connect), raw)
+        self.assertFalse(sqlite_ping(raw))
+        self.assertEqual(pool.stats()['closed'], 1)
+
+    def test_new_pool_after_fork(self):
+        key = ('fork-test', os.getpid())
+        parent = db_pool.get_pool(key, 'test', sqlite_ping, sqlite_reset, lambda raw: raw.close())
+        raw = parent.getconn(sqlite_connect)
+        with mock.patch('main.db_backends.pool.os.getpid', return_value=os.getpid() + 1):
+            child = db_pool.get_pool(key, 'test', sqlite_ping, sqlite_reset, lambda raw: raw.close())
+            self.assertIsNot(child, parent)
+            self.assertIn(parent, db_pool._inherited)
+            # The parent's connection is neither reused nor closed in the child
+            parent.putconn(raw)
+            child.putconn(raw)
+            self.assertIsNot(child.getconn(sqlite_connect), raw)
+        self.assertTrue(sqlite_ping(raw))
+        db_pool._pools.pop(key)
+        db_pool._inherited.remove(parent)
+
+
+# ============ READ REPLICA ============
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ReplicaRoutingTests(TestCase):
+    """
+    A second SQLite database as 'replica', as with SQLITE_REPLICA_PATH. It is
+    added once the test databases exist, so it is a plain migrated file
+    outside the test transaction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        replica = {**connections['default'].settings_dict, 'NAME': os.path.join(cls.replica_dir.name, 'replica.sqlite3')}
+        cls.replica_settings = override_settings(
+            DATABASES={**settings.DATABASES, 'replica': replica},
+            DATABASE_ROUTERS=['main.db_router.ReplicaRouter'],
+        )
+        with warnings.catch_warnings():
+            # "Overriding setting DATABASES": the alias is registered below
+            warnings.simplefilter('ignore')
+            cls.replica_settings.enable()
+        connections.settings['replica'] = replica
+        call_command('migrate', database='replica', verbosity=0)
+        # home() creates the settings row when it reads none, which would pin
+        SiteSettings.objects.using('replica').create()
+
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create()
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.replica_settings.disable()
+        cls.replica_dir.cleanup()
+        super().tearDownClass()
+
+    def get(self, url, **kwargs):
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return len(replica)
+
+    def test_reads_go_to_the_replica(self):
+        self.assertGreater(self.get(reverse('home')), 0)
+        staff = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(staff)
+        self.assertGreater(self.get(reverse('admin:main_contactsubmission_changelist')), 0)
+
+    def test_writes_pin_to_the_primary(self):
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.post(reverse('contact_submit'), **BUDGET_REQUESTS['contact_submit'][1](0))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(replica), 0)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        # The pin cookie keeps the next read on the primary
+        self.assertEqual(self.get(reverse('home')), 0)
+        del self.client.cookies[PIN_COOKIE]
+        self.assertGreater(self.get(reverse('home')), 0)
+
+
+# ============ OUTBOX ============
+class OutboxTests(TestCase):
+    def queue(self, to_email, **fields):
+        email = mailer.queue_email(to_email, 'Subject', 'Body')
+        OutboundEmail.objects.filter(pk=email.pk).update(**fields)
+        return email
+
+    def test_claim_batch(self):
+        due = self.queue('due@example.com')
+        self.queue('later@example.com', next_attempt_at=timezone.now() + timedelta(hours=1))
+        self.queue('sent@example.com', status='sent')
+        self.assertEqual([(email.id, email.status, email.attempts) for email in mailer.claim_batch()],
+                         [(due.id, 'sending', 1)])
+        # Leased
+        self.assertEqual(mailer.claim_batch(), [])
+
+        # The lease ran out: the worker died while sending, which used up an attempt
+        OutboundEmail.objects.filter(pk=due.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual([email.attempts for email in mailer.claim_batch()], [2])
+        OutboundEmail.objects.filter(pk=due.pk).update(next_attempt_at=timezone.now(), attempts=mailer.MAX_ATTEMPTS)
+        self.assertEqual(mailer.claim_batch(), [])
+        self.assertEqual(OutboundEmail.objects.get(pk=due.pk).status, 'failed')
+
+    def test_split_by_domain(self):
+        emails = [mailer.build_email(f'user{n}@big.example', 'Subject', 'Body') for n in range(5)]
+        emails.append(mailer.build_email('user@Small.example', 'Subject', 'Body'))
+        chunks = mailer.split_by_domain(emails, per_domain=2)
+        self.assertEqual(sorted(len(chunk) for chunk in chunks), [1, 2, 3])
+        self.assertTrue(all(len({email.recipient_domain for email in chunk}) == 1 for chunk in chunks))
+        self.assertEqual(sorted(map(id, sum(chunks, []))), sorted(map(id, emails)))
+
+    def test_record_results_backoff_and_give_up(self):
+        self.queue('ok@example.com')
+        self.queue('retry@example.com')
+        self.queue('last@example.com', attempts=mailer.MAX_ATTEMPTS - 1)
+        ok, retry, last = sorted(mailer.claim_batch(), key=lambda email: email.id)
+        before = timezone.now()
+        self.assertEqual(mailer.record_results([(ok, None), (retry, 'Timed out'), (last, 'Refused')]), (1, 2))
+        ok, retry, last = OutboundEmail.objects.order_by('id')
+        self.assertEqual((ok.status, ok.attempts), ('sent', 1))
+        self.assertEqual((retry.status, retry.attempts, retry.last_error), ('pending', 1, 'Timed out'))
+        self.assertGreaterEqual(retry.next_attempt_at, before + timedelta(seconds=mailer.RETRY_BASE_SECONDS))
+        self.assertEqual((last.status, last.attempts), ('failed', mailer.MAX_ATTEMPTS))
+
+    def test_retry_delay(self):
+        base = mailer.RETRY_BASE_SECONDS
+        for attempts, low in ((1, base), (3, 4 * base), (50, mailer.RETRY_MAX_SECONDS)):
+            seconds = mailer.retry_delay(attempts).total_seconds()
+            self.assertTrue(low <= seconds <= low + base, (attempts, seconds))
+
+    def test_deliver_pending(self):
+        subscription = NewsletterSubscription.objects.create(email='obrien@example.com', name="O'Brien & Co")
+        mailer.queue_subscription_welcome(subscription)
+        self.queue('other@example.org')
+        counts = mailer.deliver_pending(backend='django.core.mail.backends.locmem.EmailBackend')
+        self.assertEqual(counts, {'claimed': 2, 'sent': 2, 'failed': 0})
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['obrien@example.com', 'other@example.org'])
+        welcome = next(message for message in mail.outbox if message.to == ['obrien@example.com'])
+        self.assertIn("Hi O'Brien & Co,", welcome.body)
+
+
+# ============ ASSETS ============
+class AssetBundleTests(SimpleTestCase):
+    def test_scripts_are_bundled_verbatim(self):
+        # Template literals keep their indentation and any line starting with //
+        bundle = assets.build_bundle('site.js', ['js/main.js', 'js/index.js'])
+        self.assertEqual(bundle, assets.read_source('js/main.js') + '\n;\n' + assets.read_source('js/index.js'))
+
+
+# ============ MEDIA ============
+class MediaServingTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with open(os.path.join(directory.name, 'cover.png'), 'wb') as handle:
+            handle.write(b'png')
+        media_root = override_settings(MEDIA_ROOT=directory.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def get(self, **headers):
+        response = serve_media(RequestFactory().get('/media/cover.png', headers=headers), 'cover.png')
+        self.addCleanup(response.close)
+        return response
+
+    def test_conditional_requests(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        # Proxies may hand the ETag back weakened
+        for if_none_match in (etag, f'W/{etag}', f'"other", W/{etag}', '*'):
+            with self.subTest(if_none_match=if_none_match):
+                response = self.get(if_none_match=if_none_match)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.get(if_none_match='"other"').status_code, 200)
+        self.assertEqual(self.get(if_modified_since=response['Last-Modified']).status_code, 304)
+
+
+# ============ HEALTH ============
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ReadinessTests(TestCase):
+    def setUp(self):
+        health._last['result'] = None
+
+    @mock.patch('main.health.check_storage')
+    def test_ready(self, check_storage):
+        response = self.client.get(reverse('readyz'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(check['ok'] for check in response.json()['checks'].values()))
+
+    @mock.patch('main.health.check_storage', side_effect=OSError('s3://key:secret@bucket unreachable'))
+    def test_failed_check_detail_is_only_logged(self, check_storage):
+        with self.assertLogs('main.health', 'WARNING') as logs, self.assertLogs('django.request', 'ERROR'):
+            response = self.client.get(reverse('readyz'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['storage'], {'ok': False, 'ms': mock.ANY})
+        self.assertNotIn(b'secret', response.content)
+        self.assertIn('secret', '\n'.join(logs.output))
+
+    def test_storage_check_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            health.check_storage()
+            self.assertEqual(os.listdir(media_root), [])
+
+
+# ============ HOME SECTIONS ============
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class HomeFallbackTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Testimonial.objects.create(client_name='Ada Client', position='CEO', company='Acme', content='Great work')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_error_fallback_is_not_cached(self):
+        with mock.patch.object(Testimonial.objects, 'filter', side_effect=AttributeError('bad attribute')), \
+                self.assertLogs('main.views', 'ERROR'), self.assertLogs('main.activity', 'ERROR'):
+            response = self.client.get(reverse('home'))
+        self.assertNotContains(response, 'Ada Client')
+        # The next visitor gets every section, not the fallback's empty ones
+        self.assertContains(self.client.get(reverse('home')), 'Ada Client')
+
+
+class FormatDurationTests(SimpleTestCase):
+    def test_labels(self):
+        self.assertEqual(
+            [format_duration(seconds) for seconds in (15 * 60, 4 * 60 * 60, 3 * 24 * 60 * 60, None)],
+            ['≤ 15 min', '≤ 4 h', '≤ 3 d', '> 30 d'],
+        )
+
+
+# ============ TWO-TIER CACHE ============
+class LocalLRUTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRU(max_entries=2, max_bytes=1024 * 1024)
+        lru.set('a', 1, None)
+        lru.set('b', 2, None)
+        lru.get('a')
+        lru.set('c', 3, None)
+        self.assertEqual(list(lru.entries), ['a', 'c'])
+        self.assertIs(lru.get('b'), _MISSING)
+        self.assertEqual(lru.evictions, 1)
+
+    def test_bounded_by_bytes(self):
+        lru = LocalLRU(max_entries=100, max_bytes=300)
+        lru.set('too-big', 'x' * 400, None)
+        self.assertNotIn('too-big', lru.entries)
+        for key in 'abcd':
+            lru.set(key, 'x' * 100, None)
+        self.assertLessEqual(lru.bytes, 300)
+        self.assertEqual(list(lru.entries), ['c', 'd'])
+
+    def test_expiry(self):
+        lru = LocalLRU(max_entries=10, max_bytes=1024)
+        lru.set('old', 1, time.time() - 1)
+        self.assertIs(lru.get('old'), _MISSING)
+        self.assertEqual((len(lru.entries), lru.bytes), (0, 0))
+
+
+@override_settings(CACHES={
+    **settings.CACHES,
+    'tiered-test-shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-test'},
+})
+class TieredCacheTests(SimpleTestCase):
+    def tiered(self, **options):
+        # A location per test: the local tier and counters are per process and location
+        return TieredCache(self.id(), {'OPTIONS': {'SHARED': 'tiered-test-shared', **options}})
+
+    def tearDown(self):
+        self.tiered().clear()
+
+    def test_tiers(self):
+        cache_ = self.tiered()
+        cache_.set('key', 'value')
+        self.assertEqual(cache_.shared.get('key'), 'value')
+        self.assertEqual(cache_.get('key'), 'value')
+        self.assertEqual(cache_.stats['local_hits'], 1)
+        # Another location (process) only has the shared tier
+        other = TieredCache(f'{self.id()}-other', {'OPTIONS': {'SHARED': 'tiered-test-shared'}})
+        self.assertEqual(other.get('key'), 'value')
+        self.assertEqual((other.stats['local_misses'], other.stats['shared_hits']), (1, 1))
+
+    def test_get_or_set_is_single_flight(self):
+        cache_ = self.tiered()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'rendered'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache_.get_or_set('page', compute)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['rendered'] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache_.stats['computed'], cache_.stats['coalesced']), (1, 7))
+
+    def test_waits_for_another_process(self):
+        cache_ = self.tiered(LOCK_WAIT=5)
+        # Another worker holds the lock and stores the value a moment later
+        cache_.shared.add('page:lock', 12345)
+        timer = threading.Timer(0.05, lambda: cache_.shared.set('page', 'theirs'))
+        timer.start()
+        self.assertEqual(cache_.get_or_set('page', lambda: 'ours'), 'theirs')
+        timer.join()
+        self.assertEqual((cache_.stats['lock_waits'], cache_.stats['computed']), (1, 0))
+
+
+# ============ LATENCY HISTOGRAMS ============
+class HistogramTests(SimpleTestCase):
+    def test_buckets(self):
+        histogram = Histogram()
+        for value in (0.0, BOUNDS[0], BOUNDS[5], BOUNDS[5] + 1e-9, BOUNDS[-1] * 2):
+            histogram.record(value)
+        self.assertEqual(len(histogram.counts), len(BOUNDS) + 1)
+        # At or under a bound counts in that bucket, above it in the next; the last one is open-ended
+        self.assertEqual(histogram.counts[0], 2)
+        self.assertEqual((histogram.counts[5], histogram.counts[6]), (1, 1))
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.sum, BOUNDS[0] + 2 * BOUNDS[5] + 1e-9 + BOUNDS[-1] * 2)
+
+    def test_relative_error(self):
+        self.assertEqual(BOUNDS, sorted(BOUNDS))
+        for lower, upper in zip(BOUNDS, BOUNDS[1:]):
+            self.assertLessEqual(upper / lower, 1 + 1 / SUB_BUCKETS + 1e-9)
+
+
+# ============ PROFILE RING BUFFER ============
+class ProfilerStoreTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        for name, value in (('PROFILE_DIR', self.dir), ('PROFILE_KEEP', 3)):
+            patcher = mock.patch.object(profiler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def save(self, path):
+        run = cProfile.Profile()
+        run.enable()
+        run.disable()
+        return profiler.save({'path': path}, run, Counter({'main;view': 2}))
+
+    def test_keeps_newest(self):
+        saved = [self.save(f'/page/{number}/') for number in range(5)]
+        self.assertEqual(profiler.names(), saved[:1:-1])
+        self.assertEqual(len(os.listdir(self.dir)), 3 * len(profiler.FILES))
+        self.assertIsNone(profiler.load(saved[0]))
+        newest = profiler.load(saved[-1], 'collapsed')
+        self.assertEqual((newest['path'], newest['collapsed']), ('/page/4/', 'main;view 2\n'))
+
+    def test_prune(self):
+        saved = [self.save('/') for _ in range(3)]
+        # Written but without its meta file yet: not listed, not pruned
+        with open(profiler.path_for('1-1', 'collapsed'), 'w'):
+            pass
+        profiler.prune(keep=1)
+        self.assertEqual(profiler.names(), saved[-1:])
+        self.assertEqual(len(os.listdir(self.dir)), len(profiler.FILES) + 1)
+
+
+# ============ GUNICORN SIZING ============
+def load_gunicorn_conf():
+    # Not importable by name: the file is gunicorn's default config path
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class GunicornSizingTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.conf = load_gunicorn_conf()
+
+    def sizing(self, cpus, memory_mb):
+        memory = None if memory_mb is None else memory_mb * self.conf.MB
+        return self.conf.sizing(cpus, memory, worker_mb=150, reserve_mb=128, max_threads=4)
+
+    def test_unknown_memory(self):
+        self.assertEqual(self.sizing(1, None), (3, 1))
+        self.assertEqual(self.sizing(4, None), (9, 1))
+
+    def test_enough_memory(self):
+        self.assertEqual(self.sizing(2, 128 + 5 * 150), (5, 1))
+
+    def test_memory_bound(self):
+        # Fewer workers, the rest of the concurrency as threads
+        self.assertEqual(self.sizing(2, 128 + 3 * 150), (3, 2))
+        self.assertEqual(self.sizing(4, 128 + 2 * 150), (2, 4))
+        # Threads stay within the per-process pool size
+        self.assertEqual(self.sizing(8, 128 + 150), (1, 4))
+
+    def test_at_least_one_worker(self):
+        self.assertEqual(self.sizing(2, 64), (1, 4))
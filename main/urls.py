@@ -1,19 +1,38 @@
 # main/urls.py
-from django.urls import path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.urls import path
+
+from main.budgets import Budget
+from main.content_api import content
 
 # Import views directly (not from . import views which might cause circular import)
 from main.views import home, contact_submit, newsletter_submit, form_submit_webhook, download_ebook
 
+if settings.ASYNC_VIEWS:
+    # ASGI deployment (fusion_force/asgi.py)
+    from main.async_views import home, contact_submit, newsletter_submit, download_ebook  # noqa: F811
+
 urlpatterns = [
     path('', home, name='home'),
     path('api/contact-submit/', contact_submit, name='contact_submit'),
     path('api/newsletter-submit/', newsletter_submit, name='newsletter_submit'),
     path('api/formsubmit-webhook/', form_submit_webhook, name='formsubmit_webhook'),
     path('api/download-ebook/<int:ebook_id>/', download_ebook, name='download_ebook'),
+    path('api/content/v1/', content, name='content_api'),
 ]
 
-# Only add media serving if MEDIA_ROOT is set and not empty
-if settings.MEDIA_ROOT:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Performance budgets per URL name, checked by main/tests.py (see main/budgets.py).
+# Query counts are exact upper bounds for a request with an empty cache; they
+# include the SystemLog write and its rollup, which the test runner makes
+# synchronous (INLINE_WRITES: main/log.py and main.write_queue hand nothing to
+# other threads), but not the cache's own queries with CACHE_BACKEND=db.
+# Render time and size leave room for slow CI machines and content edits, not
+# for new features.
+BUDGETS = {
+    'home': Budget(queries=10, render_ms=150, response_bytes=160_000),
+    'contact_submit': Budget(queries=10, render_ms=50, response_bytes=1_000),
+    'newsletter_submit': Budget(queries=7, render_ms=50, response_bytes=1_000),
+    'formsubmit_webhook': Budget(queries=2, render_ms=10, response_bytes=1_000),
+    'download_ebook': Budget(queries=6, render_ms=10, response_bytes=1_000),
+    'content_api': Budget(queries=10, render_ms=0, response_bytes=30_000),
+}
@@ -2,7 +2,6 @@ from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from django.utils import timezone
 import json
 import logging
 from django.db import IntegrityError
@@ -11,38 +10,33 @@ from .models import (
     SiteSettings, HeroImage, AboutSection, Service,
     ImpactResult, GalleryImage, Testimonial,
     NewsletterContent, ContactSubmission, NewsletterSubscription,
-    FormSubmission, SystemLog, FreeEbook
+    FormSubmission, FreeEbook
 )
+from .mailer import queue_booking_emails, queue_subscription_welcome
+from .analytics import record_download
+from .log import log_activity as log_system_action  # SystemLog rows are written off the request path
+from .db_router import replica_reads
 
 logger = logging.getLogger(__name__)
 
-def log_system_action(message, level='info', source='views', request=None):
-    """Helper to log system actions"""
-    try:
-        SystemLog.objects.create(
-            log_level=level,
-            message=message,
-            source=source,
-            user_ip=request.META.get('REMOTE_ADDR', '') if request else '',
-            user_agent=request.META.get('HTTP_USER_AGENT', '') if request else ''
-        )
-    except Exception as e:
-        logger.error(f"Failed to log action: {e}")
+def add_home_headers(response):
+    """Cache prevention and security headers for the home page"""
+    response['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
+    response['Pragma'] = 'no-cache'
+    response['Expires'] = '0'
+    response['X-Frame-Options'] = 'DENY'
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['X-XSS-Protection'] = '1; mode=block'
+    return response
 
+@replica_reads
 def home(request):
     """Main home view - with aggressive cache prevention"""
     try:
-        # Debug - print to console on EVERY request
-        print("\n" + "="*80)
-        print(f"[DEBUG] Home view called at: {timezone.now()}")
-        print(f"[DEBUG] Request method: {request.method}")
-        print(f"[DEBUG] User agent: {request.META.get('HTTP_USER_AGENT', 'Unknown')}")
-        print(f"[DEBUG] IP address: {request.META.get('REMOTE_ADDR', 'Unknown')}")
-        
         # Get all data with better error handling
         site_settings = SiteSettings.objects.first()
         if not site_settings:
-            print("[WARNING] No SiteSettings found, creating default...")
+            logger.warning('No SiteSettings found, creating default')
             site_settings = SiteSettings.objects.create(
                 site_name='Fusion Force LLC',
                 contact_email='info@fusionforce.com',
@@ -60,42 +54,17 @@ def home(request):
         # ADD FREE EBOOK - Get the first active eBook
         free_ebook = FreeEbook.objects.filter(is_active=True).first()
         
-        # ADD DEBUG PRINT - Enhanced debugging
-        print(f"\n🔥 DEBUG DATA:")
-        print(f"Site Settings: {site_settings}")
-        print(f"Hero Images: {hero_images.count()}")
-        if hero_images.count() > 0:
-            for img in hero_images:
-                print(f"  - {img.title}: {img.image.name if img.image else 'No image'}")
-        
-        print(f"About Section: {about_section}")
-        if about_section:
-            print(f"  - Has image: {bool(about_section.image)}")
-            print(f"  - Has image_2: {bool(about_section.image_2)}")
-            print(f"  - Has long content: {about_section.has_long_content}")
-        
-        print(f"Services: {services.count()}")
-        if services.count() > 0:
-            for service in services:
-                print(f"  - {service.title}: {service.service_type}")
-        
-        print(f"Gallery Images: {gallery_images.count()}")
-        print(f"Testimonials: {testimonials.count()}")
-        print(f"Newsletter: {newsletter}")
-        print(f"Free eBook: {free_ebook}")
-        if free_ebook:
-            print(f"  - Title: {free_ebook.title}")
-            print(f"  - Has file: {bool(free_ebook.ebook_file)}")
-            print(f"  - Downloads: {free_ebook.download_count}")
-        
-        # Check if there are newsletter subscriptions (for debugging)
-        total_subscriptions = NewsletterSubscription.objects.count()
-        active_subscriptions = NewsletterSubscription.objects.filter(is_active=True).count()
-        print(f"Newsletter Subscriptions: {total_subscriptions} total, {active_subscriptions} active")
-        
-        # Check contact submissions count
-        contact_submissions = ContactSubmission.objects.count()
-        print(f"Contact Submissions: {contact_submissions}")
+        # No counts or loops over the list querysets here: each one is a query
+        # the template does not need, and it would run even for sections
+        # served from the cache
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Home view data', extra={
+                'site_settings': str(site_settings),
+                'about_section': str(about_section),
+                'newsletter': str(newsletter),
+                'free_ebook': str(free_ebook),
+                'user_agent': request.META.get('HTTP_USER_AGENT', 'Unknown'),
+            })
         
         # Prepare context with all data
         context = {
@@ -121,28 +90,17 @@ def home(request):
         # Check if this is a subscription confirmation
         if 'subscribed' in request.GET:
             context['subscribed'] = True
-            print("[INFO] Subscription confirmation detected in URL")
         
         # Render response
         response = render(request, 'main/index.html', context)
         
         # ADD CACHE CONTROL HEADERS
-        response['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
-        response['X-Frame-Options'] = 'DENY'
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-XSS-Protection'] = '1; mode=block'
-        
-        print(f"[SUCCESS] Home view rendered successfully at {timezone.now()}")
-        print("="*80 + "\n")
+        add_home_headers(response)
         
         return response
         
     except Exception as e:
-        print(f"[ERROR] in home view: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error in home view')
         
         # Log the error
         log_system_action(
@@ -186,6 +144,12 @@ def contact_submit(request):
             event_details=data['event_details']
         )
         
+        # Queue confirmation emails - the send_outbox worker delivers them
+        try:
+            queue_booking_emails(submission)
+        except Exception as e:
+            logger.error(f"Failed to queue booking emails for submission {submission.id}: {e}")
+        
         # Log the submission
         log_system_action(
             f"New contact submission from {submission.full_name} ({submission.organization})",
@@ -236,11 +200,11 @@ def newsletter_submit(request):
             }, status=400)
         
         # Check if email already exists
-        if NewsletterSubscription.objects.filter(email=email).exists():
-            subscription = NewsletterSubscription.objects.get(email=email)
+        existing = NewsletterSubscription.objects.filter(email=email).only('created_at').first()
+        if existing:
             return JsonResponse({
                 'status': 'info',
-                'message': f'You are already subscribed to our newsletter! (Subscribed on {subscription.created_at.strftime("%Y-%m-%d")})'
+                'message': f'You are already subscribed to our newsletter! (Subscribed on {existing.created_at.strftime("%Y-%m-%d")})'
             })
         
         # Create subscription in Django database
@@ -252,6 +216,11 @@ def newsletter_submit(request):
             is_active=True
         )
         
+        try:
+            queue_subscription_welcome(subscription)
+        except Exception as e:
+            logger.error(f"Failed to queue welcome email for {email}: {e}")
+        
         # Log the subscription
         log_system_action(
             f"New newsletter subscription: {email}",
@@ -322,6 +291,7 @@ def download_ebook(request, ebook_id):
     try:
         ebook = FreeEbook.objects.get(id=ebook_id, is_active=True)
         ebook.increment_download_count()
+        record_download(ebook)
         
         # Log the download
         log_system_action(
@@ -0,0 +1,164 @@
+# main/write_queue.py
+"""
+Single-writer queue for fire-and-forget writes.
+
+Writes the request does not need to wait for (page-view SystemLog rows and
+their rollups) are handed to one writer thread per process. It commits them
+in batches, one transaction per batch, so a burst of page views costs a few
+write-lock acquisitions instead of one per request, and the request thread
+never waits for the SQLite write lock. Writes whose result the response
+depends on (form submissions, admin changes) stay synchronous.
+
+Enabled by settings.DB_WRITE_QUEUE. When it is off, or INLINE_WRITES is on
+(the test runner: a second thread could not see the test transaction),
+writes run inline. ``enqueue`` returns a concurrent.futures.Future either way;
+async views use ``aenqueue``.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .db_router import unpinned_writes
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, 'DB_WRITE_QUEUE_BATCH_SIZE', 200)
+
+_state = {'pid': None, 'queue': None, 'thread': None}
+_lock = threading.Lock()
+stats = {'queued': 0, 'written': 0, 'failed': 0, 'batches': 0}
+
+
+def inline():
+    """settings.INLINE_WRITES: no background threads for writes or log records"""
+    return getattr(settings, 'INLINE_WRITES', False)
+
+
+def enabled():
+    return getattr(settings, 'DB_WRITE_QUEUE', False) and not inline()
+
+
+def enqueue(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` on the writer thread (or inline when disabled)"""
+    if not enabled():
+        future = Future()
+        _run(future, func, args, kwargs)
+        return future
+    return _put(func, args, kwargs)
+
+
+async def aenqueue(func, *args, **kwargs):
+    """
+    ``enqueue`` for async views. Uses the writer thread even with
+    DB_WRITE_QUEUE off: inline, the response would wait for a thread hop and
+    the write. INLINE_WRITES still writes inline.
+    """
+    if inline():
+        return await sync_to_async(enqueue)(func, *args, **kwargs)
+    return _put(func, args, kwargs)
+
+
+def _put(func, args, kwargs):
+    future = Future()
+    _writer_queue().put((future, func, args, kwargs))
+    with _lock:
+        stats['queued'] += 1
+    return future
+
+
+def flush(timeout=None):
+    """Block until everything queued so far is committed"""
+    if _state['pid'] != os.getpid() or _state['queue'] is None:
+        return True
+    marker = Future()
+    _state['queue'].put((marker, lambda: None, (), {}))
+    try:
+        marker.result(timeout)
+    except TimeoutError:
+        return False
+    return True
+
+
+def depth():
+    if _state['pid'] != os.getpid() or _state['queue'] is None:
+        return 0
+    return _state['queue'].qsize()
+
+
+def _run(future, func, args, kwargs):
+    try:
+        # Nothing in the request reads these rows back (see main/db_router.py)
+        with unpinned_writes():
+            future.set_result(func(*args, **kwargs))
+    except Exception as exc:
+        logger.exception('Queued write %r failed', func)
+        future.set_exception(exc)
+
+
+def _writer_queue():
+    if _state['pid'] == os.getpid():
+        return _state['queue']
+    with _lock:
+        if _state['pid'] != os.getpid():
+            # First use in this process (or first use after a fork: the
+            # parent's thread does not exist here)
+            _state['queue'] = queue.SimpleQueue()
+            _state['thread'] = threading.Thread(target=_writer, name='db-writer', daemon=True)
+            _state['thread'].start()
+            _state['pid'] = os.getpid()
+    return _state['queue']
+
+
+def _writer():
+    pending = _state['queue']
+    while True:
+        batch = [pending.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(pending.get_nowait())
+            except queue.Empty:
+                break
+        _write_batch(batch)
+
+
+def _write_batch(batch):
+    close_old_connections()
+    done = []
+    try:
+        with transaction.atomic():
+            for future, func, args, kwargs in batch:
+                try:
+                    # Savepoint per write: one failure does not lose the batch
+                    with transaction.atomic():
+                        result = func(*args, **kwargs)
+                except Exception as exc:
+                    logger.exception('Queued write %r failed', func)
+                    done.append((future, None, exc))
+                else:
+                    done.append((future, result, None))
+    except Exception as exc:
+        # The batch transaction itself failed (e.g. lock timeout): nothing committed
+        logger.exception('Write batch of %s failed', len(batch))
+        done = [(future, None, exc) for future, *_ in batch]
+        connection.close()
+
+    stats['batches'] += 1
+    for future, result, exc in done:
+        if exc is None:
+            stats['written'] += 1
+            future.set_result(result)
+        else:
+            stats['failed'] += 1
+            future.set_exception(exc)
+
+
+@atexit.register
+def _drain():
+    flush(timeout=10)
@@ -0,0 +1,547 @@
+// Landing page forms and interactions (moved out of templates/main/index.html)
+document.addEventListener('DOMContentLoaded', function() {
+    // Toast notification function
+    function showToast(message, type = 'success') {
+        const toastId = 'toast-' + Date.now();
+        const bgColor = type === 'success' ? 'bg-success' : 'bg-danger';
+        const icon = type === 'success' ? 'fa-check-circle' : 'fa-exclamation-circle';
+
+        const toastHtml = `
+            <div id="${toastId}" class="toast align-items-center text-white ${bgColor} border-0 show" role="alert" aria-live="assertive" aria-atomic="true">
+                <div class="d-flex">
+                    <div class="toast-body">
+                        <i class="fas ${icon} me-2"></i>${message}
+                    </div>
+                    <button type="button" class="btn-close btn-close-white me-2 m-auto" data-bs-dismiss="toast" aria-label="Close"></button>
+                </div>
+            </div>
+        `;
+
+        document.getElementById('toastContainer').insertAdjacentHTML('afterbegin', toastHtml);
+
+        // Auto remove after 5 seconds
+        setTimeout(() => {
+            const toast = document.getElementById(toastId);
+            if (toast) {
+                toast.remove();
+            }
+        }, 5000);
+    }
+
+    // Initialize modals
+    const newsletterModal = new bootstrap.Modal(document.getElementById('newsletterSuccessModal'));
+    const contactModal = new bootstrap.Modal(document.getElementById('contactSuccessModal'));
+
+    // Update copyright year
+    document.getElementById('current-year').textContent = new Date().getFullYear();
+
+    // Check if subscribed from URL
+    const urlParams = new URLSearchParams(window.location.search);
+    if (urlParams.get('subscribed') === 'true') {
+        showToast('Successfully subscribed to newsletter! Check for your free eBook.', 'success');
+        const ebookOffer = document.getElementById('ebookOffer');
+        if (ebookOffer) {
+            ebookOffer.style.display = 'block';
+            setTimeout(() => {
+                ebookOffer.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            }, 500);
+        }
+    }
+
+    // ============ BOOKING FORM HANDLER ============
+    const bookingForm = document.getElementById('bookingForm');
+    if (bookingForm) {
+        bookingForm.addEventListener('submit', async function(e) {
+            e.preventDefault();
+
+            // Get form data
+            const formData = {
+                full_name: document.getElementById('fullName').value,
+                email: document.getElementById('emailAddress').value,
+                organization: document.getElementById('organization').value,
+                event_type: document.getElementById('eventType').value,
+                event_details: document.getElementById('eventDetails').value,
+                submitted_at: new Date().toLocaleString()
+            };
+
+            // Set reply-to email for FormSubmit
+            document.getElementById('replyToBooking').value = formData.email;
+            document.getElementById('submissionDate').value = formData.submitted_at;
+
+            // Get submit button and show loading
+            const submitBtn = document.getElementById('bookingSubmit');
+            const originalText = submitBtn.innerHTML;
+            submitBtn.innerHTML = '<span class="loading-spinner"></span> Processing...';
+            submitBtn.disabled = true;
+
+            // Hide any previous messages
+            document.getElementById('bookingSuccessMessage').style.display = 'none';
+            document.getElementById('bookingErrorMessage').style.display = 'none';
+
+            try {
+                // ============ 1. SEND TO FORMSPREE (EXTERNAL) ============
+                const formSubmitData = new FormData(bookingForm);
+                const formSubmitResponse = await fetch('https://formsubmit.co/ajax/winnienkatha010@gmail.com', {
+                    method: 'POST',
+                    body: formSubmitData,
+                    headers: {
+                        'Accept': 'application/json'
+                    }
+                });
+
+                const formSubmitResult = await formSubmitResponse.json();
+
+                // ============ 2. SAVE TO DJANGO DATABASE ============
+                const djangoResponse = await fetch('/api/contact-submit/', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    },
+                    body: JSON.stringify(formData)
+                });
+
+                const djangoResult = await djangoResponse.json();
+
+                if (formSubmitResult.success && djangoResult.status === 'success') {
+                    // Show success message
+                    document.getElementById('bookingSuccessMessage').style.display = 'block';
+                    showToast('Booking request sent successfully! We\'ll contact you within 24 hours.', 'success');
+
+                    // Reset form
+                    bookingForm.reset();
+
+                    // Scroll to success message
+                    setTimeout(() => {
+                        document.getElementById('bookingSuccessMessage').scrollIntoView({ 
+                            behavior: 'smooth', 
+                            block: 'center' 
+                        });
+                    }, 300);
+
+                    // Log success
+                    console.log('Booking form submitted to BOTH services successfully');
+                } else {
+                    throw new Error('One or both submissions failed');
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                document.getElementById('bookingErrorText').textContent = 'An error occurred. Please try again later or contact us directly at info@fusionforce.com';
+                document.getElementById('bookingErrorMessage').style.display = 'block';
+                showToast('Booking submission failed. Please try again.', 'error');
+            } finally {
+                // Reset button
+                submitBtn.innerHTML = originalText;
+                submitBtn.disabled = false;
+            }
+        });
+    }
+
+    // ============ NEWSLETTER FORM HANDLER ============
+    const newsletterForm = document.getElementById('newsletterSubscriptionForm');
+    if (newsletterForm) {
+        newsletterForm.addEventListener('submit', async function(e) {
+            e.preventDefault();
+
+            // Get form data
+            const formData = {
+                name: document.getElementById('newsletterName').value,
+                email: document.getElementById('newsletterEmail').value,
+                source: 'newsletter_section',
+                agreed_to_terms: document.getElementById('newsletterAgree').checked
+            };
+
+            // Set reply-to email for FormSubmit
+            document.getElementById('replyToNewsletter').value = formData.email;
+
+            // Get submit button and show loading
+            const submitBtn = document.getElementById('newsletterSubmit');
+            const originalText = submitBtn.innerHTML;
+            submitBtn.innerHTML = '<span class="loading-spinner"></span> Subscribing...';
+            submitBtn.disabled = true;
+
+            // Hide any previous messages
+            document.getElementById('subscriptionSuccessMessage').style.display = 'none';
+            document.getElementById('subscriptionErrorMessage').style.display = 'none';
+
+            try {
+                // ============ 1. SEND TO FORMSPREE (EXTERNAL) ============
+                const formSubmitData = new FormData(newsletterForm);
+                const formSubmitResponse = await fetch('https://formsubmit.co/ajax/winnienkatha010@gmail.com', {
+                    method: 'POST',
+                    body: formSubmitData,
+                    headers: {
+                        'Accept': 'application/json'
+                    }
+                });
+
+                const formSubmitResult = await formSubmitResponse.json();
+
+                // ============ 2. SAVE TO DJANGO DATABASE ============
+                const djangoResponse = await fetch('/api/newsletter-submit/', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    },
+                    body: JSON.stringify(formData)
+                });
+
+                const djangoResult = await djangoResponse.json();
+
+                if (formSubmitResult.success && (djangoResult.status === 'success' || djangoResult.status === 'info')) {
+                    // Show ebook offer after successful subscription
+                    const ebookOffer = document.getElementById('ebookOffer');
+                    if (ebookOffer) {
+                        ebookOffer.style.display = 'block';
+
+                        // Scroll to ebook offer
+                        setTimeout(() => {
+                            ebookOffer.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                        }, 500);
+                    }
+
+                    // Show success message
+                    document.getElementById('subscriptionSuccessMessage').style.display = 'block';
+                    showToast('Successfully subscribed! Check for your free eBook.', 'success');
+
+                    // Reset form
+                    newsletterForm.reset();
+
+                    // Log success
+                    console.log('Newsletter form submitted to BOTH services successfully');
+                } else {
+                    throw new Error('One or both submissions failed');
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                document.getElementById('errorMessageText').textContent = 'An error occurred. Please try again later or contact us directly at info@fusionforce.com';
+                document.getElementById('subscriptionErrorMessage').style.display = 'block';
+                showToast('Subscription failed. Please try again.', 'error');
+            } finally {
+                // Reset button
+                submitBtn.innerHTML = originalText;
+                submitBtn.disabled = false;
+            }
+        });
+    }
+
+    // ============ FOOTER NEWSLETTER FORM HANDLER (WITH EBOOK) ============
+    const footerNewsletterForm = document.getElementById('footerNewsletterForm');
+    if (footerNewsletterForm) {
+        footerNewsletterForm.addEventListener('submit', async function(e) {
+            e.preventDefault();
+
+            const emailInput = footerNewsletterForm.querySelector('input[name="email"]');
+            const email = emailInput.value;
+
+            // Get form data
+            const formData = {
+                name: 'Footer Subscriber',
+                email: email,
+                source: 'footer',
+                agreed_to_terms: true
+            };
+
+            // Get submit button and show loading
+            const submitBtn = footerNewsletterForm.querySelector('button[type="submit"]');
+            const originalText = submitBtn.innerHTML;
+            submitBtn.innerHTML = '<span class="loading-spinner"></span>';
+            submitBtn.disabled = true;
+
+            // Hide status messages
+            const statusDiv = document.getElementById('footerNewsletterStatus');
+            const ebookDownloadDiv = document.getElementById('footerEbookDownload');
+            statusDiv.style.display = 'none';
+            ebookDownloadDiv.style.display = 'none';
+
+            try {
+                // ============ 1. SEND TO FORMSPREE (EXTERNAL) ============
+                const formSubmitData = new FormData(footerNewsletterForm);
+                formSubmitData.append('email', email);
+                formSubmitData.append('name', 'Footer Subscriber');
+                formSubmitData.append('agreement', 'Agreed via footer');
+
+                const formSubmitResponse = await fetch('https://formsubmit.co/ajax/winnienkatha010@gmail.com', {
+                    method: 'POST',
+                    body: formSubmitData,
+                    headers: {
+                        'Accept': 'application/json'
+                    }
+                });
+
+                const formSubmitResult = await formSubmitResponse.json();
+
+                // ============ 2. SAVE TO DJANGO DATABASE ============
+                const djangoResponse = await fetch('/api/newsletter-submit/', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    },
+                    body: JSON.stringify(formData)
+                });
+
+                const djangoResult = await djangoResponse.json();
+
+                if (formSubmitResult.success && (djangoResult.status === 'success' || djangoResult.status === 'info')) {
+                    // Show success status
+                    statusDiv.style.display = 'block';
+                    const statusText = document.getElementById('footerStatusText');
+
+                    if (djangoResult.status === 'success') {
+                        statusText.innerHTML = '<i class="fas fa-check-circle me-2"></i>Successfully subscribed! Your free eBook is ready.';
+                        statusDiv.querySelector('.alert').className = 'alert alert-success mb-2';
+
+                        // Show eBook download button
+                        ebookDownloadDiv.style.display = 'block';
+
+                        // Scroll to eBook download section
+                        setTimeout(() => {
+                            ebookDownloadDiv.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                        }, 300);
+
+                        showToast('Successfully subscribed! Download your free eBook below.', 'success');
+                    } else {
+                        statusText.innerHTML = '<i class="fas fa-info-circle me-2"></i>You were already subscribed. Welcome back!';
+                        statusDiv.querySelector('.alert').className = 'alert alert-info mb-2';
+                        showToast('You were already subscribed. Welcome back!', 'info');
+                    }
+
+                    // Reset form
+                    footerNewsletterForm.reset();
+
+                    // Log success
+                    console.log('Footer newsletter submitted to BOTH services successfully');
+
+                } else {
+                    throw new Error('One or both submissions failed');
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                statusDiv.style.display = 'block';
+                statusDiv.innerHTML = `
+                    <div class="alert alert-danger mb-0">
+                        <i class="fas fa-exclamation-triangle me-2"></i>
+                        Subscription failed. Please try again.
+                    </div>
+                `;
+                showToast('Subscription failed. Please try again.', 'error');
+            } finally {
+                // Reset button
+                submitBtn.innerHTML = originalText;
+                submitBtn.disabled = false;
+            }
+        });
+    }
+
+    // ============ FOOTER EBOOK DOWNLOAD HANDLER ============
+    const footerDownloadEbookBtn = document.getElementById('footerDownloadEbookBtn');
+    if (footerDownloadEbookBtn) {
+        footerDownloadEbookBtn.addEventListener('click', async function() {
+            const ebookId = this.dataset.ebookId;
+            const ebookTitle = this.dataset.ebookTitle;
+            const ebookUrl = this.dataset.ebookUrl;
+            const originalText = this.innerHTML;
+
+            this.innerHTML = '<span class="loading-spinner"></span> Preparing download...';
+            this.disabled = true;
+
+            try {
+                // Track download in database
+                const response = await fetch(`/api/download-ebook/${ebookId}/`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    }
+                });
+
+                const result = await response.json();
+
+                if (result.status === 'success') {
+                    // Create download link
+                    const link = document.createElement('a');
+                    link.href = result.download_url || ebookUrl;
+                    link.download = ebookTitle.replace(/\s+/g, '-') + '.pdf';
+                    link.style.display = 'none';
+
+                    document.body.appendChild(link);
+                    link.click();
+                    document.body.removeChild(link);
+
+                    // Show success message
+                    showToast(`"${ebookTitle}" download started! Check your downloads folder.`, 'success');
+
+                    // Update button
+                    this.innerHTML = '<i class="fas fa-check me-2"></i>Downloaded Successfully!';
+                    this.classList.remove('download-ebook-btn');
+                    this.classList.add('btn-success');
+                    this.disabled = true;
+
+                } else {
+                    throw new Error(result.message || 'Download failed');
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                showToast('Failed to download eBook. Please try again or contact support.', 'error');
+
+                // Reset button
+                this.innerHTML = originalText;
+                this.disabled = false;
+            }
+        });
+    }
+
+    // ============ EBOOK DOWNLOAD HANDLER ============
+    const downloadEbookBtn = document.getElementById('downloadEbookBtn');
+    if (downloadEbookBtn) {
+        downloadEbookBtn.addEventListener('click', async function() {
+            const ebookId = this.dataset.ebookId;
+            const ebookTitle = this.dataset.ebookTitle;
+            const ebookUrl = this.dataset.ebookUrl;
+            const originalText = this.innerHTML;
+
+            this.innerHTML = '<span class="loading-spinner"></span> Preparing download...';
+            this.disabled = true;
+
+            try {
+                // Track download in database
+                const response = await fetch(`/api/download-ebook/${ebookId}/`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    }
+                });
+
+                const result = await response.json();
+
+                if (result.status === 'success') {
+                    // Create download link
+                    const link = document.createElement('a');
+                    link.href = result.download_url || ebookUrl;
+                    link.download = ebookTitle.replace(/\s+/g, '-') + '.pdf';
+                    link.style.display = 'none';
+
+                    document.body.appendChild(link);
+                    link.click();
+                    document.body.removeChild(link);
+
+                    // Show success message
+                    showToast(`"${ebookTitle}" download started! Check your downloads folder.`, 'success');
+
+                    // Update button
+                    this.innerHTML = '<i class="fas fa-check me-2"></i>Downloaded!';
+                    this.classList.remove('download-ebook-btn');
+                    this.classList.add('btn-secondary');
+                    this.disabled = true;
+
+                } else {
+                    throw new Error(result.message || 'Download failed');
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                showToast('Failed to download eBook. Please try again or contact support.', 'error');
+
+                // Reset button
+                this.innerHTML = originalText;
+                this.disabled = false;
+            }
+        });
+    }
+
+    // ============ HELPER FUNCTIONS ============
+    // Get CSRF token from cookies
+    function getCookie(name) {
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    // Form validation styling
+    const forms = document.querySelectorAll('.needs-validation');
+    Array.from(forms).forEach(form => {
+        form.addEventListener('submit', event => {
+            if (!form.checkValidity()) {
+                event.preventDefault();
+                event.stopPropagation();
+            }
+            form.classList.add('was-validated');
+        }, false);
+    });
+
+    // Footer link smooth scrolling
+    document.querySelectorAll('.footer a[href^="#"]').forEach(anchor => {
+        anchor.addEventListener('click', function(e) {
+            e.preventDefault();
+            const targetId = this.getAttribute('href');
+            if (targetId === '#') return;
+
+            const targetElement = document.querySelector(targetId);
+            if (targetElement) {
+                window.scrollTo({
+                    top: targetElement.offsetTop - 100,
+                    behavior: 'smooth'
+                });
+            }
+        });
+    });
+
+    // PDF download
+    const downloadPdfBtn = document.getElementById('downloadPdfBtn');
+    if (downloadPdfBtn && !downloadPdfBtn.hasAttribute('href')) {
+        downloadPdfBtn.addEventListener('click', function() {
+            const pdfFileName = 'FUSION-FORCE.pdf';
+
+            // Show loading state
+            const originalText = this.innerHTML;
+            this.innerHTML = '<span class="loading-spinner"></span> Preparing PDF...';
+            this.disabled = true;
+
+            // Simple function to download
+            function startDownload() {
+                // Create download link
+                const link = document.createElement('a');
+                link.href = pdfFileName;
+                link.download = 'Fusion-Force-Newsletter.pdf';
+                link.style.display = 'none';
+
+                // Append to body
+                document.body.appendChild(link);
+
+                // Click the link
+                link.click();
+
+                // Clean up
+                setTimeout(() => {
+                    document.body.removeChild(link);
+
+                    // Check if download was successful
+                    setTimeout(() => {
+                        showToast('Newsletter PDF download started!', 'success');
+                        downloadPdfBtn.innerHTML = originalText;
+                        downloadPdfBtn.disabled = false;
+                    }, 1000);
+                }, 100);
+            }
+
+            // Start download
+            startDownload();
+        });
+    }
+});